@@ -1,4 +1,4 @@
-from .base_agent import BaseAgent, LLMAgent
+from .base_agent import BaseAgent, DatabaseAgent, LLMAgent
 from .orchestrator import AgentOrchestrator
 from .student_profile_agent import StudentProfileAgent
 from .university_agent import UniversityAgent
@@ -8,6 +8,7 @@ from .gemini_agent import GeminiAgent
 
 __all__ = [
     "BaseAgent",
+    "DatabaseAgent",
     "LLMAgent", 
     "AgentOrchestrator",
     "StudentProfileAgent",
@@ -1,4 +1,6 @@
 from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
 from typing import Dict, Any, List, Optional
 import asyncio
 import logging
@@ -6,6 +8,14 @@ import time
 import json
 from datetime import datetime
 
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from .llm_executor import get_llm_executor, LLMExecutorError
+from core.metrics import RequestMetrics
+from core.tracing import get_tracer
+from database.connection import SessionLocal, get_async_sessionmaker
+
 
 class BaseAgent(ABC):
     """Base class for all agents in the EduPath multi-agent system"""
@@ -22,6 +32,7 @@ class BaseAgent(ABC):
             "average_response_time": 0.0,
             "last_activity": None
         }
+        self.request_metrics = RequestMetrics()
         self.logger = logging.getLogger(f"agent.{agent_id}")
         
     async def initialize(self) -> bool:
@@ -52,48 +63,54 @@ class BaseAgent(ABC):
         
         start_time = time.time()
         self.performance_metrics["total_requests"] += 1
+        action = request.get("action") if isinstance(request, dict) else None
         
-        try:
-            # Validate request
-            self._validate_request(request)
-            
-            # Process request
-            response = await self.process_request(request)
-            
-            # Record success
-            self.performance_metrics["successful_requests"] += 1
-            self.performance_metrics["last_activity"] = datetime.now().isoformat()
-            
-            # Update response time
-            response_time = time.time() - start_time
-            self._update_response_time(response_time)
-            
-            # Add metadata to response
-            response["_metadata"] = {
-                "agent_id": self.agent_id,
-                "agent_name": self.name,
-                "processing_time_ms": int(response_time * 1000),
-                "timestamp": datetime.now().isoformat()
-            }
-            
-            self.logger.info(f"Request processed successfully in {response_time:.3f}s")
-            return response
-            
-        except Exception as e:
-            self.performance_metrics["failed_requests"] += 1
-            self.logger.error(f"Request processing failed: {e}")
-            
-            return {
-                "success": False,
-                "error": str(e),
-                "agent_id": self.agent_id,
-                "agent_name": self.name,
-                "_metadata": {
-                    "processing_time_ms": int((time.time() - start_time) * 1000),
+        with get_tracer().span(f"agent.{self.agent_id}", **{"agent.action": action}) as span:
+            try:
+                # Validate request
+                self._validate_request(request)
+                
+                # Process request
+                response = await self.process_request(request)
+                
+                # Record success
+                self.performance_metrics["successful_requests"] += 1
+                self.performance_metrics["last_activity"] = datetime.now().isoformat()
+                
+                # Update response time
+                response_time = time.time() - start_time
+                self._update_response_time(response_time)
+                self.request_metrics.observe(action, response_time)
+                
+                # Add metadata to response
+                response["_metadata"] = {
+                    "agent_id": self.agent_id,
+                    "agent_name": self.name,
+                    "processing_time_ms": int(response_time * 1000),
                     "timestamp": datetime.now().isoformat()
                 }
-            }
-    
+                
+                self.logger.info(f"Request processed successfully in {response_time:.3f}s")
+                return response
+                
+            except Exception as e:
+                response_time = time.time() - start_time
+                self.performance_metrics["failed_requests"] += 1
+                self.request_metrics.observe(action, response_time, error=e)
+                span.record_exception(e)
+                self.logger.error(f"Request processing failed: {e}")
+                
+                return {
+                    "success": False,
+                    "error": str(e),
+                    "agent_id": self.agent_id,
+                    "agent_name": self.name,
+                    "_metadata": {
+                        "processing_time_ms": int(response_time * 1000),
+                        "timestamp": datetime.now().isoformat()
+                    }
+                }
+        
     def _validate_request(self, request: Dict[str, Any]):
         """Validate incoming request format"""
         if not isinstance(request, dict):
@@ -127,7 +144,8 @@ class BaseAgent(ABC):
             "name": self.name,
             "description": self.description,
             "is_initialized": self.is_initialized,
-            "performance_metrics": self.performance_metrics.copy()
+            "performance_metrics": self.performance_metrics.copy(),
+            "request_metrics": self.request_metrics.get_stats()
         }
     
     async def cleanup(self):
@@ -144,6 +162,105 @@ class BaseAgent(ABC):
         pass
 
 
+class RequestSession:
+    """Database sessions of one request, each opened on first use"""
+    
+    def __init__(self):
+        self._session: Optional[Session] = None
+        self._async_session: Optional[AsyncSession] = None
+    
+    @property
+    def session(self) -> Session:
+        if self._session is None:
+            self._session = SessionLocal()
+        return self._session
+    
+    @property
+    def async_session(self) -> AsyncSession:
+        if self._async_session is None:
+            self._async_session = get_async_sessionmaker()()
+        return self._async_session
+    
+    async def close(self, failed: bool = False):
+        # Closing also rolls back anything left uncommitted
+        if self._async_session is not None:
+            try:
+                if failed:
+                    await self._async_session.rollback()
+            finally:
+                await self._async_session.close()
+                self._async_session = None
+        
+        if self._session is not None:
+            try:
+                if failed:
+                    self._session.rollback()
+            finally:
+                self._session.close()
+                self._session = None
+
+
+class DatabaseAgent(BaseAgent):
+    """
+    Base class for agents that use the relational database.
+    
+    Every handle_request call (and initialize, which may seed data) gets its
+    own sessions from the pools for the duration of that call:
+    self.async_db_session on the asyncio engine, which request handling
+    uses so database waits yield to other requests, and the blocking
+    self.db_session, kept for startup seeding. Sessions are opened on first
+    use, so requests that never touch the database never check out a
+    connection, and concurrent requests never share session state.
+    """
+    
+    def __init__(self, agent_id: str, name: str, description: str):
+        super().__init__(agent_id, name, description)
+        self._request_session: ContextVar[Optional[RequestSession]] = ContextVar(
+            f"db_session:{agent_id}", default=None
+        )
+    
+    def _current_request_session(self) -> RequestSession:
+        request_session = self._request_session.get()
+        if request_session is None:
+            raise RuntimeError(f"Agent {self.name} has no database session outside of a request")
+        return request_session
+    
+    @property
+    def db_session(self) -> Session:
+        return self._current_request_session().session
+    
+    @property
+    def async_db_session(self) -> AsyncSession:
+        return self._current_request_session().async_session
+    
+    @asynccontextmanager
+    async def request_session(self):
+        """Scope database sessions to the enclosed call; nested scopes reuse the outer one"""
+        if self._request_session.get() is not None:
+            yield
+            return
+        
+        request_session = RequestSession()
+        token = self._request_session.set(request_session)
+        failed = False
+        try:
+            yield
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            self._request_session.reset(token)
+            await request_session.close(failed)
+    
+    async def initialize(self) -> bool:
+        async with self.request_session():
+            return await super().initialize()
+    
+    async def handle_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        async with self.request_session():
+            return await super().handle_request(request)
+
+
 class LLMAgent(BaseAgent):
     """Base class for agents that use Large Language Models"""
     
@@ -151,6 +268,7 @@ class LLMAgent(BaseAgent):
         super().__init__(agent_id, name, description)
         self.model_config = model_config or {}
         self.llm_client = None
+        self.llm_executor = get_llm_executor()
     
     async def _initialize_resources(self):
         """Initialize LLM resources"""
@@ -176,11 +294,15 @@ class LLMAgent(BaseAgent):
             return None
         
         try:
-            response = await asyncio.get_event_loop().run_in_executor(
-                None, 
-                lambda: self.llm_client.generate_content(prompt)
-            )
+            response = await self.llm_executor.run(self.llm_client.generate_content, prompt)
             return response.text
+        except LLMExecutorError as e:
+            # Provider is being skipped or saturated; callers use their fallback content
+            self.logger.warning(f"LLM call rejected: {e}")
+            return None
+        except asyncio.TimeoutError:
+            self.logger.error("LLM content generation timed out")
+            return None
         except Exception as e:
             self.logger.error(f"LLM content generation failed: {e}")
             return None
@@ -0,0 +1,111 @@
+from typing import Dict, Any, Optional, Tuple
+
+from database.catalog import CatalogSnapshot, CareerPathRecord, JobSectorRecord
+
+
+DEMAND_SCORES = {"low": 25, "medium": 50, "high": 75, "very_high": 100}
+
+# Prospect strings come from the program catalog, so the memo stays small;
+# the bound only guards against callers passing arbitrary text
+MAX_MEMOIZED_PROSPECTS = 4096
+
+
+def normalize_career_name(name: str) -> str:
+    """Case-folded form used for the case-insensitive ILIKE-style matching"""
+    return name.lower()
+
+
+class ProspectOutlook:
+    """
+    Precomputed outlook of one career prospect string.
+
+    `career_data` is the matched career path (with its sector, when the
+    sector exists) exactly as the response carries it; the scores are None
+    when no sector could be attached, in which case the prospect is listed
+    but does not count towards the program averages.
+    """
+
+    __slots__ = ("career_data", "demand_score", "growth_score", "entrepreneurship_score")
+
+    def __init__(self, career_path: CareerPathRecord, sector: Optional[JobSectorRecord]):
+        self.career_data = career_path.to_dict()
+        self.demand_score = None
+        self.growth_score = None
+        self.entrepreneurship_score = None
+
+        if sector is not None:
+            self.career_data["sector"] = sector.to_dict()
+            self.demand_score = DEMAND_SCORES.get(sector.demand_level, 50)
+            if sector.growth_rate:
+                self.growth_score = min(100, max(0, sector.growth_rate * 10 + 50))
+            else:
+                self.growth_score = 50
+            self.entrepreneurship_score = sector.entrepreneurship_score
+
+    @property
+    def has_sector(self) -> bool:
+        return self.demand_score is not None
+
+    def response_data(self) -> Dict[str, Any]:
+        """Copy of the career data, so responses never share the memoized dict"""
+        data = dict(self.career_data)
+        if "sector" in data:
+            data["sector"] = dict(data["sector"])
+        return data
+
+
+class CareerIndex:
+    """
+    In-memory career name index over the career paths of one catalog snapshot.
+
+    Matching keeps the semantics of `name ILIKE '%prospect%' LIMIT 1`: the
+    first career path, in id order, whose name contains the prospect
+    case-insensitively. Names are normalized once when the index is built
+    and the outlook of each prospect string is memoized, so the substring
+    scan runs at most once per prospect and snapshot.
+    """
+
+    __slots__ = ("snapshot", "version", "entries", "_outlooks")
+
+    def __init__(self, snapshot: CatalogSnapshot):
+        self.snapshot = snapshot
+        self.version = snapshot.version
+
+        # (normalized name, career path) in id order, like the unordered LIMIT 1 returned
+        self.entries: Tuple[Tuple[str, CareerPathRecord], ...] = tuple(
+            (normalize_career_name(path.name), path) for path in snapshot.career_paths if path.name
+        )
+
+        self._outlooks: Dict[str, Optional[ProspectOutlook]] = {}
+
+    def find(self, prospect: str) -> Optional[CareerPathRecord]:
+        """First career path whose name contains the prospect, ignoring case"""
+        needle = normalize_career_name(prospect)
+        for name, path in self.entries:
+            if needle in name:
+                return path
+        return None
+
+    def outlook(self, prospect: str) -> Optional[ProspectOutlook]:
+        """Memoized outlook of a prospect string, or None when no career path matches"""
+        try:
+            return self._outlooks[prospect]
+        except KeyError:
+            pass
+
+        path = self.find(prospect)
+        outlook = None
+        if path is not None:
+            outlook = ProspectOutlook(path, self.snapshot.sectors_by_id.get(path.sector_id))
+
+        if len(self._outlooks) >= MAX_MEMOIZED_PROSPECTS:
+            self._outlooks.clear()
+        self._outlooks[prospect] = outlook
+        return outlook
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "career_paths": len(self.entries),
+            "memoized_prospects": len(self._outlooks)
+        }
@@ -0,0 +1,260 @@
+"""
+Typed internal model of the recommendation pipeline.
+
+Agents still talk to each other through request/response dictionaries, but
+the data that flows through scoring is converted once into these slotted
+dataclasses: attribute access replaces chains of .get() calls, and the
+derived values scoring needs (subject sets, lower-cased text) are computed
+once per request instead of once per program and component. to_dict()
+produces the exact dictionaries the API has always returned.
+"""
+from dataclasses import dataclass, field
+from typing import Dict, Any, FrozenSet, List, Optional, Tuple, Union
+
+from database.catalog import ProgramRecord
+
+
+@dataclass(slots=True, frozen=True)
+class StudentProfile:
+    """Scoring view of a processed student profile"""
+
+    data: Dict[str, Any]
+    subjects: FrozenSet[str]
+    interests: Tuple[str, ...]
+    career_preferences: Tuple[str, ...]
+    location_preferences: Tuple[str, ...]
+    language_preference: str
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "StudentProfile":
+        subjects = set()
+        for results_field in ("ol_results", "al_results", "bac_results"):
+            if data.get(results_field):
+                subjects.update(data[results_field].keys())
+
+        return cls(
+            data=data,
+            subjects=frozenset(subjects),
+            interests=tuple(interest.lower() for interest in data.get("interests") or ()),
+            career_preferences=tuple(preference.lower() for preference in data.get("career_preferences") or ()),
+            location_preferences=tuple(preference.lower() for preference in data.get("location_preferences") or ()),
+            language_preference=data.get("language_preference", "en")
+        )
+
+    @classmethod
+    def coerce(cls, profile: Union["StudentProfile", Dict[str, Any]]) -> "StudentProfile":
+        return profile if isinstance(profile, cls) else cls.from_dict(profile or {})
+
+    @property
+    def has_preferences(self) -> bool:
+        return bool(self.interests or self.career_preferences)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self.data
+
+
+@dataclass(slots=True)
+class Eligibility:
+    """Eligibility report of one student for one program"""
+
+    eligible: bool = False
+    score: float = 0
+    match_reasons: List[str] = field(default_factory=list)
+    missing_requirements: List[str] = field(default_factory=list)
+    recommendations: List[str] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Eligibility":
+        return cls(
+            eligible=data.get("eligible", False),
+            score=data.get("score", 0),
+            match_reasons=data.get("match_reasons", []),
+            missing_requirements=data.get("missing_requirements", []),
+            recommendations=data.get("recommendations", [])
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "eligible": self.eligible,
+            "score": self.score,
+            "match_reasons": self.match_reasons,
+            "missing_requirements": self.missing_requirements,
+            "recommendations": self.recommendations
+        }
+
+
+@dataclass(slots=True, frozen=True)
+class ProgramView:
+    """
+    A matched program: its catalog data, university and eligibility.
+
+    `data` and `university` are the shared catalog dictionaries and must not
+    be modified; the lifted attributes keep the defaults the dictionary
+    lookups they replace used.
+    """
+
+    data: Dict[str, Any]
+    university: Optional[Dict[str, Any]]
+    eligibility: Eligibility
+    id: Optional[int]
+    required_subjects: List[str]
+    required_subject_set: FrozenSet[str]
+    career_prospects: List[str]
+    career_prospects_lower: Tuple[str, ...]
+    search_text: str
+    tuition_fee_fcfa: Any
+    university_name: Optional[str]
+    university_region: Optional[str]
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ProgramView":
+        """View of a program dictionary (catalog fields plus "university" and "eligibility")"""
+        eligibility = data.get("eligibility", {})
+        if not isinstance(eligibility, Eligibility):
+            eligibility = Eligibility.from_dict(eligibility)
+        return cls._build(data, data.get("university"), eligibility)
+
+    @classmethod
+    def from_record(cls, program: ProgramRecord, eligibility: Eligibility) -> "ProgramView":
+        """View of a catalog snapshot record, without copying its dictionaries"""
+        university = program.university.data if program.university else None
+        return cls._build(program.data, university, eligibility)
+
+    @classmethod
+    def coerce(cls, program: Union["ProgramView", Dict[str, Any]]) -> "ProgramView":
+        return program if isinstance(program, cls) else cls.from_dict(program)
+
+    @classmethod
+    def _build(cls, data: Dict[str, Any], university: Optional[Dict[str, Any]], eligibility: Eligibility) -> "ProgramView":
+        required_subjects = data.get("required_subjects", [])
+        career_prospects = data.get("career_prospects", [])
+        university = university or {}
+        return cls(
+            data=data,
+            university=university or None,
+            eligibility=eligibility,
+            id=data.get("id"),
+            required_subjects=required_subjects,
+            required_subject_set=frozenset(required_subjects or ()),
+            career_prospects=career_prospects,
+            career_prospects_lower=tuple(prospect.lower() for prospect in career_prospects or ()),
+            search_text=f"{data.get('name', '')} {data.get('description', '')}".lower(),
+            tuition_fee_fcfa=data.get("tuition_fee_fcfa", 0),
+            university_name=university.get("name", "Unknown University"),
+            university_region=university.get("region", "")
+        )
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Catalog field lookup, for the few fields that are not lifted"""
+        return self.data.get(key, default)
+
+    def to_dict(self) -> Dict[str, Any]:
+        program_data = dict(self.data)
+        program_data["eligibility"] = self.eligibility.to_dict()
+        if self.university is not None:
+            program_data["university"] = dict(self.university)
+        return program_data
+
+
+@dataclass(slots=True, frozen=True)
+class CareerOutlook:
+    """Job market outlook and salary estimate of one program"""
+
+    average_demand: str = "medium"
+    growth_potential: str = "stable"
+    entrepreneurship_score: Any = 50
+    salary: Optional[Dict[str, int]] = None
+
+    @classmethod
+    def index(cls, job_insights: Dict[str, Any]) -> Dict[int, "CareerOutlook"]:
+        """
+        Outlooks of every program in a job insights payload, by program id.
+
+        Program ids are int keys in process but strings once the insights
+        went through JSON (the result cache), so both are accepted.
+        """
+        career_outlook = job_insights.get("career_outlook", {})
+        program_salaries = job_insights.get("salary_expectations", {}).get("program_salaries", {})
+
+        outlooks = {}
+        for program_id in set(career_outlook) | set(program_salaries):
+            outlook = career_outlook.get(program_id, {})
+            outlooks[_program_key(program_id)] = cls(
+                average_demand=outlook.get("average_demand", "medium"),
+                growth_potential=outlook.get("growth_potential", "stable"),
+                entrepreneurship_score=outlook.get("entrepreneurship_score", 50),
+                salary=program_salaries.get(program_id)
+            )
+        return outlooks
+
+
+DEFAULT_OUTLOOK = CareerOutlook()
+
+
+def _program_key(program_id: Any) -> Any:
+    if isinstance(program_id, str) and program_id.isdigit():
+        return int(program_id)
+    return program_id
+
+
+@dataclass(slots=True)
+class ScoredRecommendation:
+    """One scored and explained program recommendation"""
+
+    program: ProgramView
+    match_score: float
+    confidence_score: float
+    ranking_position: int
+    component_scores: Dict[str, float]
+    reasons: List[str]
+    pros: List[str]
+    cons: List[str]
+    requirements_met: List[str]
+    requirements_missing: List[str]
+    employment_outlook: str
+    salary_expectations: Dict[str, Any]
+    preparation_tips: List[str]
+    recommended_subjects: List[str]
+    skill_gaps: List[str]
+
+    def to_dict(self) -> Dict[str, Any]:
+        program = self.program
+        return {
+            "program_id": program.id,
+            "program_name": program.get("name"),
+            "program_code": program.get("code"),
+            "university_name": program.university_name,
+            "degree_type": program.get("degree_type"),
+            "duration_years": program.get("duration_years"),
+            "faculty": program.get("faculty"),
+            "match_score": self.match_score,
+            "confidence_score": self.confidence_score,
+            "ranking_position": self.ranking_position,
+
+            # Detailed scores
+            "component_scores": self.component_scores,
+
+            # Eligibility information
+            "eligibility": program.eligibility.to_dict(),
+
+            # Reasoning
+            "reasons": self.reasons,
+            "pros": self.pros,
+            "cons": self.cons,
+            "requirements_met": self.requirements_met,
+            "requirements_missing": self.requirements_missing,
+
+            # Career information
+            "career_prospects": program.career_prospects,
+            "employment_outlook": self.employment_outlook,
+            "salary_expectations": self.salary_expectations,
+
+            # Preparation guidance
+            "preparation_tips": self.preparation_tips,
+            "recommended_subjects": self.recommended_subjects,
+            "skill_gaps": self.skill_gaps,
+
+            # Alternative options
+            "alternative_programs": [],  # To be filled by other analysis
+            "fallback_options": []       # To be filled by other analysis
+        }
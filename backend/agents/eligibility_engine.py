@@ -0,0 +1,256 @@
+from typing import Dict, Any, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from database.catalog import CatalogSnapshot, ProgramRecord
+
+
+class CompiledCatalog:
+    """
+    Column-oriented copy of the active programs of one catalog snapshot.
+
+    Nullable minimums are stored as 0 so that "is this requirement set" is the
+    same truthiness test the scalar evaluator uses. Required subjects become a
+    program x subject matrix of occurrence counts (lists may repeat a subject)
+    plus a boolean mask of the distinct subjects.
+    """
+
+    __slots__ = (
+        "snapshot", "version", "programs", "positions",
+        "min_ol", "min_al", "min_french", "competitive",
+        "required_count", "subject_index", "subject_occurrences", "subject_mask"
+    )
+
+    def __init__(self, snapshot: CatalogSnapshot):
+        self.snapshot = snapshot
+        self.version = snapshot.version
+        self.programs: Tuple[ProgramRecord, ...] = snapshot.programs
+        self.positions = {program.id: position for position, program in enumerate(self.programs)}
+
+        self.min_ol = np.array([program.minimum_ol_points or 0 for program in self.programs], dtype=np.float64)
+        self.min_al = np.array([program.minimum_al_points or 0 for program in self.programs], dtype=np.float64)
+        self.min_french = np.array([program.minimum_french_average or 0 for program in self.programs], dtype=np.float64)
+        self.competitive = np.array([bool(program.is_competitive) for program in self.programs], dtype=bool)
+
+        self.subject_index: Dict[str, int] = {}
+        for program in self.programs:
+            for subject in program.required_subjects or ():
+                self.subject_index.setdefault(subject, len(self.subject_index))
+
+        self.required_count = np.zeros(len(self.programs), dtype=np.float64)
+        occurrences = np.zeros((len(self.programs), len(self.subject_index)), dtype=np.float64)
+        for position, program in enumerate(self.programs):
+            required = program.required_subjects or ()
+            self.required_count[position] = len(required)
+            for subject in required:
+                occurrences[position, self.subject_index[subject]] += 1
+
+        self.subject_occurrences = occurrences
+        self.subject_mask = (occurrences > 0).astype(np.float64)
+
+    def subject_matrix(self, subject_sets: Iterable[Iterable[str]]) -> np.ndarray:
+        """Students x subjects one-hot matrix over the compiled subject vocabulary"""
+        rows = list(subject_sets)
+        matrix = np.zeros((len(rows), len(self.subject_index)), dtype=np.float64)
+        for row, subjects in enumerate(rows):
+            for subject in subjects:
+                column = self.subject_index.get(subject)
+                if column is not None:
+                    matrix[row, column] = 1.0
+        return matrix
+
+
+class EligibilityScores:
+    """Eligible flags and scores of one student against a set of programs"""
+
+    __slots__ = ("programs", "eligible", "score", "fractional")
+
+    def __init__(self, programs: Sequence[ProgramRecord], eligible: np.ndarray, score: np.ndarray, fractional: np.ndarray):
+        self.programs = programs
+        self.eligible = eligible
+        self.score = score
+        self.fractional = fractional
+
+    def __len__(self) -> int:
+        return len(self.programs)
+
+    def ranking(self) -> np.ndarray:
+        """
+        Positions ordered by (eligible, score) descending.
+
+        Ties keep catalog order, exactly like the stable reverse sort used by
+        the scalar implementation.
+        """
+        positions = np.arange(len(self.programs))
+        return np.lexsort((positions, -self.score, -self.eligible.astype(np.int8)))
+
+    def top(self, limit: int) -> List[ProgramRecord]:
+        return [self.programs[position] for position in self.ranking()[:limit]]
+
+    def result_at(self, position: int) -> Dict[str, Any]:
+        """Eligible/score pair with the same types the scalar evaluator returns"""
+        score = float(self.score[position])
+        return {
+            "eligible": bool(self.eligible[position]),
+            "score": score if self.fractional[position] else int(score)
+        }
+
+
+class EligibilityEngine:
+    """
+    Vectorized counterpart of UniversityAgent's GCE and French eligibility rules.
+
+    Scores one student, or a whole batch of students, against every program
+    in a single NumPy pass. Only the eligible flag and score are computed
+    here; reason strings are left to the scalar evaluator for the few
+    programs that are actually returned.
+    """
+
+    def __init__(self):
+        self._compiled: Optional[CompiledCatalog] = None
+
+    def compile(self, snapshot: CatalogSnapshot) -> CompiledCatalog:
+        """Get the compiled arrays for a snapshot, rebuilding them when the snapshot changes"""
+        compiled = self._compiled
+        if compiled is None or compiled.snapshot is not snapshot:
+            compiled = CompiledCatalog(snapshot)
+            self._compiled = compiled
+        return compiled
+
+    def score(
+        self,
+        snapshot: CatalogSnapshot,
+        student_profile: Dict[str, Any],
+        programs: Optional[Sequence[ProgramRecord]] = None
+    ) -> EligibilityScores:
+        """Score a student against all active programs, or against a subset of them"""
+        return self.score_many(snapshot, [student_profile], programs)[0]
+
+    def score_many(
+        self,
+        snapshot: CatalogSnapshot,
+        student_profiles: Sequence[Dict[str, Any]],
+        programs: Optional[Sequence[ProgramRecord]] = None
+    ) -> List[EligibilityScores]:
+        """
+        Score several students at once as a students x programs matrix.
+
+        Students are grouped by exam system and each group is scored in one
+        pass; the result list is in the same order as student_profiles.
+        """
+        compiled = self.compile(snapshot)
+        size = len(compiled.programs)
+
+        groups: Dict[str, List[int]] = {"gce": [], "french": [], "other": []}
+        for row, profile in enumerate(student_profiles):
+            exam_system = profile.get("exam_system", "")
+            groups[exam_system if exam_system in ("gce", "french") else "other"].append(row)
+
+        eligible = np.zeros((len(student_profiles), size), dtype=bool)
+        score = np.zeros((len(student_profiles), size))
+        fractional = np.zeros((len(student_profiles), size), dtype=bool)
+
+        for exam_system, scorer in (("gce", self._score_gce), ("french", self._score_french)):
+            rows = groups[exam_system]
+            if rows:
+                eligible[rows], score[rows], fractional[rows] = scorer(
+                    compiled, [student_profiles[row] for row in rows]
+                )
+
+        if programs is None:
+            programs = compiled.programs
+        else:
+            positions = np.fromiter(
+                (compiled.positions[program.id] for program in programs), dtype=np.intp, count=len(programs)
+            )
+            programs = tuple(programs)
+            eligible, score, fractional = eligible[:, positions], score[:, positions], fractional[:, positions]
+
+        return [
+            EligibilityScores(programs, eligible[row], score[row], fractional[row])
+            for row in range(len(student_profiles))
+        ]
+
+    def _score_gce(self, compiled: CompiledCatalog, student_profiles: List[Dict[str, Any]]):
+        ol_points = self._column([profile.get("ol_points", 0) for profile in student_profiles])
+        al_points = self._column([profile.get("al_points", 0) for profile in student_profiles])
+        student_subjects = compiled.subject_matrix(
+            set(profile.get("ol_results", {}).keys()) | set(profile.get("al_results", {}).keys())
+            for profile in student_profiles
+        )
+
+        shape = (len(student_profiles), len(compiled.programs))
+        score = np.zeros(shape)
+        missing = np.zeros(shape)
+
+        # O-Level minimum: +20 when met, -10 (floored at 0) when not
+        score, missing = self._apply_minimum(score, missing, compiled.min_ol, ol_points, 20, 10)
+
+        # A-Level minimum: +30 when met, -20 (floored at 0) when not
+        score, missing = self._apply_minimum(score, missing, compiled.min_al, al_points, 30, 20)
+
+        score, missing = self._apply_required_subjects(score, missing, compiled, student_subjects)
+
+        score = score + np.where((al_points > 0) & compiled.competitive, 15, 0)
+
+        score = self._apply_final_eligibility(score, missing)
+
+        # Subject match bonus over distinct subjects, divided by the raw list length
+        has_required = compiled.required_count > 0
+        distinct_matches = student_subjects @ compiled.subject_mask.T
+        bonus = distinct_matches / np.maximum(compiled.required_count, 1) * 20
+        score = np.where(has_required, score + bonus, score)
+
+        return missing <= 2, score, np.broadcast_to(has_required, shape)
+
+    def _score_french(self, compiled: CompiledCatalog, student_profiles: List[Dict[str, Any]]):
+        french_average = self._column([profile.get("french_average", 0) for profile in student_profiles])
+        student_subjects = compiled.subject_matrix(
+            set(profile.get("bepc_results", {}).keys()) | set(profile.get("bac_results", {}).keys())
+            for profile in student_profiles
+        )
+
+        shape = (len(student_profiles), len(compiled.programs))
+        score = np.zeros(shape)
+        missing = np.zeros(shape)
+
+        # Average minimum: +40 when met, -20 (floored at 0) when not
+        score, missing = self._apply_minimum(score, missing, compiled.min_french, french_average, 40, 20)
+
+        score, missing = self._apply_required_subjects(score, missing, compiled, student_subjects)
+
+        # Baccalauréat bonus, or a smaller one for BEPC only
+        qualification_bonus = self._column([
+            20 if profile.get("bac_results") else 10 if profile.get("bepc_results") else 0
+            for profile in student_profiles
+        ])
+        score = score + qualification_bonus
+
+        score = self._apply_final_eligibility(score, missing)
+
+        return missing <= 2, score, np.zeros(shape, dtype=bool)
+
+    def _column(self, values: List[Any]) -> np.ndarray:
+        """Per-student values as a column that broadcasts across programs"""
+        return np.array(values, dtype=np.float64).reshape(-1, 1)
+
+    def _apply_minimum(self, score, missing, minimums, value, reward, penalty):
+        required = minimums != 0
+        met = value >= minimums
+        score = np.where(required & met, score + reward, score)
+        score = np.where(required & ~met, np.maximum(0, score - penalty), score)
+        missing = missing + (required & ~met)
+        return score, missing
+
+    def _apply_required_subjects(self, score, missing, compiled: CompiledCatalog, student_subjects: np.ndarray):
+        # Every occurrence in the required list is either +10 or one missing requirement
+        matched = student_subjects @ compiled.subject_occurrences.T
+        score = score + 10 * matched
+        missing = missing + (compiled.required_count - matched)
+        return score, missing
+
+    def _apply_final_eligibility(self, score, missing):
+        fully_eligible = missing == 0
+        conditionally_eligible = (missing > 0) & (missing <= 2)
+        score = np.where(fully_eligible, np.minimum(100, score + 25), score)
+        return np.where(conditionally_eligible, np.minimum(75, score), score)
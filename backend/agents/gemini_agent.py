@@ -1,10 +1,16 @@
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Awaitable, Callable, List, Optional, Tuple
 import asyncio
 import json
 from datetime import datetime
+from functools import partial
 
 from .base_agent import LLMAgent
+from .single_flight import SingleFlight
 from database.connection import get_redis
+from core.config import settings
+
+
+SectionCallback = Callable[[Dict[str, Any]], None]
 
 
 class GeminiAgent(LLMAgent):
@@ -13,21 +19,37 @@ class GeminiAgent(LLMAgent):
     using Google Gemini for personalized study guides, career advice, and content generation.
     """
     
+    GENERAL_GUIDANCE_SECTIONS = ("general_advice", "study_tips", "career_planning")
+    RECOMMENDATION_SECTIONS = ("personalized_advice", "study_guide_summary")
+    
     def __init__(self, agent_id: str, name: str, description: str):
         super().__init__(agent_id, name, description)
         self.redis_client = None
         self.cache_ttl = 3600  # 1 hour cache TTL
+        self.single_flight = SingleFlight(
+            lock_ttl=settings.gemini_single_flight_lock_ttl,
+            wait_timeout=settings.gemini_single_flight_wait
+        )
     
     async def _initialize_resources(self):
         """Initialize Gemini client and Redis cache"""
         await super()._initialize_resources()
         self.redis_client = await get_redis()
+        if settings.gemini_distributed_single_flight:
+            self.single_flight.attach_redis(self.redis_client)
         self.logger.info("Gemini agent resources initialized")
     
     async def _cleanup_resources(self):
         """Cleanup resources"""
         await super()._cleanup_resources()
         self.redis_client = None
+        self.single_flight.attach_redis(None)
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Get agent status, including prompt coalescing counters"""
+        status = super().get_status()
+        status["single_flight"] = self.single_flight.get_stats()
+        return status
     
     def get_required_fields(self) -> List[str]:
         return ["action"]
@@ -38,6 +60,8 @@ class GeminiAgent(LLMAgent):
         
         if action == "enhance_recommendations":
             return await self._enhance_recommendations(request)
+        elif action == "generate_general_guidance":
+            return await self._generate_general_guidance(request)
         elif action == "generate_study_guide":
             return await self._generate_study_guide(request)
         elif action == "generate_career_advice":
@@ -55,44 +79,87 @@ class GeminiAgent(LLMAgent):
         recommendations = request.get("recommendations", [])
         language = request.get("language", "en")
         session_id = request.get("session_id")
+        include_general_guidance = request.get("include_general_guidance", True)
+        on_section = request.get("section_callback")
         
         if not self.llm_client:
             # Return without enhancement if Gemini is not available
+            enhanced_content = {"recommendations": [], "sources": {"recommendations": []}}
+            if include_general_guidance:
+                guidance = self._fallback_general_guidance()
+                enhanced_content = {
+                    **guidance,
+                    "recommendations": [],
+                    "sources": {**guidance["sources"], "recommendations": []}
+                }
             return {
                 "success": True,
-                "enhanced_content": {
-                    "general_advice": "Focus on your strengths and interests when choosing your academic path.",
-                    "recommendations": []
-                },
+                "enhanced_content": enhanced_content,
                 "note": "AI enhancement not available - using fallback content"
             }
         
-        enhanced_content = {
-            "general_advice": "",
-            "study_tips": [],
-            "career_planning": "",
-            "recommendations": []
-        }
+        enhanced_content = {"recommendations": []}
         
         try:
-            # Generate general advice for the student
-            general_advice = await self._generate_general_advice(student_profile, language)
-            enhanced_content["general_advice"] = general_advice
+            # All prompts for this request are issued together and share one deadline
+            sections: Dict[str, Callable[[], Awaitable[Tuple[Any, str]]]] = {}
+            fallbacks: Dict[str, Callable[[], Any]] = {}
             
-            # Generate study tips
-            study_tips = await self._generate_study_tips(student_profile, language)
-            enhanced_content["study_tips"] = study_tips
-            
-            # Generate career planning advice
-            career_planning = await self._generate_career_planning_advice(student_profile, language)
-            enhanced_content["career_planning"] = career_planning
+            if include_general_guidance:
+                self._add_general_guidance_sections(sections, fallbacks, student_profile, language)
             
             # Enhance top 3 recommendations with detailed content
-            for i, recommendation in enumerate(recommendations[:3]):
-                enhanced_rec = await self._enhance_single_recommendation(
-                    recommendation, student_profile, language
-                )
+            top_recommendations = recommendations[:3]
+            cached_recommendations = await asyncio.gather(*(
+                self._get_cached_recommendation(recommendation, student_profile, language)
+                for recommendation in top_recommendations
+            ))
+            
+            for i, (recommendation, cached) in enumerate(zip(top_recommendations, cached_recommendations)):
+                if cached is None:
+                    self._add_recommendation_sections(sections, fallbacks, i, recommendation, language)
+            
+            for i, cached in enumerate(cached_recommendations):
+                if cached is not None:
+                    for field in self.RECOMMENDATION_SECTIONS:
+                        self._notify_section(on_section, f"recommendation_{i}.{field}", cached.get(field), "cache")
+            
+            semaphore, expires_at = self._request_budget(request)
+            results, sources, timed_out = await self._fan_out(sections, fallbacks, semaphore, expires_at, on_section)
+            
+            enhanced_content = {
+                **{name: results[name] for name in self.GENERAL_GUIDANCE_SECTIONS if name in results},
+                "recommendations": [],
+                "sources": {name: sources[name] for name in self.GENERAL_GUIDANCE_SECTIONS if name in sources}
+            }
+            enhanced_content["sources"]["recommendations"] = []
+            
+            for i, (recommendation, cached) in enumerate(zip(top_recommendations, cached_recommendations)):
+                if cached is not None:
+                    enhanced_rec = cached
+                    rec_sources = {field: "cache" for field in self.RECOMMENDATION_SECTIONS}
+                else:
+                    enhanced_rec = {
+                        "personalized_advice": results[f"recommendation_{i}.personalized_advice"],
+                        "study_guide_summary": results[f"recommendation_{i}.study_guide_summary"],
+                        "success_tips": [],
+                        "preparation_checklist": []
+                    }
+                    rec_sources = {
+                        field: sources[f"recommendation_{i}.{field}"] for field in self.RECOMMENDATION_SECTIONS
+                    }
+                    # Only fully generated content is worth reusing
+                    if all(source == "live" for source in rec_sources.values()):
+                        await self._cache_content(
+                            self._recommendation_cache_key(recommendation, student_profile, language),
+                            json.dumps(enhanced_rec)
+                        )
+                
                 enhanced_content["recommendations"].append(enhanced_rec)
+                enhanced_content["sources"]["recommendations"].append(rec_sources)
+            
+            if timed_out:
+                enhanced_content["partial"] = True
             
             return {
                 "success": True,
@@ -107,15 +174,200 @@ class GeminiAgent(LLMAgent):
                 "enhanced_content": enhanced_content  # Return partial content
             }
     
-    async def _generate_general_advice(self, student_profile: Dict[str, Any], language: str) -> str:
+    async def _generate_general_guidance(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Generate the student-level advice that does not depend on recommendations"""
+        student_profile = request.get("student_profile", {})
+        language = request.get("language", "en")
+        on_section = request.get("section_callback")
+        
+        if not self.llm_client:
+            guidance = self._fallback_general_guidance()
+            self._notify_section(on_section, "general_advice", guidance["general_advice"], "fallback")
+            return {
+                "success": True,
+                "enhanced_content": guidance,
+                "note": "AI enhancement not available - using fallback content"
+            }
+        
+        try:
+            return {
+                "success": True,
+                "enhanced_content": await self._build_general_guidance(
+                    student_profile, language, *self._request_budget(request), on_section
+                )
+            }
+        except Exception as e:
+            self.logger.error(f"General guidance generation failed: {e}")
+            return {
+                "success": False,
+                "error": str(e),
+                "enhanced_content": {}
+            }
+    
+    async def _build_general_guidance(
+        self, 
+        student_profile: Dict[str, Any], 
+        language: str, 
+        semaphore: asyncio.Semaphore, 
+        expires_at: float, 
+        on_section: Optional[SectionCallback] = None
+    ) -> Dict[str, Any]:
+        """Generate general advice, study tips and career planning for the student concurrently"""
+        sections: Dict[str, Callable[[], Awaitable[Tuple[Any, str]]]] = {}
+        fallbacks: Dict[str, Callable[[], Any]] = {}
+        self._add_general_guidance_sections(sections, fallbacks, student_profile, language)
+        
+        results, sources, timed_out = await self._fan_out(sections, fallbacks, semaphore, expires_at, on_section)
+        
+        guidance = {**results, "sources": sources}
+        if timed_out:
+            guidance["partial"] = True
+        return guidance
+    
+    def _add_general_guidance_sections(
+        self, 
+        sections: Dict[str, Callable[[], Awaitable[Tuple[Any, str]]]], 
+        fallbacks: Dict[str, Callable[[], Any]], 
+        student_profile: Dict[str, Any], 
+        language: str
+    ):
+        """Register the general guidance prompts and their fallbacks for a fan-out"""
+        sections["general_advice"] = partial(self._generate_general_advice, student_profile, language)
+        sections["study_tips"] = partial(self._generate_study_tips, student_profile, language)
+        sections["career_planning"] = partial(self._generate_career_planning_advice, student_profile, language)
+        
+        fallbacks["general_advice"] = partial(self._fallback_general_advice, language)
+        fallbacks["study_tips"] = partial(self._fallback_study_tips, language)
+        fallbacks["career_planning"] = partial(self._fallback_career_planning, language)
+    
+    def _add_recommendation_sections(
+        self, 
+        sections: Dict[str, Callable[[], Awaitable[Tuple[Any, str]]]], 
+        fallbacks: Dict[str, Callable[[], Any]], 
+        index: int, 
+        recommendation: Dict[str, Any], 
+        language: str
+    ):
+        """Register the two prompts of one recommendation and their fallbacks for a fan-out"""
+        program_name = recommendation.get("program_name", "Unknown Program")
+        university_name = recommendation.get("university_name", "Unknown University")
+        prefix = f"recommendation_{index}"
+        
+        sections[f"{prefix}.personalized_advice"] = partial(
+            self._generate_recommendation_advice, program_name, university_name, language
+        )
+        sections[f"{prefix}.study_guide_summary"] = partial(
+            self._generate_study_guide_summary, program_name, language
+        )
+        
+        fallbacks[f"{prefix}.personalized_advice"] = partial(
+            self._fallback_recommendation_advice, university_name, language
+        )
+        fallbacks[f"{prefix}.study_guide_summary"] = partial(self._fallback_study_guide_summary, language)
+    
+    def _request_budget(self, request: Dict[str, Any]) -> Tuple[asyncio.Semaphore, float]:
+        """
+        Semaphore and absolute deadline (event loop time) of a request's prompts.
+        
+        Callers that run several fan-outs for one request pass the same pair in
+        "semaphore" and "expires_at"; otherwise a fresh pair is created from
+        the settings (or "deadline_seconds").
+        """
+        semaphore = request.get("semaphore") or asyncio.Semaphore(max(1, settings.gemini_max_concurrency))
+        expires_at = request.get("expires_at")
+        if expires_at is None:
+            deadline = request.get("deadline_seconds", settings.gemini_request_deadline)
+            expires_at = asyncio.get_running_loop().time() + deadline
+        return semaphore, expires_at
+    
+    async def _fan_out(
+        self, 
+        sections: Dict[str, Callable[[], Awaitable[Tuple[Any, str]]]], 
+        fallbacks: Dict[str, Callable[[], Any]], 
+        semaphore: asyncio.Semaphore,
+        expires_at: float,
+        on_section: Optional[SectionCallback] = None
+    ) -> Tuple[Dict[str, Any], Dict[str, str], bool]:
+        """
+        Run section generators concurrently under a semaphore and a deadline.
+        
+        Each generator returns (content, source). Sections that fail or are
+        still running at expires_at (event loop time) are cancelled and get
+        their fallback content with source "fallback". on_section, if given,
+        is called for every section as soon as its content is settled.
+        Returns (results, sources, partial).
+        """
+        if not sections:
+            return {}, {}, False
+        
+        async def run_section(generate):
+            async with semaphore:
+                return await generate()
+        
+        tasks = {asyncio.create_task(run_section(generate)): name for name, generate in sections.items()}
+        results: Dict[str, Any] = {}
+        sources: Dict[str, str] = {}
+        
+        def settle(name: str, task: Optional[asyncio.Task]):
+            if task is not None and task.exception() is None:
+                results[name], sources[name] = task.result()
+            else:
+                if task is not None:
+                    self.logger.error(f"AI section {name} failed: {task.exception()}")
+                results[name], sources[name] = fallbacks[name](), "fallback"
+            self._notify_section(on_section, name, results[name], sources[name])
+        
+        loop = asyncio.get_running_loop()
+        pending = set(tasks)
+        try:
+            while pending:
+                remaining = expires_at - loop.time()
+                if remaining <= 0:
+                    break
+                done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    settle(tasks[task], task)
+        finally:
+            # Also runs when the caller is cancelled, so no section outlives its request
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        
+        if pending:
+            self.logger.warning(f"AI content deadline reached, {len(pending)} section(s) use fallback content")
+            for task in pending:
+                settle(tasks[task], None)
+        
+        return results, sources, bool(pending)
+    
+    def _notify_section(self, on_section: Optional[SectionCallback], name: str, content: Any, source: str):
+        """Report one finished section, e.g. to a streaming response"""
+        if on_section is None:
+            return
+        
+        section = {"section": name, "content": content, "source": source}
+        if name.startswith("recommendation_"):
+            prefix, field = name.split(".", 1)
+            section["section"] = field
+            section["recommendation_index"] = int(prefix[len("recommendation_"):])
+        
+        try:
+            on_section(section)
+        except Exception as e:
+            self.logger.warning(f"Section callback failed for {name}: {e}")
+    
+    def _fallback_general_guidance(self) -> Dict[str, Any]:
+        """General guidance used when Gemini is not available"""
+        return {
+            "general_advice": "Focus on your strengths and interests when choosing your academic path.",
+            "sources": {"general_advice": "fallback"}
+        }
+    
+    async def _generate_general_advice(self, student_profile: Dict[str, Any], language: str) -> Tuple[str, str]:
         """Generate general advice for the student"""
         cache_key = f"general_advice:{self._hash_profile(student_profile)}:{language}"
         
-        # Check cache first
-        cached_content = await self._get_cached_content(cache_key)
-        if cached_content:
-            return cached_content
-        
         # Prepare context
         exam_system = student_profile.get("exam_system", "unknown")
         interests = student_profile.get("interests", [])
@@ -152,25 +404,22 @@ class GeminiAgent(LLMAgent):
             Be positive and motivating in your response.
             """
         
-        content = await self.generate_content(prompt)
+        content, source = await self._generate_cached(cache_key, prompt)
         if content:
-            await self._cache_content(cache_key, content)
-            return content
+            return content, source
         
-        # Fallback content
+        return self._fallback_general_advice(language), "fallback"
+    
+    def _fallback_general_advice(self, language: str) -> str:
         if language == "fr":
             return "Votre parcours éducatif est unique. Concentrez-vous sur vos forces et explorez les opportunités qui correspondent à vos intérêts. Le Cameroun offre de nombreuses possibilités pour les étudiants motivés."
         else:
             return "Your educational journey is unique. Focus on your strengths and explore opportunities that align with your interests. Cameroon offers many possibilities for motivated students."
     
-    async def _generate_study_tips(self, student_profile: Dict[str, Any], language: str) -> List[str]:
+    async def _generate_study_tips(self, student_profile: Dict[str, Any], language: str) -> Tuple[List[str], str]:
         """Generate study tips for the student"""
         cache_key = f"study_tips:{self._hash_profile(student_profile)}:{language}"
         
-        cached_content = await self._get_cached_content(cache_key)
-        if cached_content:
-            return json.loads(cached_content)
-        
         exam_system = student_profile.get("exam_system", "unknown")
         
         if language == "fr":
@@ -192,20 +441,25 @@ class GeminiAgent(LLMAgent):
             Focus on effective study strategies, time management, and exam preparation.
             """
         
-        content = await self.generate_content(prompt)
+        content, source = await self._generate_cached(cache_key, prompt, transform=self._extract_study_tips)
         if content:
-            try:
-                # Extract JSON from content
-                import re
-                json_match = re.search(r'\[.*\]', content, re.DOTALL)
-                if json_match:
-                    tips = json.loads(json_match.group())
-                    await self._cache_content(cache_key, json.dumps(tips))
-                    return tips
-            except:
-                pass
+            return json.loads(content), source
         
-        # Fallback tips
+        return self._fallback_study_tips(language), "fallback"
+    
+    def _extract_study_tips(self, content: str) -> Optional[str]:
+        """Pull the JSON list of tips out of a model response, re-encoded for caching"""
+        try:
+            # Extract JSON from content
+            import re
+            json_match = re.search(r'\[.*\]', content, re.DOTALL)
+            if json_match:
+                return json.dumps(json.loads(json_match.group()))
+        except:
+            pass
+        return None
+    
+    def _fallback_study_tips(self, language: str) -> List[str]:
         if language == "fr":
             return [
                 "Créez un calendrier d'étude régulier",
@@ -223,14 +477,10 @@ class GeminiAgent(LLMAgent):
                 "Take regular breaks while studying"
             ]
     
-    async def _generate_career_planning_advice(self, student_profile: Dict[str, Any], language: str) -> str:
+    async def _generate_career_planning_advice(self, student_profile: Dict[str, Any], language: str) -> Tuple[str, str]:
         """Generate career planning advice"""
         cache_key = f"career_planning:{self._hash_profile(student_profile)}:{language}"
         
-        cached_content = await self._get_cached_content(cache_key)
-        if cached_content:
-            return cached_content
-        
         interests = student_profile.get("interests", [])
         career_prefs = student_profile.get("career_preferences", [])
         
@@ -263,104 +513,102 @@ class GeminiAgent(LLMAgent):
             Be practical and action-oriented.
             """
         
-        content = await self.generate_content(prompt)
+        content, source = await self._generate_cached(cache_key, prompt)
         if content:
-            await self._cache_content(cache_key, content)
-            return content
+            return content, source
         
-        # Fallback content
+        return self._fallback_career_planning(language), "fallback"
+    
+    def _fallback_career_planning(self, language: str) -> str:
         if language == "fr":
             return "Explorez activement différentes carrières à travers des stages, du bénévolat et des conversations avec des professionnels. Construisez votre réseau et acquérez une expérience pratique dès maintenant."
         else:
             return "Actively explore different careers through internships, volunteering, and conversations with professionals. Build your network and gain practical experience early."
     
-    async def _enhance_single_recommendation(
+    async def _get_cached_recommendation(
         self, 
         recommendation: Dict[str, Any], 
         student_profile: Dict[str, Any], 
         language: str
-    ) -> Dict[str, Any]:
-        """Enhance a single recommendation with detailed content"""
-        program_name = recommendation.get("program_name", "Unknown Program")
-        university_name = recommendation.get("university_name", "Unknown University")
-        
-        cache_key = f"recommendation:{program_name}:{self._hash_profile(student_profile)}:{language}"
-        
-        cached_content = await self._get_cached_content(cache_key)
+    ) -> Optional[Dict[str, Any]]:
+        """Get previously generated content for a single recommendation"""
+        cached_content = await self._get_cached_content(
+            self._recommendation_cache_key(recommendation, student_profile, language)
+        )
         if cached_content:
             try:
                 return json.loads(cached_content)
             except:
                 pass
-        
-        enhanced = {
-            "personalized_advice": "",
-            "study_guide_summary": "",
-            "success_tips": [],
-            "preparation_checklist": []
-        }
-        
-        try:
-            # Generate personalized advice
-            if language == "fr":
-                advice_prompt = f"""
-                Donnez des conseils personnalisés pour un étudiant camerounais considérant {program_name} à {university_name}.
-                
-                Rédigez un paragraphe motivant et informatif expliquant pourquoi ce programme pourrait être un bon choix et comment réussir.
-                Soyez spécifique au contexte camerounais et encourageant.
-                """
-            else:
-                advice_prompt = f"""
-                Provide personalized advice for a Cameroonian student considering {program_name} at {university_name}.
-                
-                Write a motivating and informative paragraph explaining why this program might be a good choice and how to succeed.
-                Be specific to the Cameroonian context and encouraging.
-                """
-            
-            advice = await self.generate_content(advice_prompt)
-            if advice:
-                enhanced["personalized_advice"] = advice.strip()
+        return None
+    
+    def _recommendation_cache_key(self, recommendation: Dict[str, Any], student_profile: Dict[str, Any], language: str) -> str:
+        program_name = recommendation.get("program_name", "Unknown Program")
+        return f"recommendation:{program_name}:{self._hash_profile(student_profile)}:{language}"
+    
+    async def _generate_recommendation_advice(self, program_name: str, university_name: str, language: str) -> Tuple[str, str]:
+        """Generate personalized advice for one recommended program"""
+        if language == "fr":
+            prompt = f"""
+            Donnez des conseils personnalisés pour un étudiant camerounais considérant {program_name} à {university_name}.
             
-            # Generate study guide summary
-            if language == "fr":
-                study_prompt = f"""
-                Créez un résumé de guide d'étude pour préparer {program_name}.
-                
-                Donnez 3-4 points clés sur ce qu'il faut étudier et comment se préparer efficacement.
-                Soyez concis et pratique.
-                """
-            else:
-                study_prompt = f"""
-                Create a study guide summary for preparing for {program_name}.
-                
-                Provide 3-4 key points on what to study and how to prepare effectively.
-                Be concise and practical.
-                """
+            Rédigez un paragraphe motivant et informatif expliquant pourquoi ce programme pourrait être un bon choix et comment réussir.
+            Soyez spécifique au contexte camerounais et encourageant.
+            """
+        else:
+            prompt = f"""
+            Provide personalized advice for a Cameroonian student considering {program_name} at {university_name}.
             
-            study_guide = await self.generate_content(study_prompt)
-            if study_guide:
-                enhanced["study_guide_summary"] = study_guide.strip()
+            Write a motivating and informative paragraph explaining why this program might be a good choice and how to succeed.
+            Be specific to the Cameroonian context and encouraging.
+            """
+        
+        advice = await self.single_flight.do(
+            f"recommendation_advice:{program_name}:{university_name}:{language}",
+            partial(self.generate_content, prompt)
+        )
+        if advice and advice.strip():
+            return advice.strip(), "live"
+        
+        return self._fallback_recommendation_advice(university_name, language), "fallback"
+    
+    def _fallback_recommendation_advice(self, university_name: str, language: str) -> str:
+        if language == "fr":
+            return f"Ce programme à {university_name} offre d'excellentes opportunités. Concentrez-vous sur vos points forts académiques et préparez-vous soigneusement."
+        else:
+            return f"This program at {university_name} offers excellent opportunities. Focus on your academic strengths and prepare thoroughly."
+    
+    async def _generate_study_guide_summary(self, program_name: str, language: str) -> Tuple[str, str]:
+        """Generate a short study guide summary for one recommended program"""
+        if language == "fr":
+            prompt = f"""
+            Créez un résumé de guide d'étude pour préparer {program_name}.
             
-            # Cache the enhanced content
-            await self._cache_content(cache_key, json.dumps(enhanced))
+            Donnez 3-4 points clés sur ce qu'il faut étudier et comment se préparer efficacement.
+            Soyez concis et pratique.
+            """
+        else:
+            prompt = f"""
+            Create a study guide summary for preparing for {program_name}.
             
-        except Exception as e:
-            self.logger.error(f"Failed to enhance recommendation {program_name}: {e}")
-        
-        # Add fallback content if generation failed
-        if not enhanced["personalized_advice"]:
-            if language == "fr":
-                enhanced["personalized_advice"] = f"Ce programme à {university_name} offre d'excellentes opportunités. Concentrez-vous sur vos points forts académiques et préparez-vous soigneusement."
-            else:
-                enhanced["personalized_advice"] = f"This program at {university_name} offers excellent opportunities. Focus on your academic strengths and prepare thoroughly."
+            Provide 3-4 key points on what to study and how to prepare effectively.
+            Be concise and practical.
+            """
         
-        if not enhanced["study_guide_summary"]:
-            if language == "fr":
-                enhanced["study_guide_summary"] = "Révisez les matières principales, pratiquez les examens passés, et développez les compétences pertinentes pour ce domaine."
-            else:
-                enhanced["study_guide_summary"] = "Review core subjects, practice past exams, and develop relevant skills for this field."
+        study_guide = await self.single_flight.do(
+            f"study_guide_summary:{program_name}:{language}",
+            partial(self.generate_content, prompt)
+        )
+        if study_guide and study_guide.strip():
+            return study_guide.strip(), "live"
         
-        return enhanced
+        return self._fallback_study_guide_summary(language), "fallback"
+    
+    def _fallback_study_guide_summary(self, language: str) -> str:
+        if language == "fr":
+            return "Révisez les matières principales, pratiquez les examens passés, et développez les compétences pertinentes pour ce domaine."
+        else:
+            return "Review core subjects, practice past exams, and develop relevant skills for this field."
     
     async def _generate_study_guide(self, request: Dict[str, Any]) -> Dict[str, Any]:
         """Generate a detailed study guide for a specific program"""
@@ -446,6 +694,38 @@ class GeminiAgent(LLMAgent):
         cache_string = json.dumps(cache_elements, sort_keys=True)
         return hashlib.md5(cache_string.encode()).hexdigest()[:12]
     
+    async def _generate_cached(
+        self, 
+        cache_key: str, 
+        prompt: str, 
+        transform: Optional[Callable[[str], Optional[str]]] = None
+    ) -> Tuple[Optional[str], str]:
+        """
+        Serve a prompt from cache, or generate and cache it.
+        
+        Concurrent misses on the same key share one generation through the
+        single-flight layer. Returns (content, source) where content is None
+        when generation failed.
+        """
+        cached_content = await self._get_cached_content(cache_key)
+        if cached_content:
+            return cached_content, "cache"
+        
+        async def generate() -> Tuple[Optional[str], str]:
+            content = await self.generate_content(prompt)
+            if content and transform is not None:
+                content = transform(content)
+            if content:
+                await self._cache_content(cache_key, content)
+                return content, "live"
+            return None, "fallback"
+        
+        async def lookup() -> Optional[Tuple[str, str]]:
+            content = await self._get_cached_content(cache_key)
+            return (content, "cache") if content else None
+        
+        return await self.single_flight.do(cache_key, generate, lookup)
+    
     async def _get_cached_content(self, cache_key: str) -> Optional[str]:
         """Get content from Redis cache"""
         if not self.redis_client:
@@ -1,12 +1,16 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from sqlalchemy.orm import Session
 
-from .base_agent import BaseAgent
-from database.connection import SessionLocal
+from .base_agent import DatabaseAgent
+from .career_index import CareerIndex
+from .domain import ProgramView
+from .market_snapshot import MarketSnapshot
+from database.catalog import get_catalog_store
+from database.data_version import bump_data_version, JOB_MARKET
 from models.job_market import JobSector, Skill, CareerPath
 
 
-class JobMarketAgent(BaseAgent):
+class JobMarketAgent(DatabaseAgent):
     """
     Agent responsible for analyzing job market trends, career opportunities,
     and matching them with student profiles and academic programs.
@@ -14,19 +18,17 @@ class JobMarketAgent(BaseAgent):
     
     def __init__(self, agent_id: str, name: str, description: str):
         super().__init__(agent_id, name, description)
-        self.db_session = None
+        self._career_index: Optional[CareerIndex] = None
+        self._market_snapshot: Optional[MarketSnapshot] = None
     
     async def _initialize_resources(self):
-        """Initialize database connection and ensure sample data exists"""
-        self.db_session = SessionLocal()
+        """Ensure sample data exists"""
         await self._ensure_sample_data()
-        self.logger.info("Database session initialized for JobMarketAgent")
+        self.logger.info("JobMarketAgent initialized")
     
     async def _cleanup_resources(self):
-        """Cleanup database connection"""
-        if self.db_session:
-            self.db_session.close()
-            self.db_session = None
+        """Nothing to release; sessions are scoped to each request"""
+        pass
     
     def get_required_fields(self) -> List[str]:
         return ["action"]
@@ -37,6 +39,8 @@ class JobMarketAgent(BaseAgent):
         
         if action == "analyze_opportunities":
             return await self._analyze_opportunities(request)
+        elif action == "get_market_overview":
+            return await self._get_market_overview(request)
         elif action == "get_career_paths":
             return await self._get_career_paths(request)
         elif action == "get_skills_demand":
@@ -49,8 +53,9 @@ class JobMarketAgent(BaseAgent):
     async def _analyze_opportunities(self, request: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze job market opportunities for student and programs"""
         student_profile = request.get("student_profile", {})
-        programs = request.get("programs", [])
+        programs = [ProgramView.coerce(program) for program in request.get("programs", [])]
         session_id = request.get("session_id")
+        include_market_overview = request.get("include_market_overview", True)
         
         insights = {
             "career_outlook": {},
@@ -64,22 +69,24 @@ class JobMarketAgent(BaseAgent):
         # Analyze career prospects for each program
         program_careers = {}
         for program in programs:
-            career_prospects = program.get("career_prospects", [])
-            program_id = program.get("id")
-            
-            if career_prospects:
-                program_careers[program_id] = await self._analyze_program_careers(career_prospects)
+            if program.career_prospects:
+                program_careers[program.id] = await self._analyze_program_careers(program.career_prospects)
         
         insights["career_outlook"] = program_careers
         
-        # Get general market insights
-        insights["sector_analysis"] = await self._get_high_demand_sectors()
-        insights["skill_recommendations"] = await self._get_trending_skills()
-        insights["entrepreneurship_opportunities"] = await self._get_entrepreneurship_opportunities()
-        insights["government_priorities"] = await self._get_government_priority_sectors()
+        # Get general market insights (the orchestrator fetches these separately)
+        if include_market_overview:
+            overview = await self._build_market_overview()
+            insights["sector_analysis"] = overview["sector_analysis"]
+            insights["skill_recommendations"] = overview["skill_recommendations"]
+            insights["entrepreneurship_opportunities"] = overview["entrepreneurship_opportunities"]
+            insights["government_priorities"] = overview["government_priorities"]
+            sector_averages = overview["sector_salary_averages"]
+        else:
+            sector_averages = {}
         
         # Calculate salary expectations
-        insights["salary_expectations"] = await self._calculate_salary_expectations(programs)
+        insights["salary_expectations"] = self._calculate_salary_expectations(programs, sector_averages)
         
         return {
             "success": True,
@@ -87,6 +94,26 @@ class JobMarketAgent(BaseAgent):
             "analysis_timestamp": "2025-01-26T16:01:03Z"
         }
     
+    async def _get_market_overview(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Get student-independent market insights (sectors, skills, priorities)"""
+        return {
+            "success": True,
+            "overview": await self._build_market_overview()
+        }
+    
+    async def _build_market_overview(self) -> Dict[str, Any]:
+        """Collect the general market insights that do not depend on programs (shared, read-only)"""
+        return self.get_market_snapshot().overview
+    
+    def get_market_snapshot(self) -> MarketSnapshot:
+        """Get the market snapshot of the current catalog snapshot, rebuilding it when the snapshot changes"""
+        snapshot = get_catalog_store().snapshot
+        market_snapshot = self._market_snapshot
+        if market_snapshot is None or market_snapshot.snapshot is not snapshot:
+            market_snapshot = MarketSnapshot(snapshot)
+            self._market_snapshot = market_snapshot
+        return market_snapshot
+    
     async def _analyze_program_careers(self, career_prospects: List[str]) -> Dict[str, Any]:
         """Analyze specific career prospects for a program"""
         career_analysis = {
@@ -101,36 +128,20 @@ class JobMarketAgent(BaseAgent):
         total_entrepreneurship = 0
         analyzed_count = 0
         
+        career_index = self._get_career_index()
+        
         for career_name in career_prospects:
-            # Find matching career paths
-            career_path = self.db_session.query(CareerPath).filter(
-                CareerPath.name.ilike(f"%{career_name}%")
-            ).first()
+            # Find the matching career path and its sector scores
+            outlook = career_index.outlook(career_name)
             
-            if career_path:
-                career_data = career_path.to_dict()
-                
-                # Get related sector information
-                sector = self.db_session.query(JobSector).filter(
-                    JobSector.id == career_path.sector_id
-                ).first()
-                
-                if sector:
-                    career_data["sector"] = sector.to_dict()
-                    
-                    # Calculate scores
-                    demand_scores = {"low": 25, "medium": 50, "high": 75, "very_high": 100}
-                    total_demand_score += demand_scores.get(sector.demand_level, 50)
-                    
-                    if sector.growth_rate:
-                        total_growth_score += min(100, max(0, sector.growth_rate * 10 + 50))
-                    else:
-                        total_growth_score += 50
-                    
-                    total_entrepreneurship += sector.entrepreneurship_score
+            if outlook:
+                if outlook.has_sector:
+                    total_demand_score += outlook.demand_score
+                    total_growth_score += outlook.growth_score
+                    total_entrepreneurship += outlook.entrepreneurship_score
                     analyzed_count += 1
                 
-                career_analysis["prospects"].append(career_data)
+                career_analysis["prospects"].append(outlook.response_data())
         
         # Calculate averages
         if analyzed_count > 0:
@@ -159,91 +170,28 @@ class JobMarketAgent(BaseAgent):
         
         return career_analysis
     
-    async def _get_high_demand_sectors(self) -> List[Dict[str, Any]]:
-        """Get sectors with high demand"""
-        sectors = self.db_session.query(JobSector).filter(
-            JobSector.demand_level.in_(["high", "very_high"]),
-            JobSector.is_active == True
-        ).order_by(JobSector.growth_rate.desc()).limit(5).all()
-        
-        return [sector.to_dict() for sector in sectors]
+    def _get_career_index(self) -> CareerIndex:
+        """Get the career index of the current catalog snapshot, rebuilding it when the snapshot changes"""
+        snapshot = get_catalog_store().snapshot
+        career_index = self._career_index
+        if career_index is None or career_index.snapshot is not snapshot:
+            career_index = CareerIndex(snapshot)
+            self._career_index = career_index
+        return career_index
     
-    async def _get_trending_skills(self) -> List[Dict[str, Any]]:
-        """Get skills that are trending or in high demand"""
-        skills = self.db_session.query(Skill).filter(
-            Skill.trend.in_(["growing", "emerging"]),
-            Skill.demand_level.in_(["high", "very_high"]),
-            Skill.is_active == True
-        ).order_by(Skill.salary_impact.desc()).limit(10).all()
-        
-        return [skill.to_dict() for skill in skills]
-    
-    async def _get_entrepreneurship_opportunities(self) -> List[Dict[str, Any]]:
-        """Get sectors with high entrepreneurship potential"""
-        sectors = self.db_session.query(JobSector).filter(
-            JobSector.entrepreneurship_score >= 70,
-            JobSector.is_active == True
-        ).order_by(JobSector.entrepreneurship_score.desc()).limit(5).all()
-        
-        opportunities = []
-        for sector in sectors:
-            sector_data = sector.to_dict()
-            sector_data["startup_recommendations"] = self._get_startup_recommendations(sector)
-            opportunities.append(sector_data)
-        
-        return opportunities
-    
-    def _get_startup_recommendations(self, sector: JobSector) -> List[str]:
-        """Get startup recommendations for a sector"""
-        recommendations = []
-        
-        if sector.startup_capital_required:
-            capital_levels = sector.startup_capital_required
-            if capital_levels.get("low"):
-                recommendations.append("Consider low-capital digital services")
-            if capital_levels.get("medium"):
-                recommendations.append("Explore medium-investment manufacturing")
-            if capital_levels.get("high"):
-                recommendations.append("Plan for high-capital infrastructure projects")
-        
-        if sector.entrepreneurship_score >= 80:
-            recommendations.append("Excellent entrepreneurship potential - consider business incubators")
-        
-        return recommendations
-    
-    async def _get_government_priority_sectors(self) -> List[Dict[str, Any]]:
-        """Get sectors prioritized by government"""
-        sectors = self.db_session.query(JobSector).filter(
-            JobSector.government_priority == True,
-            JobSector.is_active == True
-        ).order_by(JobSector.contribution_to_gdp.desc()).all()
-        
-        return [sector.to_dict() for sector in sectors]
-    
-    async def _calculate_salary_expectations(self, programs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _calculate_salary_expectations(self, programs: List[ProgramView], sector_averages: Dict[str, Any]) -> Dict[str, Any]:
         """Calculate salary expectations for programs"""
         salary_data = {
             "program_salaries": {},
-            "sector_averages": {},
+            "sector_averages": sector_averages,
             "overall_range": {"min": 150000, "max": 2000000}  # FCFA
         }
         
-        # Get sector salary averages
-        sectors = self.db_session.query(JobSector).filter(
-            JobSector.average_salary_range.isnot(None),
-            JobSector.is_active == True
-        ).all()
-        
-        for sector in sectors:
-            if sector.average_salary_range:
-                salary_data["sector_averages"][sector.name] = sector.average_salary_range
-        
         # Calculate program-specific salary expectations
         for program in programs:
-            career_prospects = program.get("career_prospects", [])
-            if career_prospects:
-                program_salary = self._estimate_program_salary(career_prospects)
-                salary_data["program_salaries"][program.get("id")] = program_salary
+            if program.career_prospects:
+                program_salary = self._estimate_program_salary(program.career_prospects)
+                salary_data["program_salaries"][program.id] = program_salary
         
         return salary_data
     
@@ -287,13 +235,12 @@ class JobMarketAgent(BaseAgent):
     async def _get_career_paths(self, request: Dict[str, Any]) -> Dict[str, Any]:
         """Get career paths with optional filtering"""
         filters = request.get("filters", {})
-        
-        query = self.db_session.query(CareerPath).filter(CareerPath.is_active == True)
+        snapshot = get_catalog_store().snapshot
         
         if filters.get("sector_id"):
-            query = query.filter(CareerPath.sector_id == filters["sector_id"])
-        
-        career_paths = query.all()
+            career_paths = snapshot.career_paths_by_sector.get(filters["sector_id"], ())
+        else:
+            career_paths = snapshot.career_paths
         
         return {
             "success": True,
@@ -305,15 +252,13 @@ class JobMarketAgent(BaseAgent):
         """Get skills demand analysis"""
         filters = request.get("filters", {})
         
-        query = self.db_session.query(Skill).filter(Skill.is_active == True)
+        skills = get_catalog_store().snapshot.skills_by_salary_impact
         
         if filters.get("category"):
-            query = query.filter(Skill.category == filters["category"])
+            skills = [skill for skill in skills if skill.category == filters["category"]]
         
         if filters.get("trend"):
-            query = query.filter(Skill.trend == filters["trend"])
-        
-        skills = query.order_by(Skill.salary_impact.desc()).all()
+            skills = [skill for skill in skills if skill.trend == filters["trend"]]
         
         return {
             "success": True,
@@ -324,14 +269,12 @@ class JobMarketAgent(BaseAgent):
     async def _get_sector_insights(self, request: Dict[str, Any]) -> Dict[str, Any]:
         """Get detailed sector insights"""
         sector_id = request.get("sector_id")
+        snapshot = get_catalog_store().snapshot
         
         if sector_id:
-            sector = self.db_session.query(JobSector).filter(
-                JobSector.id == sector_id,
-                JobSector.is_active == True
-            ).first()
+            sector = snapshot.sectors_by_id.get(sector_id)
             
-            if not sector:
+            if not sector or not sector.is_active:
                 return {"success": False, "error": "Sector not found"}
             
             return {
@@ -339,9 +282,7 @@ class JobMarketAgent(BaseAgent):
                 "sector": sector.to_dict()
             }
         else:
-            sectors = self.db_session.query(JobSector).filter(
-                JobSector.is_active == True
-            ).all()
+            sectors = snapshot.active_sectors
             
             return {
                 "success": True,
@@ -546,5 +487,5 @@ class JobMarketAgent(BaseAgent):
             career_path = CareerPath(**path_data)
             self.db_session.add(career_path)
         
-        self.db_session.commit()
+        bump_data_version(self.db_session, JOB_MARKET)
         self.logger.info("Sample job market data created successfully")
@@ -0,0 +1,282 @@
+import asyncio
+import logging
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Callable, Optional
+
+from core.tracing import get_tracer, KIND_CLIENT
+
+
+class LLMExecutorError(Exception):
+    """Raised when an LLM call is rejected without reaching the provider"""
+
+
+class LLMQueueFull(LLMExecutorError):
+    """The LLM worker pool already holds as many calls as it may queue"""
+
+
+class LLMCircuitOpen(LLMExecutorError):
+    """Recent LLM calls kept failing and the provider is being skipped"""
+
+
+class LatencyWindow:
+    """Count, mean and percentiles over the most recent samples (seconds)"""
+
+    def __init__(self, size: int = 512):
+        self._samples = deque(maxlen=size)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value: float):
+        self._samples.append(value)
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def get_stats(self) -> Dict[str, Any]:
+        ordered = sorted(self._samples)
+
+        def percentile(fraction: float) -> float:
+            if not ordered:
+                return 0.0
+            return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total / self.count * 1000, 2) if self.count else 0,
+            "p50_ms": round(percentile(0.5) * 1000, 2),
+            "p95_ms": round(percentile(0.95) * 1000, 2),
+            "max_ms": round(self.max * 1000, 2)
+        }
+
+
+class LLMExecutor:
+    """
+    Dedicated worker pool for blocking LLM client calls.
+
+    Calls run on their own threads instead of the event loop's default
+    executor, so a slow provider cannot starve unrelated blocking work. The
+    pool admits at most max_workers + max_queue calls at a time and rejects
+    the rest immediately. Each attempt has a timeout and failed attempts are
+    retried with jittered exponential backoff. After breaker_threshold
+    consecutive failures the circuit opens and calls fail fast for
+    breaker_reset seconds, after which a single trial call decides whether it
+    closes again.
+
+    A timed-out attempt keeps its worker thread until the provider returns;
+    it still counts against the queue limit so stuck calls cannot pile up.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        max_queue: int = 32,
+        call_timeout: float = 10.0,
+        max_retries: int = 2,
+        retry_backoff: float = 0.5,
+        breaker_threshold: int = 5,
+        breaker_reset: float = 30.0
+    ):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.call_timeout = call_timeout
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.breaker_threshold = breaker_threshold
+        self.breaker_reset = breaker_reset
+        self.logger = logging.getLogger("agents.llm_executor")
+
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._outstanding = 0
+        self._running = 0
+
+        self._state = self.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+
+        self.queue_wait = LatencyWindow()
+        self.execution = LatencyWindow()
+        self.stats = {
+            "calls": 0,
+            "succeeded": 0,
+            "failed": 0,
+            "attempts": 0,
+            "retries": 0,
+            "timeouts": 0,
+            "rejected_queue_full": 0,
+            "rejected_circuit_open": 0,
+            "circuit_opened": 0
+        }
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="llm")
+        return self._pool
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run a blocking LLM call on the worker pool.
+
+        Raises LLMCircuitOpen or LLMQueueFull without calling the provider, or
+        the last error (asyncio.TimeoutError for timeouts) once retries are
+        exhausted.
+        """
+        self.stats["calls"] += 1
+        with get_tracer().span("llm.call", kind=KIND_CLIENT) as span:
+            is_trial = self._before_call()
+            try:
+                return await self._run_attempts(span, func, *args, **kwargs)
+            except BaseException:
+                # A cancelled trial decided nothing; let the next call try instead
+                if is_trial:
+                    self._release_trial()
+                raise
+
+    async def _run_attempts(self, span: Any, func: Callable[..., Any], *args, **kwargs) -> Any:
+        attempt = 0
+        while True:
+            self.stats["attempts"] += 1
+            span.set_attribute("llm.attempts", attempt + 1)
+            try:
+                result = await self._attempt(func, *args, **kwargs)
+            except LLMQueueFull:
+                raise
+            except Exception as e:
+                if isinstance(e, asyncio.TimeoutError):
+                    self.stats["timeouts"] += 1
+                self._record_failure()
+                if attempt >= self.max_retries or self._state == self.OPEN:
+                    self.stats["failed"] += 1
+                    raise
+                attempt += 1
+                self.stats["retries"] += 1
+                delay = random.uniform(0, self.retry_backoff * 2 ** attempt)
+                self.logger.debug(f"LLM call failed ({e!r}), retry {attempt} in {delay:.2f}s")
+                await asyncio.sleep(delay)
+            else:
+                self._record_success()
+                self.stats["succeeded"] += 1
+                return result
+
+    async def _attempt(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        with self._lock:
+            if self._outstanding >= self.max_workers + self.max_queue:
+                self.stats["rejected_queue_full"] += 1
+                raise LLMQueueFull(f"LLM queue is full ({self._outstanding} calls outstanding)")
+            self._outstanding += 1
+
+        submitted_at = time.perf_counter()
+
+        def call():
+            started_at = time.perf_counter()
+            self.queue_wait.add(started_at - submitted_at)
+            with self._lock:
+                self._running += 1
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.execution.add(time.perf_counter() - started_at)
+                with self._lock:
+                    self._running -= 1
+
+        def release(_future):
+            # Also runs when a timed-out call is cancelled before it started
+            with self._lock:
+                self._outstanding -= 1
+
+        future = self._get_pool().submit(call)
+        future.add_done_callback(release)
+        return await asyncio.wait_for(asyncio.wrap_future(future), timeout=self.call_timeout)
+
+    def _before_call(self) -> bool:
+        """
+        Fail fast while the circuit is open, letting one trial call through
+        after the reset period. Returns True for that trial call.
+        """
+        if self._state == self.CLOSED:
+            return False
+
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.breaker_reset:
+            self._state = self.HALF_OPEN
+            self._trial_in_flight = False
+
+        if self._state == self.HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+
+        self.stats["rejected_circuit_open"] += 1
+        raise LLMCircuitOpen("LLM circuit breaker is open")
+
+    def _release_trial(self):
+        if self._state == self.HALF_OPEN:
+            self._trial_in_flight = False
+
+    def _record_success(self):
+        if self._state != self.CLOSED:
+            self.logger.info("LLM circuit breaker closed")
+        self._state = self.CLOSED
+        self._consecutive_failures = 0
+        self._trial_in_flight = False
+
+    def _record_failure(self):
+        self._consecutive_failures += 1
+        if self._state == self.HALF_OPEN or (
+            self._state == self.CLOSED and self._consecutive_failures >= self.breaker_threshold
+        ):
+            self._state = self.OPEN
+            self._opened_at = time.monotonic()
+            self._trial_in_flight = False
+            self.stats["circuit_opened"] += 1
+            self.logger.warning(
+                f"LLM circuit breaker opened after {self._consecutive_failures} consecutive failures"
+            )
+
+    def shutdown(self):
+        """Stop the worker threads; the pool is recreated on the next call"""
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Counters, circuit state, occupancy and queue-wait vs execution latency"""
+        return {
+            **self.stats,
+            "circuit_state": self._state,
+            "consecutive_failures": self._consecutive_failures,
+            "running": self._running,
+            "queued": max(0, self._outstanding - self._running),
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "queue_wait": self.queue_wait.get_stats(),
+            "execution": self.execution.get_stats()
+        }
+
+
+# Global executor instance
+llm_executor = None
+
+
+def get_llm_executor() -> LLMExecutor:
+    global llm_executor
+    if llm_executor is None:
+        from core.config import settings
+        llm_executor = LLMExecutor(
+            max_workers=settings.llm_max_workers,
+            max_queue=settings.llm_max_queue,
+            call_timeout=settings.llm_call_timeout,
+            max_retries=settings.llm_max_retries,
+            retry_backoff=settings.llm_retry_backoff,
+            breaker_threshold=settings.llm_breaker_threshold,
+            breaker_reset=settings.llm_breaker_reset
+        )
+    return llm_executor
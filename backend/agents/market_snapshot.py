@@ -0,0 +1,88 @@
+import time
+from typing import Dict, Any, List
+
+from database.catalog import CatalogSnapshot, JobSectorRecord, descending, freeze
+
+
+def startup_recommendations(sector: JobSectorRecord) -> List[str]:
+    """Get startup recommendations for a sector"""
+    recommendations = []
+
+    if sector.startup_capital_required:
+        capital_levels = sector.startup_capital_required
+        if capital_levels.get("low"):
+            recommendations.append("Consider low-capital digital services")
+        if capital_levels.get("medium"):
+            recommendations.append("Explore medium-investment manufacturing")
+        if capital_levels.get("high"):
+            recommendations.append("Plan for high-capital infrastructure projects")
+
+    if sector.entrepreneurship_score >= 80:
+        recommendations.append("Excellent entrepreneurship potential - consider business incubators")
+
+    return recommendations
+
+
+class MarketSnapshot:
+    """
+    Student-independent job market insights of one catalog snapshot.
+
+    Built once from the in-memory sectors and skills with the same filters,
+    ordering and limits as the queries it replaces; a new catalog snapshot
+    (a data version change) gets a new market snapshot. `overview` is shared
+    by every response built from this snapshot, so it is frozen: its dicts
+    are ReadOnlyDicts and its lists tuples.
+    """
+
+    __slots__ = ("snapshot", "version", "built_at", "overview")
+
+    def __init__(self, snapshot: CatalogSnapshot):
+        self.snapshot = snapshot
+        self.version = snapshot.version
+        self.built_at = time.time()
+
+        sectors = snapshot.active_sectors
+        self.overview: Dict[str, Any] = freeze({
+            "sector_analysis": [
+                sector.to_dict()
+                for sector in sorted(
+                    (sector for sector in sectors if sector.demand_level in ("high", "very_high")),
+                    key=lambda sector: descending(sector.growth_rate)
+                )[:5]
+            ],
+            "skill_recommendations": [
+                skill.to_dict()
+                for skill in snapshot.skills_by_salary_impact
+                if skill.trend in ("growing", "emerging") and skill.demand_level in ("high", "very_high")
+            ][:10],
+            "entrepreneurship_opportunities": [
+                {**sector.to_dict(), "startup_recommendations": startup_recommendations(sector)}
+                for sector in sorted(
+                    (
+                        sector for sector in sectors
+                        if sector.entrepreneurship_score is not None and sector.entrepreneurship_score >= 70
+                    ),
+                    key=lambda sector: descending(sector.entrepreneurship_score)
+                )[:5]
+            ],
+            "government_priorities": [
+                sector.to_dict()
+                for sector in sorted(
+                    (sector for sector in sectors if sector.government_priority),
+                    key=lambda sector: descending(sector.contribution_to_gdp)
+                )
+            ],
+            "sector_salary_averages": {
+                sector.name: sector.average_salary_range
+                for sector in sectors
+                if sector.average_salary_range
+            }
+        })
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "built_at": self.built_at,
+            "sectors": len(self.overview["sector_analysis"]),
+            "skills": len(self.overview["skill_recommendations"])
+        }
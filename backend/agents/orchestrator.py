@@ -2,15 +2,28 @@ import asyncio
 import logging
 import time
 import uuid
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, AsyncIterator, List, Optional
 from datetime import datetime
+from functools import partial
 
 from .base_agent import BaseAgent
+from .pipeline import PipelineGraph, PipelineStage, PipelineContext, EventSink
+from .domain import ProgramView
+from .result_cache import RecommendationCache
+from .llm_executor import get_llm_executor
 from .student_profile_agent import StudentProfileAgent
 from .university_agent import UniversityAgent
 from .job_market_agent import JobMarketAgent
 from .recommendation_agent import RecommendationAgent
 from .gemini_agent import GeminiAgent
+from core.config import settings
+from core.metrics import LatencyHistogram, RequestMetrics
+from core.tracing import get_tracer, KIND_INTERNAL
+from database import connection
+from database.connection import get_redis, engine, dispose_async_engine
+from database.pool import get_pool_stats
+from database.catalog import get_catalog_store
+from database.persistence import get_persistence_queue
 
 
 class AgentOrchestrator:
@@ -24,6 +37,16 @@ class AgentOrchestrator:
         self.is_initialized = False
         self.logger = logging.getLogger("orchestrator")
         self.active_sessions: Dict[str, Dict] = {}
+        self.pipeline = self._build_recommendation_pipeline()
+        self.catalog = get_catalog_store()
+        self.result_cache: Optional[RecommendationCache] = None
+        if settings.recommendation_cache_enabled:
+            self.result_cache = RecommendationCache(
+                max_entries=settings.recommendation_cache_size,
+                ttl_seconds=settings.recommendation_cache_ttl,
+                version_provider=lambda: self.catalog.snapshot.version,
+                version_check_interval=settings.data_version_check_interval
+            )
         
     async def initialize(self):
         """Initialize all agents in the system"""
@@ -66,6 +89,16 @@ class AgentOrchestrator:
                     raise RuntimeError(f"Failed to initialize agent: {agent_id}")
                 self.logger.info(f"✅ {agent.name} initialized successfully")
             
+            # Agents seed sample data first, so the first snapshot sees it
+            await self.catalog.start()
+            self.agents["job_market"].get_market_snapshot()
+            
+            # Writes spooled by a previous run are replayed before new ones
+            await get_persistence_queue().start()
+            
+            if self.result_cache is not None:
+                self.result_cache.attach_redis(await get_redis())
+            
             self.is_initialized = True
             self.logger.info("🎉 All agents initialized successfully!")
             
@@ -73,10 +106,40 @@ class AgentOrchestrator:
             self.logger.error(f"❌ Failed to initialize orchestrator: {e}")
             raise
     
-    async def process_student_recommendation_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+    def _build_recommendation_pipeline(self) -> PipelineGraph:
+        """
+        Declare the recommendation pipeline as a dependency graph.
+        
+        Market overview and general AI guidance only need the student (or
+        nothing at all), so they run alongside university matching instead of
+        waiting for it.
+        """
+        return PipelineGraph([
+            PipelineStage("student_profile", "student_profile", self._run_student_profile_stage),
+            PipelineStage("university_programs", "university", self._run_university_stage,
+                          depends_on=("student_profile",)),
+            PipelineStage("market_overview", "job_market", self._run_market_overview_stage),
+            PipelineStage("career_outlook", "job_market", self._run_career_outlook_stage,
+                          depends_on=("student_profile", "university_programs")),
+            PipelineStage("recommendations", "recommendation", self._run_recommendation_stage,
+                          depends_on=("student_profile", "university_programs", "career_outlook", "market_overview")),
+            PipelineStage("ai_guidance", "gemini", self._run_ai_guidance_stage,
+                          depends_on=("student_profile",)),
+            PipelineStage("ai_enhancement", "gemini", self._run_ai_enhancement_stage,
+                          depends_on=("student_profile", "recommendations"))
+        ])
+    
+    async def process_student_recommendation_request(
+        self, 
+        request: Dict[str, Any], 
+        event_sink: Optional[EventSink] = None
+    ) -> Dict[str, Any]:
         """
         Main entry point for processing student recommendation requests.
         Coordinates multiple agents to generate comprehensive recommendations.
+        
+        When event_sink is given, partial results are handed to it as soon as
+        they exist (see stream_student_recommendation_request).
         """
         if not self.is_initialized:
             raise RuntimeError("Orchestrator is not initialized")
@@ -86,108 +149,43 @@ class AgentOrchestrator:
         
         self.logger.info(f"🚀 Processing recommendation request {session_id}")
         
+        context = PipelineContext(request, session_id, event_sink)
+        
         try:
             # Create session tracking
             self.active_sessions[session_id] = {
                 "start_time": start_time,
                 "status": "processing",
                 "agents_involved": [],
-                "current_step": "initialization"
+                "current_step": "initialization",
+                "running_steps": []
             }
             
-            # Step 1: Process and validate student profile
-            self.logger.info("👤 Step 1: Processing student profile...")
-            self.active_sessions[session_id]["current_step"] = "student_profile"
-            self.active_sessions[session_id]["agents_involved"].append("student_profile")
-            
-            student_response = await self.agents["student_profile"].handle_request({
-                "action": "process_profile",
-                "student_data": request.get("student_data", {}),
-                "session_id": session_id
-            })
-            
-            if not student_response.get("success", True):
-                raise RuntimeError(f"Student profile processing failed: {student_response.get('error')}")
-            
-            student_profile = student_response["student_profile"]
-            
-            # Step 2: Get relevant university programs
-            self.logger.info("🏫 Step 2: Fetching university programs...")
-            self.active_sessions[session_id]["current_step"] = "university_programs"
-            self.active_sessions[session_id]["agents_involved"].append("university")
-            
-            university_response = await self.agents["university"].handle_request({
-                "action": "get_matching_programs",
-                "student_profile": student_profile,
-                "filters": request.get("filters", {}),
-                "session_id": session_id
-            })
-            
-            if not university_response.get("success", True):
-                self.logger.warning(f"University program fetching had issues: {university_response.get('error')}")
-                university_programs = []
-            else:
-                university_programs = university_response.get("programs", [])
-            
-            # Step 3: Get job market insights
-            self.logger.info("💼 Step 3: Analyzing job market...")
-            self.active_sessions[session_id]["current_step"] = "job_market"
-            self.active_sessions[session_id]["agents_involved"].append("job_market")
-            
-            job_market_response = await self.agents["job_market"].handle_request({
-                "action": "analyze_opportunities",
-                "student_profile": student_profile,
-                "programs": university_programs,
-                "session_id": session_id
-            })
+            # Identical result sets are common, so serve repeated runs from cache
+            cache_key = None
+            if self.result_cache is not None:
+                cache_key = self.result_cache.build_key(request)
+                cached_result = await self.result_cache.get(cache_key)
+                if cached_result is not None:
+                    student_profile = await self._run_cached_profile_stage(context, cached_result)
+                    response = self._build_cached_response(cached_result, student_profile, session_id, start_time)
+                    if context.streaming:
+                        self._publish_cached_response(context, response)
+                    return response
             
-            if not job_market_response.get("success", True):
-                self.logger.warning(f"Job market analysis had issues: {job_market_response.get('error')}")
-                job_insights = {}
-            else:
-                job_insights = job_market_response.get("insights", {})
-            
-            # Step 4: Generate core recommendations
-            self.logger.info("🎯 Step 4: Generating recommendations...")
-            self.active_sessions[session_id]["current_step"] = "recommendations"
-            self.active_sessions[session_id]["agents_involved"].append("recommendation")
-            
-            recommendation_response = await self.agents["recommendation"].handle_request({
-                "action": "generate_recommendations",
-                "student_profile": student_profile,
-                "university_programs": university_programs,
-                "job_insights": job_insights,
-                "session_id": session_id
-            })
-            
-            if not recommendation_response.get("success", True):
-                raise RuntimeError(f"Recommendation generation failed: {recommendation_response.get('error')}")
-            
-            recommendations = recommendation_response["recommendations"]
-            
-            # Step 5: Enhance with AI-generated content
-            self.logger.info("🤖 Step 5: Enhancing with AI content...")
-            self.active_sessions[session_id]["current_step"] = "ai_enhancement"
-            self.active_sessions[session_id]["agents_involved"].append("gemini")
-            
-            gemini_response = await self.agents["gemini"].handle_request({
-                "action": "enhance_recommendations",
-                "student_profile": student_profile,
-                "recommendations": recommendations,
-                "language": request.get("language", "en"),
-                "session_id": session_id
-            })
+            with get_tracer().trace("orchestrator.recommendation", kind=KIND_INTERNAL, **{"session.id": session_id}):
+                await self.pipeline.execute(
+                    context,
+                    on_stage_start=self._on_stage_start,
+                    on_stage_complete=self._on_stage_complete
+                )
             
-            if gemini_response.get("success", True):
-                enhanced_content = gemini_response.get("enhanced_content", {})
-                # Merge enhanced content into recommendations
-                for i, rec in enumerate(recommendations):
-                    if i < len(enhanced_content.get("recommendations", [])):
-                        rec.update(enhanced_content["recommendations"][i])
-            else:
-                self.logger.warning("AI enhancement failed, proceeding without enhanced content")
+            student_profile = context.results["student_profile"]
+            recommendations = context.results["recommendations"]
+            job_insights = self._merge_job_insights(context)
+            enhanced_content = self._merge_enhanced_content(context, recommendations)
             
-            # Step 6: Finalize response
+            # Finalize response
             processing_time = time.time() - start_time
             self.active_sessions[session_id]["status"] = "completed"
             self.active_sessions[session_id]["processing_time"] = processing_time
@@ -203,14 +201,25 @@ class AgentOrchestrator:
                     "total_recommendations": len(recommendations),
                     "agents_involved": self.active_sessions[session_id]["agents_involved"],
                     "timestamp": datetime.now().isoformat(),
-                    "algorithm_version": "1.0"
+                    "algorithm_version": "1.0",
+                    "cache_hit": False,
+                    "timing": self.pipeline.timing_breakdown(context)
                 }
             }
             
             # Add enhanced content if available
-            if 'enhanced_content' in locals():
+            if enhanced_content is not None:
                 final_response["enhanced_content"] = enhanced_content
             
+            # Deadline-truncated AI content is not cached so the next run can fill it in
+            if cache_key is not None and not (enhanced_content or {}).get("partial"):
+                await self.result_cache.set(cache_key, {
+                    "recommendations": recommendations,
+                    "job_insights": job_insights,
+                    "enhanced_content": enhanced_content,
+                    "algorithm_version": final_response["metadata"]["algorithm_version"]
+                })
+            
             self.logger.info(f"✅ Request {session_id} completed in {processing_time:.2f}s")
             return final_response
             
@@ -229,7 +238,8 @@ class AgentOrchestrator:
                     "processing_time_ms": int(processing_time * 1000),
                     "agents_involved": self.active_sessions[session_id]["agents_involved"],
                     "failed_step": self.active_sessions[session_id].get("current_step"),
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": datetime.now().isoformat(),
+                    "timing": self.pipeline.timing_breakdown(context)
                 }
             }
         
@@ -237,6 +247,611 @@ class AgentOrchestrator:
             # Clean up session after some time
             asyncio.create_task(self._cleanup_session(session_id, delay=300))  # 5 minutes
     
+    async def stream_student_recommendation_request(self, request: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Run a recommendation request and yield its results as they become available.
+        
+        Events are dicts with "event" and "data" keys:
+        - "recommendations" and "job_insights" as soon as scoring finishes
+        - "section" for every piece of AI content as it is generated, either
+          general guidance ({"section", "content", "source"}) or per
+          recommendation (with "recommendation_index" and "program_id")
+        - a final "complete" with the response metadata, or "error"
+        
+        Leaving the iterator early cancels the remaining work.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        
+        def event_sink(event: str, data: Dict[str, Any]):
+            queue.put_nowait({"event": event, "data": data})
+        
+        task = asyncio.create_task(self.process_student_recommendation_request(request, event_sink))
+        task.add_done_callback(lambda _: queue.put_nowait(None))
+        
+        try:
+            while True:
+                event = await queue.get()
+                if event is None:
+                    break
+                yield event
+            
+            response = task.result()
+            if response.get("success"):
+                complete = {"session_id": response["session_id"], "metadata": response["metadata"]}
+                enhanced_content = response.get("enhanced_content") or {}
+                if "sources" in enhanced_content:
+                    complete["sources"] = enhanced_content["sources"]
+                if enhanced_content.get("partial"):
+                    complete["partial"] = True
+                yield {"event": "complete", "data": complete}
+            else:
+                yield {
+                    "event": "error",
+                    "data": {
+                        "session_id": response.get("session_id"),
+                        "error": response.get("error"),
+                        "metadata": response.get("metadata", {})
+                    }
+                }
+        finally:
+            if not task.done():
+                task.cancel()
+    
+    async def process_batch_recommendations(
+        self,
+        students: AsyncIterator[Any],
+        filters: Optional[Dict[str, Any]] = None,
+        language: str = "en",
+        max_recommendations: int = 10,
+        concurrency: Optional[int] = None,
+        enhance: bool = False,
+        store_results: bool = False
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Generate recommendations for a whole class or school.
+        
+        Students are read from an async iterator in chunks and each result is
+        yielded as soon as it completes, tagged with its input index. Market
+        data is loaded once per batch and eligibility is scored per chunk as
+        a students x programs matrix. A failing student (including input
+        items that are exceptions, e.g. unparsable lines) becomes a failed
+        entry instead of failing the batch. The last item is a summary.
+        
+        With store_results, each student's recommendations are stored under
+        "<batch_id>:<index>" through the persistence queue, which groups many
+        students into one transaction; the summary waits for them to be
+        committed and reports whether they were.
+        """
+        if not self.is_initialized:
+            raise RuntimeError("Orchestrator is not initialized")
+        
+        batch_id = str(uuid.uuid4())
+        start_time = time.time()
+        filters = filters or {}
+        limit = max(1, min(concurrency or settings.batch_max_concurrency, settings.batch_max_concurrency))
+        semaphore = asyncio.Semaphore(limit)
+        results: asyncio.Queue = asyncio.Queue()
+        done = object()
+        progress = {"total": 0, "succeeded": 0, "failed": 0}
+        
+        self.logger.info(f"📚 Processing batch {batch_id} (concurrency {limit})")
+        self.active_sessions[batch_id] = {
+            "start_time": start_time,
+            "status": "processing",
+            "batch": True,
+            "progress": progress,
+            "agents_involved": ["job_market", "student_profile", "university", "recommendation"] + (["gemini"] if enhance else []),
+            "current_step": "market_overview",
+            "running_steps": []
+        }
+        
+        request = {"filters": filters, "language": language, "store_results": store_results, "write_behind": True}
+        market_overview = await self._run_market_overview_stage(PipelineContext(request, batch_id))
+        
+        async def run_student(index: int, student_data: Dict[str, Any], student_profile: Dict[str, Any], programs: List[ProgramView]):
+            async with semaphore:
+                context = PipelineContext({**request, "student_data": student_data}, f"{batch_id}:{index}")
+                context.results.update({
+                    "student_profile": student_profile,
+                    "university_programs": programs,
+                    "market_overview": market_overview
+                })
+                try:
+                    entry = await self._run_batch_student(context, index, enhance, max_recommendations)
+                except Exception as e:
+                    entry = self._batch_error_entry(index, student_data, e)
+            await results.put(entry)
+        
+        async def dispatch(chunk: List[Any]) -> List[asyncio.Task]:
+            matched = await self._match_batch_chunk(batch_id, chunk, filters)
+            tasks = []
+            for index, student_data, outcome in matched:
+                if isinstance(outcome, Exception):
+                    await results.put(self._batch_error_entry(index, student_data, outcome))
+                else:
+                    student_profile, programs = outcome
+                    tasks.append(asyncio.create_task(run_student(index, student_data, student_profile, programs)))
+            return tasks
+        
+        async def produce():
+            tasks: List[asyncio.Task] = []
+            try:
+                self.active_sessions[batch_id]["current_step"] = "students"
+                chunk = []
+                index = 0
+                async for item in students:
+                    if index >= settings.batch_max_students:
+                        await results.put(self._batch_error_entry(
+                            index, None, f"Batch limit of {settings.batch_max_students} students reached, remaining input ignored"
+                        ))
+                        break
+                    chunk.append((index, item))
+                    index += 1
+                    if len(chunk) >= settings.batch_chunk_size:
+                        tasks.extend(await dispatch(chunk))
+                        chunk = []
+                if chunk:
+                    tasks.extend(await dispatch(chunk))
+                await asyncio.gather(*tasks)
+            except asyncio.CancelledError:
+                for task in tasks:
+                    task.cancel()
+                raise
+            except Exception as e:
+                self.logger.error(f"❌ Batch {batch_id} input failed: {e}")
+                await results.put(self._batch_error_entry(None, None, f"Batch input failed: {e}"))
+                await asyncio.gather(*tasks, return_exceptions=True)
+            finally:
+                results.put_nowait(done)
+        
+        producer = asyncio.create_task(produce())
+        try:
+            while True:
+                entry = await results.get()
+                if entry is done:
+                    break
+                progress["total"] += 1
+                progress["succeeded" if entry["success"] else "failed"] += 1
+                yield entry
+            
+            stored = store_results and await get_persistence_queue().flush(settings.persistence_flush_timeout)
+            
+            processing_time = time.time() - start_time
+            self.active_sessions[batch_id]["status"] = "completed"
+            self.active_sessions[batch_id]["processing_time"] = processing_time
+            self.logger.info(
+                f"✅ Batch {batch_id} completed in {processing_time:.2f}s "
+                f"({progress['succeeded']} succeeded, {progress['failed']} failed)"
+            )
+            
+            yield {
+                "summary": {
+                    "batch_id": batch_id,
+                    **progress,
+                    "processing_time_ms": int(processing_time * 1000),
+                    "concurrency": limit,
+                    "stored": stored,
+                    "catalog_version": self.catalog.version,
+                    "timestamp": datetime.now().isoformat()
+                }
+            }
+        finally:
+            if not producer.done():
+                # The consumer went away (e.g. client disconnected); stop outstanding work
+                producer.cancel()
+                self.active_sessions[batch_id]["status"] = "cancelled"
+            asyncio.create_task(self._cleanup_session(batch_id, delay=300))
+    
+    async def _match_batch_chunk(self, batch_id: str, chunk: List[Any], filters: Dict[str, Any]) -> List[Any]:
+        """
+        Build profiles for a chunk of batch input and match them in one pass.
+        
+        Returns (index, student_data, outcome) triples where outcome is either
+        (student_profile, programs) or the exception that failed the student.
+        """
+        outcomes = []
+        profiled = []
+        for index, student_data in chunk:
+            if isinstance(student_data, Exception):
+                outcomes.append((index, None, student_data))
+                continue
+            if not isinstance(student_data, dict):
+                outcomes.append((index, None, ValueError("Each student must be a JSON object")))
+                continue
+            
+            profile_response = await self.agents["student_profile"].handle_request({
+                "action": "build_profile",
+                "student_data": student_data,
+                "session_id": f"{batch_id}:{index}"
+            })
+            if not profile_response.get("success", True):
+                outcomes.append((index, student_data, ValueError(profile_response.get("error", "Invalid student profile"))))
+            else:
+                profiled.append((index, student_data, profile_response["student_profile"]))
+        
+        if not profiled:
+            return outcomes
+        
+        match_response = await self.agents["university"].handle_request({
+            "action": "match_programs_batch",
+            "student_profiles": [student_profile for _, _, student_profile in profiled],
+            "filters": filters,
+            "session_id": batch_id
+        })
+        matches = match_response.get("matches") if match_response.get("success", True) else None
+        
+        for position, (index, student_data, student_profile) in enumerate(profiled):
+            if matches is None:
+                outcomes.append((index, student_data, RuntimeError(f"Program matching failed: {match_response.get('error')}")))
+            elif not matches[position]["success"]:
+                outcomes.append((index, student_data, RuntimeError(f"Program matching failed: {matches[position]['error']}")))
+            else:
+                outcomes.append((index, student_data, (student_profile, matches[position]["programs"])))
+        
+        return outcomes
+    
+    async def _run_batch_student(
+        self, 
+        context: PipelineContext, 
+        index: int, 
+        enhance: bool, 
+        max_recommendations: int
+    ) -> Dict[str, Any]:
+        """Run the student-specific stages for one batch entry"""
+        started = time.time()
+        tracer = get_tracer()
+        with tracer.trace("orchestrator.batch_student", kind=KIND_INTERNAL, **{"session.id": context.session_id}):
+            with tracer.span("stage.career_outlook", **{"agent.id": "job_market"}):
+                context.results["career_outlook"] = await self._run_career_outlook_stage(context)
+            with tracer.span("stage.recommendations", **{"agent.id": "recommendation"}):
+                recommendations = await self._run_recommendation_stage(context)
+            context.results["recommendations"] = recommendations
+            
+            enhanced_content = None
+            if enhance:
+                with tracer.span("stage.ai_content", **{"agent.id": "gemini"}):
+                    context.results["ai_guidance"], context.results["ai_enhancement"] = await asyncio.gather(
+                        self._run_ai_guidance_stage(context),
+                        self._run_ai_enhancement_stage(context)
+                    )
+                enhanced_content = self._merge_enhanced_content(context, recommendations)
+        
+        entry = {
+            "index": index,
+            "reference": self._batch_reference(context.request["student_data"]),
+            "success": True,
+            "student_profile": context.results["student_profile"],
+            "recommendations": recommendations[:max_recommendations],
+            "career_outlook": context.results["career_outlook"].get("career_outlook", {}),
+            "processing_time_ms": int((time.time() - started) * 1000)
+        }
+        
+        if enhanced_content is not None:
+            entry["enhanced_content"] = enhanced_content
+        
+        return entry
+    
+    def _batch_error_entry(self, index: Optional[int], student_data: Optional[Dict[str, Any]], error: Any) -> Dict[str, Any]:
+        """Build the result entry of a student that could not be processed"""
+        return {
+            "index": index,
+            "reference": self._batch_reference(student_data),
+            "success": False,
+            "error": str(error)
+        }
+    
+    def _batch_reference(self, student_data: Optional[Dict[str, Any]]) -> Optional[Any]:
+        """Caller-supplied identifier echoed back with each batch entry"""
+        if not isinstance(student_data, dict):
+            return None
+        return student_data.get("reference", student_data.get("name"))
+    
+    async def _run_cached_profile_stage(self, context: PipelineContext, cached_result: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Process the student profile of a cache hit and store its session.
+        
+        The profile carries the student's own identity, so it is processed per
+        request rather than cached; the cached recommendations are then stored
+        under this session exactly like a live run's.
+        """
+        self._on_stage_start("student_profile", context)
+        student_profile = await self._run_student_profile_stage(context)
+        self._on_stage_complete("student_profile", context)
+        
+        if context.request.get("store_results", True):
+            await self.agents["recommendation"].handle_request({
+                "action": "store_recommendations",
+                "student_profile": student_profile,
+                "recommendations": cached_result["recommendations"],
+                "write_behind": context.request.get("write_behind"),
+                "session_id": context.session_id
+            })
+        
+        return student_profile
+    
+    def _build_cached_response(
+        self, 
+        cached_result: Dict[str, Any], 
+        student_profile: Dict[str, Any], 
+        session_id: str, 
+        start_time: float
+    ) -> Dict[str, Any]:
+        """Build a full response from a cached recommendation run"""
+        processing_time = time.time() - start_time
+        self.active_sessions[session_id]["status"] = "completed"
+        self.active_sessions[session_id]["current_step"] = "cache"
+        self.active_sessions[session_id]["processing_time"] = processing_time
+        
+        recommendations = cached_result["recommendations"]
+        response = {
+            "success": True,
+            "session_id": session_id,
+            "student_profile": student_profile,
+            "recommendations": recommendations,
+            "job_insights": cached_result["job_insights"],
+            "metadata": {
+                "processing_time_ms": int(processing_time * 1000),
+                "total_recommendations": len(recommendations),
+                "agents_involved": self.active_sessions[session_id]["agents_involved"],
+                "timestamp": datetime.now().isoformat(),
+                "algorithm_version": cached_result.get("algorithm_version", "1.0"),
+                "cache_hit": True
+            }
+        }
+        
+        if cached_result.get("enhanced_content") is not None:
+            response["enhanced_content"] = cached_result["enhanced_content"]
+        
+        self.logger.info(f"⚡ Request {session_id} served from cache in {processing_time:.3f}s")
+        return response
+    
+    def _on_stage_start(self, stage_name: str, context: PipelineContext):
+        """Track stage progress in the session registry"""
+        session = self.active_sessions.get(context.session_id)
+        if session is None:
+            return
+        
+        agent_id = self.pipeline.stages[stage_name].agent_id
+        if agent_id not in session["agents_involved"]:
+            session["agents_involved"].append(agent_id)
+        session["current_step"] = stage_name
+        session["running_steps"].append(stage_name)
+    
+    def _on_stage_complete(self, stage_name: str, context: PipelineContext):
+        """Remove a finished stage from the running set and stream scored results"""
+        session = self.active_sessions.get(context.session_id)
+        if session is not None and stage_name in session["running_steps"]:
+            session["running_steps"].remove(stage_name)
+        
+        # Scoring is done long before the AI text, so streaming clients get it right away
+        if stage_name == "recommendations" and context.streaming:
+            recommendations = self._limit_recommendations(context, context.results["recommendations"])
+            context.publish("recommendations", {
+                # Copies, as AI content is merged into the originals later on
+                "recommendations": [dict(rec) for rec in recommendations],
+                "total_recommendations": len(context.results["recommendations"])
+            })
+            context.publish("job_insights", self._merge_job_insights(context))
+    
+    def _limit_recommendations(self, context: PipelineContext, recommendations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        limit = context.request.get("max_recommendations")
+        return recommendations[:limit] if limit else recommendations
+    
+    def _publish_section(self, context: PipelineContext, section: Dict[str, Any]):
+        """Stream one piece of AI content, skipping recommendations the client will not see"""
+        index = section.get("recommendation_index")
+        if index is not None:
+            recommendations = self._limit_recommendations(context, context.results.get("recommendations", []))
+            if index >= len(recommendations):
+                return
+            section = {**section, "program_id": recommendations[index].get("program_id")}
+        context.publish("section", section)
+    
+    def _publish_cached_response(self, context: PipelineContext, response: Dict[str, Any]):
+        """Replay a cached run as the same events a live run produces"""
+        recommendations = self._limit_recommendations(context, response["recommendations"])
+        context.publish("recommendations", {
+            "recommendations": recommendations,
+            "total_recommendations": len(response["recommendations"])
+        })
+        context.publish("job_insights", response["job_insights"])
+        
+        enhanced_content = response.get("enhanced_content") or {}
+        for name in GeminiAgent.GENERAL_GUIDANCE_SECTIONS:
+            if name in enhanced_content:
+                context.publish("section", {"section": name, "content": enhanced_content[name], "source": "cache"})
+        
+        for index, enhanced_rec in enumerate(enhanced_content.get("recommendations", [])[:len(recommendations)]):
+            for name in GeminiAgent.RECOMMENDATION_SECTIONS:
+                if name in enhanced_rec:
+                    context.publish("section", {
+                        "section": name,
+                        "recommendation_index": index,
+                        "program_id": recommendations[index].get("program_id"),
+                        "content": enhanced_rec[name],
+                        "source": "cache"
+                    })
+    
+    async def _run_student_profile_stage(self, context: PipelineContext) -> Dict[str, Any]:
+        """Process and validate student profile"""
+        self.logger.info("👤 Processing student profile...")
+        student_response = await self.agents["student_profile"].handle_request({
+            "action": "process_profile",
+            "student_data": context.request.get("student_data", {}),
+            "session_id": context.session_id
+        })
+        
+        if not student_response.get("success", True):
+            raise RuntimeError(f"Student profile processing failed: {student_response.get('error')}")
+        
+        return student_response["student_profile"]
+    
+    async def _run_university_stage(self, context: PipelineContext) -> List[ProgramView]:
+        """Get relevant university programs"""
+        self.logger.info("🏫 Fetching university programs...")
+        university_response = await self.agents["university"].handle_request({
+            "action": "get_matching_programs",
+            "student_profile": context.results["student_profile"],
+            "filters": context.request.get("filters", {}),
+            "session_id": context.session_id
+        })
+        
+        if not university_response.get("success", True):
+            self.logger.warning(f"University program fetching had issues: {university_response.get('error')}")
+            return []
+        
+        return university_response.get("programs", [])
+    
+    async def _run_market_overview_stage(self, context: PipelineContext) -> Dict[str, Any]:
+        """Get student-independent job market insights"""
+        self.logger.info("📈 Fetching market overview...")
+        overview_response = await self.agents["job_market"].handle_request({
+            "action": "get_market_overview",
+            "session_id": context.session_id
+        })
+        
+        if not overview_response.get("success", True):
+            self.logger.warning(f"Market overview had issues: {overview_response.get('error')}")
+            return {}
+        
+        return overview_response.get("overview", {})
+    
+    async def _run_career_outlook_stage(self, context: PipelineContext) -> Dict[str, Any]:
+        """Analyze career outlook for the matched programs"""
+        self.logger.info("💼 Analyzing job market...")
+        job_market_response = await self.agents["job_market"].handle_request({
+            "action": "analyze_opportunities",
+            "student_profile": context.results["student_profile"],
+            "programs": context.results["university_programs"],
+            "include_market_overview": False,
+            "session_id": context.session_id
+        })
+        
+        if not job_market_response.get("success", True):
+            self.logger.warning(f"Job market analysis had issues: {job_market_response.get('error')}")
+            return {}
+        
+        return job_market_response.get("insights", {})
+    
+    async def _run_recommendation_stage(self, context: PipelineContext) -> List[Dict[str, Any]]:
+        """Generate core recommendations"""
+        self.logger.info("🎯 Generating recommendations...")
+        recommendation_response = await self.agents["recommendation"].handle_request({
+            "action": "generate_recommendations",
+            "student_profile": context.results["student_profile"],
+            "university_programs": context.results["university_programs"],
+            "job_insights": self._merge_job_insights(context),
+            "store_results": context.request.get("store_results", True),
+            "write_behind": context.request.get("write_behind"),
+            "session_id": context.session_id
+        })
+        
+        if not recommendation_response.get("success", True):
+            raise RuntimeError(f"Recommendation generation failed: {recommendation_response.get('error')}")
+        
+        return recommendation_response["recommendations"]
+    
+    async def _run_ai_guidance_stage(self, context: PipelineContext) -> Optional[Dict[str, Any]]:
+        """Generate general AI guidance for the student"""
+        self.logger.info("🤖 Generating AI guidance...")
+        guidance_response = await self.agents["gemini"].handle_request({
+            "action": "generate_general_guidance",
+            "student_profile": context.results["student_profile"],
+            "language": context.request.get("language", "en"),
+            "session_id": context.session_id,
+            "section_callback": partial(self._publish_section, context) if context.streaming else None,
+            **self._llm_budget(context)
+        })
+        
+        if not guidance_response.get("success", True):
+            self.logger.warning("AI guidance failed, proceeding without general advice")
+            return None
+        
+        return guidance_response.get("enhanced_content", {})
+    
+    async def _run_ai_enhancement_stage(self, context: PipelineContext) -> Optional[Dict[str, Any]]:
+        """Enhance the top recommendations with AI-generated content"""
+        self.logger.info("🤖 Enhancing with AI content...")
+        gemini_response = await self.agents["gemini"].handle_request({
+            "action": "enhance_recommendations",
+            "student_profile": context.results["student_profile"],
+            "recommendations": context.results["recommendations"],
+            "language": context.request.get("language", "en"),
+            "include_general_guidance": False,
+            "session_id": context.session_id,
+            "section_callback": partial(self._publish_section, context) if context.streaming else None,
+            **self._llm_budget(context)
+        })
+        
+        if not gemini_response.get("success", True):
+            self.logger.warning("AI enhancement failed, proceeding without enhanced content")
+            return None
+        
+        return gemini_response.get("enhanced_content", {})
+    
+    def _llm_budget(self, context: PipelineContext) -> Dict[str, Any]:
+        """
+        Semaphore and deadline of the request's AI content, set up by its first AI stage.
+        
+        Both AI stages draw on them, so the request never has more than
+        gemini_max_concurrency prompts in flight and all its AI content is
+        settled gemini_request_deadline seconds after the first prompt.
+        """
+        if context.llm_semaphore is None:
+            context.llm_semaphore = asyncio.Semaphore(max(1, settings.gemini_max_concurrency))
+            context.llm_expires_at = asyncio.get_running_loop().time() + settings.gemini_request_deadline
+        return {"semaphore": context.llm_semaphore, "expires_at": context.llm_expires_at}
+    
+    def _merge_job_insights(self, context: PipelineContext) -> Dict[str, Any]:
+        """Combine the market overview with the program-specific career outlook"""
+        overview = context.results.get("market_overview") or {}
+        outlook = context.results.get("career_outlook") or {}
+        
+        if not overview and not outlook:
+            return {}
+        
+        salary_expectations = dict(outlook.get("salary_expectations", {}))
+        if salary_expectations or overview.get("sector_salary_averages"):
+            salary_expectations["sector_averages"] = overview.get("sector_salary_averages", {})
+        
+        return {
+            "career_outlook": outlook.get("career_outlook", {}),
+            "skill_recommendations": overview.get("skill_recommendations", []),
+            "sector_analysis": overview.get("sector_analysis", []),
+            "entrepreneurship_opportunities": overview.get("entrepreneurship_opportunities", []),
+            "government_priorities": overview.get("government_priorities", []),
+            "salary_expectations": salary_expectations
+        }
+    
+    def _merge_enhanced_content(
+        self, 
+        context: PipelineContext, 
+        recommendations: List[Dict[str, Any]]
+    ) -> Optional[Dict[str, Any]]:
+        """Combine general guidance and per-recommendation content into one payload"""
+        guidance = context.results.get("ai_guidance")
+        enhancement = context.results.get("ai_enhancement")
+        
+        if guidance is None and enhancement is None:
+            return None
+        
+        enhanced_content = {**(guidance or {}), **(enhancement or {})}
+        
+        # Keep the provenance of both stages rather than letting one overwrite the other
+        sources = {**(guidance or {}).get("sources", {}), **(enhancement or {}).get("sources", {})}
+        if sources:
+            enhanced_content["sources"] = sources
+        if (guidance or {}).get("partial") or (enhancement or {}).get("partial"):
+            enhanced_content["partial"] = True
+        
+        # Merge enhanced content into recommendations
+        if enhancement is not None:
+            for i, rec in enumerate(recommendations):
+                if i < len(enhancement.get("recommendations", [])):
+                    rec.update(enhancement["recommendations"][i])
+        
+        return enhanced_content
+    
     async def get_agent_status(self, agent_id: Optional[str] = None) -> Dict[str, Any]:
         """Get status of specific agent or all agents"""
         if agent_id:
@@ -251,6 +866,50 @@ class AgentOrchestrator:
             "agents": {agent_id: agent.get_status() for agent_id, agent in self.agents.items()}
         }
     
+    def get_request_metrics(self) -> Dict[str, RequestMetrics]:
+        """Get the latency histograms and error counts of every agent"""
+        return {agent_id: agent.request_metrics for agent_id, agent in self.agents.items()}
+    
+    def get_latency_stats(self) -> Dict[str, Any]:
+        """Get request latency percentiles over all agents, merged from their histograms"""
+        combined = LatencyHistogram()
+        for metrics in self.get_request_metrics().values():
+            combined.merge(metrics.total())
+        return combined.get_stats()
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters of the recommendation result cache"""
+        if self.result_cache is None:
+            return {"enabled": False}
+        
+        return {"enabled": True, **self.result_cache.get_stats()}
+    
+    def get_database_pool_stats(self) -> Dict[str, Any]:
+        """Get connection pool occupancy and checkout wait figures of both engines"""
+        stats = get_pool_stats(engine)
+        if connection.async_engine is not None:
+            stats["async"] = get_pool_stats(connection.async_engine.sync_engine)
+        return stats
+    
+    def get_persistence_stats(self) -> Dict[str, Any]:
+        """Get backlog and flush figures of the write-behind persistence queue"""
+        return get_persistence_queue().get_stats()
+    
+    def get_llm_executor_stats(self) -> Dict[str, Any]:
+        """Get queue, circuit breaker and latency figures of the LLM worker pool"""
+        return get_llm_executor().get_stats()
+    
+    def get_tracing_stats(self) -> Dict[str, Any]:
+        """Get sampling and export counters of the request tracer"""
+        return get_tracer().get_stats()
+    
+    def get_catalog_stats(self) -> Dict[str, Any]:
+        """Get reload counters and sizes of the in-memory catalog snapshot"""
+        return {
+            **self.catalog.get_stats(),
+            "market_snapshot": self.agents["job_market"].get_market_snapshot().get_stats()
+        }
+    
     async def get_session_status(self, session_id: str) -> Dict[str, Any]:
         """Get status of specific session"""
         if session_id not in self.active_sessions:
@@ -271,6 +930,10 @@ class AgentOrchestrator:
         """Cleanup all agents and resources"""
         self.logger.info("🧹 Cleaning up Agent Orchestrator...")
         
+        await self.catalog.stop()
+        await get_persistence_queue().stop(settings.persistence_flush_timeout)
+        get_llm_executor().shutdown()
+        
         for agent_id, agent in self.agents.items():
             try:
                 await agent.cleanup()
@@ -280,5 +943,6 @@ class AgentOrchestrator:
         
         self.agents.clear()
         self.active_sessions.clear()
+        await dispose_async_engine()
         self.is_initialized = False
         self.logger.info("✅ Orchestrator cleanup completed")
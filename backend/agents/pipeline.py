@@ -0,0 +1,181 @@
+import asyncio
+import logging
+import time
+from typing import Dict, Any, List, Optional, Callable, Awaitable, Tuple
+
+from core.tracing import get_tracer
+
+
+StageRunner = Callable[["PipelineContext"], Awaitable[Any]]
+StageHook = Callable[[str, "PipelineContext"], None]
+EventSink = Callable[[str, Dict[str, Any]], None]
+
+
+class PipelineStage:
+    """A single named step of a pipeline and the stages it depends on"""
+
+    def __init__(self, name: str, agent_id: str, run: StageRunner, depends_on: Tuple[str, ...] = ()):
+        self.name = name
+        self.agent_id = agent_id
+        self.run = run
+        self.depends_on = tuple(depends_on)
+
+
+class PipelineContext:
+    """Shared state for one pipeline execution"""
+
+    def __init__(self, request: Dict[str, Any], session_id: str, event_sink: Optional[EventSink] = None):
+        self.request = request
+        self.session_id = session_id
+        self.event_sink = event_sink
+        self.results: Dict[str, Any] = {}
+        self.timings: Dict[str, Dict[str, float]] = {}
+        # LLM concurrency limit and absolute loop-time deadline shared by every AI stage of the request
+        self.llm_semaphore: Optional[asyncio.Semaphore] = None
+        self.llm_expires_at: Optional[float] = None
+
+    @property
+    def streaming(self) -> bool:
+        return self.event_sink is not None
+
+    def publish(self, event: str, data: Dict[str, Any]):
+        """Hand a partial result to a streaming consumer, if there is one"""
+        if self.event_sink is not None:
+            self.event_sink(event, data)
+
+
+class PipelineGraph:
+    """
+    Declarative dependency graph of pipeline stages executed under asyncio.
+
+    Every stage is started as soon as all of its dependencies have finished,
+    so independent branches overlap instead of running back to back. A stage
+    that raises aborts the whole run; stages that can degrade gracefully are
+    expected to return a fallback value instead of raising.
+    """
+
+    def __init__(self, stages: List[PipelineStage]):
+        self.stages: Dict[str, PipelineStage] = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                raise ValueError(f"Duplicate pipeline stage: {stage.name}")
+            self.stages[stage.name] = stage
+
+        self.order = self._topological_order()
+        self.logger = logging.getLogger("orchestrator.pipeline")
+
+    def _topological_order(self) -> List[str]:
+        """Validate dependencies and return stage names in dependency order"""
+        for stage in self.stages.values():
+            for dependency in stage.depends_on:
+                if dependency not in self.stages:
+                    raise ValueError(f"Stage '{stage.name}' depends on unknown stage '{dependency}'")
+
+        order = []
+        visiting = set()
+        visited = set()
+
+        def visit(name: str):
+            if name in visited:
+                return
+            if name in visiting:
+                raise ValueError(f"Dependency cycle detected at stage '{name}'")
+            visiting.add(name)
+            for dependency in self.stages[name].depends_on:
+                visit(dependency)
+            visiting.discard(name)
+            visited.add(name)
+            order.append(name)
+
+        for name in self.stages:
+            visit(name)
+
+        return order
+
+    async def execute(
+        self,
+        context: PipelineContext,
+        on_stage_start: Optional[StageHook] = None,
+        on_stage_complete: Optional[StageHook] = None
+    ) -> PipelineContext:
+        """Run all stages, overlapping those whose dependencies are satisfied"""
+        pipeline_start = time.perf_counter()
+        tasks: Dict[str, asyncio.Task] = {}
+
+        async def run_stage(stage: PipelineStage):
+            if stage.depends_on:
+                await asyncio.gather(*(tasks[dependency] for dependency in stage.depends_on))
+
+            if on_stage_start:
+                on_stage_start(stage.name, context)
+
+            started = time.perf_counter()
+            try:
+                with get_tracer().span(f"stage.{stage.name}", **{"agent.id": stage.agent_id}):
+                    context.results[stage.name] = await stage.run(context)
+            finally:
+                finished = time.perf_counter()
+                context.timings[stage.name] = {
+                    "start": started - pipeline_start,
+                    "end": finished - pipeline_start
+                }
+
+            if on_stage_complete:
+                on_stage_complete(stage.name, context)
+
+        for name in self.order:
+            tasks[name] = asyncio.create_task(run_stage(self.stages[name]), name=f"stage:{name}")
+
+        try:
+            await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            raise
+
+        return context
+
+    def critical_path(self, context: PipelineContext) -> List[str]:
+        """Return the chain of stages that determined total latency"""
+        if not context.timings:
+            return []
+
+        current = max(context.timings, key=lambda name: context.timings[name]["end"])
+        path = [current]
+
+        while True:
+            finished_dependencies = [
+                dependency for dependency in self.stages[current].depends_on
+                if dependency in context.timings
+            ]
+            if not finished_dependencies:
+                break
+            current = max(finished_dependencies, key=lambda name: context.timings[name]["end"])
+            path.append(current)
+
+        path.reverse()
+        return path
+
+    def timing_breakdown(self, context: PipelineContext) -> Dict[str, Any]:
+        """Per-stage timings and the critical path, in milliseconds"""
+        stages = {}
+        for name in self.order:
+            timing = context.timings.get(name)
+            if not timing:
+                continue
+            stages[name] = {
+                "agent_id": self.stages[name].agent_id,
+                "depends_on": list(self.stages[name].depends_on),
+                "start_ms": round(timing["start"] * 1000, 2),
+                "end_ms": round(timing["end"] * 1000, 2),
+                "duration_ms": round((timing["end"] - timing["start"]) * 1000, 2)
+            }
+
+        path = self.critical_path(context)
+        return {
+            "stages": stages,
+            "critical_path": path,
+            "critical_path_ms": stages[path[-1]]["end_ms"] if path else 0,
+            "sequential_sum_ms": round(sum(stage["duration_ms"] for stage in stages.values()), 2)
+        }
@@ -1,13 +1,16 @@
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Optional, Tuple
 import random
 from datetime import datetime
 
-from .base_agent import BaseAgent
-from database.connection import SessionLocal
-from models.recommendation import Recommendation, RecommendationSession
+from .base_agent import DatabaseAgent
+from .domain import (
+    CareerOutlook, DEFAULT_OUTLOOK, Eligibility, ProgramView, ScoredRecommendation, StudentProfile
+)
+from database.persistence import get_persistence_queue
+from database.recommendation_store import build_session_rows
 
 
-class RecommendationAgent(BaseAgent):
+class RecommendationAgent(DatabaseAgent):
     """
     Core recommendation agent that synthesizes data from all other agents
     to generate personalized academic and career recommendations.
@@ -15,7 +18,6 @@ class RecommendationAgent(BaseAgent):
     
     def __init__(self, agent_id: str, name: str, description: str):
         super().__init__(agent_id, name, description)
-        self.db_session = None
         self.recommendation_weights = {
             "academic_fit": 0.35,      # How well student fits program requirements
             "career_prospects": 0.25,  # Job market demand and opportunities
@@ -26,15 +28,12 @@ class RecommendationAgent(BaseAgent):
         }
     
     async def _initialize_resources(self):
-        """Initialize database connection"""
-        self.db_session = SessionLocal()
-        self.logger.info("Database session initialized for RecommendationAgent")
+        """Nothing to set up; sessions are scoped to each request"""
+        self.logger.info("RecommendationAgent initialized")
     
     async def _cleanup_resources(self):
-        """Cleanup database connection"""
-        if self.db_session:
-            self.db_session.close()
-            self.db_session = None
+        """Nothing to release; sessions are scoped to each request"""
+        pass
     
     def get_required_fields(self) -> List[str]:
         return ["action"]
@@ -45,6 +44,8 @@ class RecommendationAgent(BaseAgent):
         
         if action == "generate_recommendations":
             return await self._generate_recommendations(request)
+        elif action == "store_recommendations":
+            return await self._store_session(request)
         elif action == "rank_programs":
             return await self._rank_programs(request)
         elif action == "explain_recommendation":
@@ -66,14 +67,19 @@ class RecommendationAgent(BaseAgent):
                 "recommendations": []
             }
         
+        # Convert once; every component score below reads the typed views
+        profile = StudentProfile.coerce(student_profile)
+        outlooks = CareerOutlook.index(job_insights)
+        
         # Generate recommendations for each program
-        recommendations = []
+        recommendations: List[ScoredRecommendation] = []
         
-        for i, program in enumerate(university_programs):
+        for i, program_data in enumerate(university_programs):
+            program = ProgramView.coerce(program_data)
             recommendation = await self._analyze_program_recommendation(
-                student_profile=student_profile,
+                student_profile=profile,
                 program=program,
-                job_insights=job_insights,
+                outlook=outlooks.get(program.id, DEFAULT_OUTLOOK),
                 ranking_position=i + 1
             )
             
@@ -81,18 +87,21 @@ class RecommendationAgent(BaseAgent):
                 recommendations.append(recommendation)
         
         # Sort recommendations by match score
-        recommendations.sort(key=lambda x: x["match_score"], reverse=True)
+        recommendations.sort(key=lambda x: x.match_score, reverse=True)
         
         # Update ranking positions
         for i, rec in enumerate(recommendations):
-            rec["ranking_position"] = i + 1
+            rec.ranking_position = i + 1
         
         # Store recommendations in database
-        if session_id:
-            await self._store_recommendations(session_id, student_profile, recommendations)
-        
-        # Take top 10 recommendations
-        top_recommendations = recommendations[:10]
+        if session_id and request.get("store_results", True):
+            stored = [rec.to_dict() for rec in recommendations]
+            await self._store_recommendations(
+                session_id, student_profile, stored, write_behind=request.get("write_behind")
+            )
+            top_recommendations = stored[:10]
+        else:
+            top_recommendations = [rec.to_dict() for rec in recommendations[:10]]
         
         return {
             "success": True,
@@ -103,26 +112,26 @@ class RecommendationAgent(BaseAgent):
     
     async def _analyze_program_recommendation(
         self, 
-        student_profile: Dict[str, Any], 
-        program: Dict[str, Any], 
-        job_insights: Dict[str, Any],
+        student_profile: StudentProfile, 
+        program: ProgramView, 
+        outlook: CareerOutlook,
         ranking_position: int
-    ) -> Dict[str, Any]:
+    ) -> Optional[ScoredRecommendation]:
         """Analyze a single program and generate detailed recommendation"""
         
         # Get program eligibility from university agent
-        eligibility = program.get("eligibility", {})
+        eligibility = program.eligibility
         
-        if not eligibility.get("eligible", False):
+        if not eligibility.eligible:
             # Skip ineligible programs
             return None
         
         # Calculate component scores
         scores = {
             "academic_fit": self._calculate_academic_fit_score(student_profile, program, eligibility),
-            "career_prospects": self._calculate_career_prospects_score(program, job_insights),
-            "salary_potential": self._calculate_salary_potential_score(program, job_insights),
-            "entrepreneurship": self._calculate_entrepreneurship_score(program, job_insights),
+            "career_prospects": self._calculate_career_prospects_score(program, outlook),
+            "salary_potential": self._calculate_salary_potential_score(program, outlook),
+            "entrepreneurship": self._calculate_entrepreneurship_score(program, outlook),
             "personal_interest": self._calculate_personal_interest_score(student_profile, program),
             "accessibility": self._calculate_accessibility_score(student_profile, program)
         }
@@ -140,103 +149,64 @@ class RecommendationAgent(BaseAgent):
         reasoning = self._generate_recommendation_reasoning(scores, eligibility, program)
         
         # Get career information
-        career_info = self._extract_career_information(program, job_insights)
+        career_info = self._extract_career_information(program, outlook)
         
         # Generate preparation guidance
         preparation = self._generate_preparation_guidance(student_profile, program, eligibility)
         
-        recommendation = {
-            "program_id": program.get("id"),
-            "program_name": program.get("name"),
-            "program_code": program.get("code"),
-            "university_name": program.get("university", {}).get("name", "Unknown University"),
-            "degree_type": program.get("degree_type"),
-            "duration_years": program.get("duration_years"),
-            "faculty": program.get("faculty"),
-            "match_score": round(match_score, 2),
-            "confidence_score": round(confidence_score, 2),
-            "ranking_position": ranking_position,
-            
-            # Detailed scores
-            "component_scores": scores,
-            
-            # Eligibility information
-            "eligibility": eligibility,
-            
-            # Reasoning
-            "reasons": reasoning["reasons"],
-            "pros": reasoning["pros"],
-            "cons": reasoning["cons"],
-            "requirements_met": reasoning["requirements_met"],
-            "requirements_missing": reasoning["requirements_missing"],
-            
-            # Career information
-            "career_prospects": career_info["prospects"],
-            "employment_outlook": career_info["outlook"],
-            "salary_expectations": career_info["salary"],
-            
-            # Preparation guidance
-            "preparation_tips": preparation["tips"],
-            "recommended_subjects": preparation["subjects"],
-            "skill_gaps": preparation["skills"],
-            
-            # Alternative options
-            "alternative_programs": [],  # To be filled by other analysis
-            "fallback_options": []       # To be filled by other analysis
-        }
-        
-        return recommendation
+        return ScoredRecommendation(
+            program=program,
+            match_score=round(match_score, 2),
+            confidence_score=round(confidence_score, 2),
+            ranking_position=ranking_position,
+            component_scores=scores,
+            reasons=reasoning["reasons"],
+            pros=reasoning["pros"],
+            cons=reasoning["cons"],
+            requirements_met=reasoning["requirements_met"],
+            requirements_missing=reasoning["requirements_missing"],
+            employment_outlook=career_info["outlook"],
+            salary_expectations=career_info["salary"],
+            preparation_tips=preparation["tips"],
+            recommended_subjects=preparation["subjects"],
+            skill_gaps=preparation["skills"]
+        )
     
     def _calculate_academic_fit_score(
         self, 
-        student_profile: Dict[str, Any], 
-        program: Dict[str, Any], 
-        eligibility: Dict[str, Any]
+        student_profile: StudentProfile, 
+        program: ProgramView, 
+        eligibility: Eligibility
     ) -> float:
         """Calculate how well student fits academically"""
-        base_score = eligibility.get("score", 0)
+        base_score = eligibility.score
         
         # Bonus for exceeding requirements
-        if eligibility.get("eligible", False) and not eligibility.get("missing_requirements"):
+        if eligibility.eligible and not eligibility.missing_requirements:
             base_score += 20
         
         # Subject alignment bonus
-        required_subjects = program.get("required_subjects", [])
+        required_subjects = program.required_subjects
         if required_subjects:
-            student_subjects = set()
-            if student_profile.get("ol_results"):
-                student_subjects.update(student_profile["ol_results"].keys())
-            if student_profile.get("al_results"):
-                student_subjects.update(student_profile["al_results"].keys())
-            if student_profile.get("bac_results"):
-                student_subjects.update(student_profile["bac_results"].keys())
-            
-            subject_match_ratio = len(set(required_subjects) & student_subjects) / len(required_subjects)
+            subject_match_ratio = len(program.required_subject_set & student_profile.subjects) / len(required_subjects)
             base_score += subject_match_ratio * 15
         
         return min(100, base_score)
     
     def _calculate_career_prospects_score(
         self, 
-        program: Dict[str, Any], 
-        job_insights: Dict[str, Any]
+        program: ProgramView, 
+        outlook: CareerOutlook
     ) -> float:
         """Calculate career prospects score based on job market"""
-        program_id = program.get("id")
-        career_outlook = job_insights.get("career_outlook", {}).get(str(program_id), {})
-        
-        base_score = 50  # Default medium score
-        
         # Demand level scoring
-        demand_level = career_outlook.get("average_demand", "medium")
         demand_scores = {"low": 25, "medium": 50, "high": 75, "very_high": 100}
-        base_score = demand_scores.get(demand_level, 50)
+        base_score = demand_scores.get(outlook.average_demand, 50)
         
         # Growth potential bonus
-        growth_potential = career_outlook.get("growth_potential", "stable")
-        if growth_potential == "growing":
+        if outlook.growth_potential == "growing":
             base_score += 20
-        elif growth_potential == "declining":
+        elif outlook.growth_potential == "declining":
             base_score -= 20
         
         # Employment rate bonus (if available)
@@ -253,18 +223,13 @@ class RecommendationAgent(BaseAgent):
     
     def _calculate_salary_potential_score(
         self, 
-        program: Dict[str, Any], 
-        job_insights: Dict[str, Any]
+        program: ProgramView, 
+        outlook: CareerOutlook
     ) -> float:
         """Calculate salary potential score"""
-        salary_expectations = job_insights.get("salary_expectations", {})
-        program_salaries = salary_expectations.get("program_salaries", {})
-        program_id = str(program.get("id", ""))
-        
-        if program_id in program_salaries:
-            salary_data = program_salaries[program_id]
+        if outlook.salary is not None:
             # Score based on mid-career salary
-            mid_salary = salary_data.get("mid", 500000)
+            mid_salary = outlook.salary.get("mid", 500000)
             
             if mid_salary >= 1200000:
                 return 100
@@ -293,23 +258,19 @@ class RecommendationAgent(BaseAgent):
     
     def _calculate_entrepreneurship_score(
         self, 
-        program: Dict[str, Any], 
-        job_insights: Dict[str, Any]
+        program: ProgramView, 
+        outlook: CareerOutlook
     ) -> float:
         """Calculate entrepreneurship potential score"""
-        program_id = program.get("id")
-        career_outlook = job_insights.get("career_outlook", {}).get(str(program_id), {})
-        
-        entrepreneurship_score = career_outlook.get("entrepreneurship_score", 50)
+        entrepreneurship_score = outlook.entrepreneurship_score
         
         # Bonus for programs with high business potential
-        career_prospects = program.get("career_prospects", [])
         business_keywords = ["entrepreneur", "business", "manager", "consultant", "analyst"]
         
         business_alignment = sum(
-            1 for prospect in career_prospects 
+            1 for prospect in program.career_prospects_lower 
             for keyword in business_keywords 
-            if keyword.lower() in prospect.lower()
+            if keyword in prospect
         )
         
         if business_alignment > 0:
@@ -319,31 +280,24 @@ class RecommendationAgent(BaseAgent):
     
     def _calculate_personal_interest_score(
         self, 
-        student_profile: Dict[str, Any], 
-        program: Dict[str, Any]
+        student_profile: StudentProfile, 
+        program: ProgramView
     ) -> float:
         """Calculate alignment with student interests"""
-        interests = student_profile.get("interests", [])
-        career_preferences = student_profile.get("career_preferences", [])
-        
-        if not interests and not career_preferences:
+        if not student_profile.has_preferences:
             return 50  # Neutral score if no preferences
         
         score = 50
         
-        # Match with program name and description
-        program_text = f"{program.get('name', '')} {program.get('description', '')}".lower()
-        
-        # Check interest alignment
-        for interest in interests:
-            if interest.lower() in program_text:
+        # Check interest alignment with program name and description
+        for interest in student_profile.interests:
+            if interest in program.search_text:
                 score += 15
         
         # Check career preference alignment
-        career_prospects = program.get("career_prospects", [])
-        for preference in career_preferences:
-            for prospect in career_prospects:
-                if preference.lower() in prospect.lower():
+        for preference in student_profile.career_preferences:
+            for prospect in program.career_prospects_lower:
+                if preference in prospect:
                     score += 20
                     break
         
@@ -351,14 +305,14 @@ class RecommendationAgent(BaseAgent):
     
     def _calculate_accessibility_score(
         self, 
-        student_profile: Dict[str, Any], 
-        program: Dict[str, Any]
+        student_profile: StudentProfile, 
+        program: ProgramView
     ) -> float:
         """Calculate program accessibility (cost, location, etc.)"""
         score = 70  # Base accessibility score
         
         # Cost consideration
-        tuition_fee = program.get("tuition_fee_fcfa", 0)
+        tuition_fee = program.tuition_fee_fcfa
         if tuition_fee:
             if tuition_fee <= 50000:
                 score += 20  # Very affordable
@@ -370,16 +324,16 @@ class RecommendationAgent(BaseAgent):
                 score -= 15  # Expensive
         
         # Location preference
-        location_preferences = student_profile.get("location_preferences", [])
-        university = program.get("university", {})
-        university_region = university.get("region", "")
+        location_preferences = student_profile.location_preferences
+        university_region = program.university_region
         
         if location_preferences and university_region:
-            if any(pref.lower() in university_region.lower() for pref in location_preferences):
+            region = university_region.lower()
+            if any(pref in region for pref in location_preferences):
                 score += 15
         
         # Language compatibility
-        language_pref = student_profile.get("language_preference", "en")
+        language_pref = student_profile.language_preference
         program_language = program.get("language_instruction", "bilingual")
         
         if program_language == "bilingual" or language_pref in program_language:
@@ -398,12 +352,12 @@ class RecommendationAgent(BaseAgent):
     def _calculate_confidence_score(
         self, 
         scores: Dict[str, float], 
-        eligibility: Dict[str, Any]
+        eligibility: Eligibility
     ) -> float:
         """Calculate confidence in the recommendation"""
         # Base confidence from eligibility
-        if eligibility.get("eligible", False):
-            if not eligibility.get("missing_requirements"):
+        if eligibility.eligible:
+            if not eligibility.missing_requirements:
                 base_confidence = 80
             else:
                 base_confidence = 60
@@ -429,15 +383,15 @@ class RecommendationAgent(BaseAgent):
     def _generate_recommendation_reasoning(
         self, 
         scores: Dict[str, float], 
-        eligibility: Dict[str, Any], 
-        program: Dict[str, Any]
+        eligibility: Eligibility, 
+        program: ProgramView
     ) -> Dict[str, List[str]]:
         """Generate human-readable reasoning for the recommendation"""
         reasons = []
         pros = []
         cons = []
-        requirements_met = eligibility.get("match_reasons", [])
-        requirements_missing = eligibility.get("missing_requirements", [])
+        requirements_met = eligibility.match_reasons
+        requirements_missing = eligibility.missing_requirements
         
         # Academic fit reasons
         if scores["academic_fit"] >= 80:
@@ -488,7 +442,7 @@ class RecommendationAgent(BaseAgent):
         if program.get("entrance_exam_required"):
             cons.append("Requires entrance examination")
         
-        tuition_fee = program.get("tuition_fee_fcfa", 0)
+        tuition_fee = program.tuition_fee_fcfa
         if tuition_fee <= 50000:
             pros.append("Very affordable tuition fees")
         elif tuition_fee >= 200000:
@@ -504,19 +458,13 @@ class RecommendationAgent(BaseAgent):
     
     def _extract_career_information(
         self, 
-        program: Dict[str, Any], 
-        job_insights: Dict[str, Any]
+        program: ProgramView, 
+        outlook: CareerOutlook
     ) -> Dict[str, Any]:
         """Extract and format career information"""
-        program_id = str(program.get("id", ""))
-        career_outlook = job_insights.get("career_outlook", {}).get(program_id, {})
-        salary_expectations = job_insights.get("salary_expectations", {})
-        
-        career_prospects = program.get("career_prospects", [])
-        
         # Employment outlook
-        demand_level = career_outlook.get("average_demand", "medium")
-        growth_potential = career_outlook.get("growth_potential", "stable")
+        demand_level = outlook.average_demand
+        growth_potential = outlook.growth_potential
         
         outlook_map = {
             ("very_high", "growing"): "Excellent",
@@ -531,20 +479,16 @@ class RecommendationAgent(BaseAgent):
         
         employment_outlook = outlook_map.get((demand_level, growth_potential), "Fair")
         
-        # Salary information
-        program_salaries = salary_expectations.get("program_salaries", {}).get(program_id, {})
-        
         return {
-            "prospects": career_prospects,
             "outlook": employment_outlook,
-            "salary": program_salaries
+            "salary": outlook.salary or {}
         }
     
     def _generate_preparation_guidance(
         self, 
-        student_profile: Dict[str, Any], 
-        program: Dict[str, Any], 
-        eligibility: Dict[str, Any]
+        student_profile: StudentProfile, 
+        program: ProgramView, 
+        eligibility: Eligibility
     ) -> Dict[str, List[str]]:
         """Generate preparation guidance for the student"""
         tips = []
@@ -552,8 +496,7 @@ class RecommendationAgent(BaseAgent):
         skills = []
         
         # Academic preparation
-        missing_requirements = eligibility.get("missing_requirements", [])
-        for requirement in missing_requirements:
+        for requirement in eligibility.missing_requirements:
             if "points" in requirement.lower():
                 tips.append("Focus on improving grades in core subjects")
             elif "subject" in requirement.lower():
@@ -561,8 +504,7 @@ class RecommendationAgent(BaseAgent):
                 subjects.append(subject)
         
         # Subject recommendations
-        required_subjects = program.get("required_subjects", [])
-        subjects.extend(required_subjects)
+        subjects.extend(program.required_subjects)
         
         # General preparation tips
         if program.get("is_competitive"):
@@ -574,13 +516,12 @@ class RecommendationAgent(BaseAgent):
             tips.append("Join study groups for exam preparation")
         
         # Skill development
-        career_prospects = program.get("career_prospects", [])
-        for prospect in career_prospects:
-            if "software" in prospect.lower() or "computer" in prospect.lower():
+        for prospect in program.career_prospects_lower:
+            if "software" in prospect or "computer" in prospect:
                 skills.extend(["Programming", "Problem Solving", "Computer Skills"])
-            elif "business" in prospect.lower() or "manager" in prospect.lower():
+            elif "business" in prospect or "manager" in prospect:
                 skills.extend(["Leadership", "Communication", "Business Analysis"])
-            elif "engineer" in prospect.lower():
+            elif "engineer" in prospect:
                 skills.extend(["Technical Skills", "Mathematics", "Design Thinking"])
         
         # Remove duplicates
@@ -597,52 +538,29 @@ class RecommendationAgent(BaseAgent):
         self, 
         session_id: str, 
         student_profile: Dict[str, Any], 
-        recommendations: List[Dict[str, Any]]
+        recommendations: List[Dict[str, Any]],
+        write_behind: Optional[bool] = None
     ):
-        """Store recommendations in database"""
+        """Store a recommendation session and its recommendations in one bulk insert"""
+        entry = build_session_rows(session_id, student_profile, recommendations)
+        
         try:
-            # Create recommendation session
-            session = RecommendationSession(
-                session_id=session_id,
-                student_id=student_profile.get("id", 0),
-                request_data={"student_profile": student_profile},
-                total_recommendations=len(recommendations),
-                status="completed"
-            )
-            
-            self.db_session.add(session)
-            
-            # Store individual recommendations
-            for rec_data in recommendations:
-                recommendation = Recommendation(
-                    student_id=student_profile.get("id", 0),
-                    session_id=session_id,
-                    program_id=rec_data["program_id"],
-                    match_score=rec_data["match_score"],
-                    confidence_score=rec_data["confidence_score"],
-                    ranking_position=rec_data["ranking_position"],
-                    reasons=rec_data["reasons"],
-                    pros=rec_data["pros"],
-                    cons=rec_data["cons"],
-                    requirements_met=rec_data["requirements_met"],
-                    requirements_missing=rec_data["requirements_missing"],
-                    career_prospects=rec_data["career_prospects"],
-                    employment_outlook=rec_data["employment_outlook"],
-                    salary_expectations=rec_data["salary_expectations"],
-                    preparation_tips=rec_data["preparation_tips"],
-                    recommended_subjects=rec_data["recommended_subjects"],
-                    skill_gaps=rec_data["skill_gaps"]
-                )
-                
-                self.db_session.add(recommendation)
-            
-            self.db_session.commit()
-            self.logger.info(f"Stored {len(recommendations)} recommendations for session {session_id}")
+            queued = await get_persistence_queue().submit("recommendation_session", entry, write_behind=write_behind)
+            if not queued:
+                self.logger.info(f"Stored {len(recommendations)} recommendations for session {session_id}")
             
         except Exception as e:
-            self.db_session.rollback()
             self.logger.error(f"Failed to store recommendations: {e}")
     
+    async def _store_session(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Store already scored recommendations, e.g. a cached run, under a new session"""
+        recommendations = request.get("recommendations", [])
+        await self._store_recommendations(
+            request["session_id"], request.get("student_profile", {}), recommendations,
+            write_behind=request.get("write_behind")
+        )
+        return {"success": True, "total_stored": len(recommendations)}
+    
     async def _rank_programs(self, request: Dict[str, Any]) -> Dict[str, Any]:
         """Rank programs based on criteria"""
         # Implementation for program ranking
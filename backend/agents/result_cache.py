@@ -0,0 +1,194 @@
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Callable
+
+
+RESULT_FIELDS = ("ol_results", "al_results", "bepc_results", "bac_results")
+POINT_FIELDS = ("ol_points", "al_points", "french_average")
+PREFERENCE_FIELDS = ("interests", "career_preferences", "location_preferences")
+
+
+class RecommendationCache:
+    """
+    Two-tier cache for complete recommendation runs.
+
+    Entries are keyed on a canonical fingerprint of everything that influences
+    the output (exam results, points, interests, preferences, filters and
+    language) combined with the catalog/job-market data version, so a data
+    change naturally invalidates every cached run. The first tier is an
+    in-process LRU; the second is Redis, shared across workers.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: int = 3600,
+        version_provider: Optional[Callable[[], str]] = None,
+        version_check_interval: float = 30.0
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.version_provider = version_provider
+        self.version_check_interval = version_check_interval
+        self.redis_client = None
+        self.logger = logging.getLogger("orchestrator.cache")
+
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._data_version: Optional[str] = None
+        self._version_checked_at = 0.0
+        self.stats = {
+            "hits": 0,
+            "local_hits": 0,
+            "redis_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "evictions": 0,
+            "errors": 0
+        }
+
+    def attach_redis(self, redis_client):
+        """Enable the shared Redis tier"""
+        self.redis_client = redis_client
+
+    def get_data_version(self) -> str:
+        """Return the data version stamp, re-checking it at most every interval"""
+        if self.version_provider is None:
+            return "static"
+
+        now = time.monotonic()
+        if self._data_version is None or now - self._version_checked_at >= self.version_check_interval:
+            try:
+                version = self.version_provider()
+            except Exception as e:
+                self.logger.warning(f"Failed to read data version: {e}")
+                self.stats["errors"] += 1
+                version = self._data_version or "unknown"
+
+            if self._data_version is not None and version != self._data_version:
+                self.logger.info(f"Data version changed ({self._data_version} -> {version}), dropping cached runs")
+                self._entries.clear()
+
+            self._data_version = version
+            self._version_checked_at = now
+
+        return self._data_version
+
+    def build_key(self, request: Dict[str, Any]) -> str:
+        """Build the cache key for a recommendation request"""
+        return f"recommendation:{self.get_data_version()}:{self.fingerprint(request)}"
+
+    def fingerprint(self, request: Dict[str, Any]) -> str:
+        """Canonical hash of the parts of a request that affect the result"""
+        student = request.get("student_data") or {}
+
+        canonical = {
+            "exam_system": str(student.get("exam_system") or "").strip().lower(),
+            "results": {field: self._normalize_results(student.get(field)) for field in RESULT_FIELDS},
+            "points": {field: self._normalize_number(student.get(field)) for field in POINT_FIELDS},
+            "preferences": {field: self._normalize_list(student.get(field)) for field in PREFERENCE_FIELDS},
+            "language_preference": str(student.get("language_preference") or "en").strip().lower(),
+            "filters": request.get("filters") or {},
+            "language": str(request.get("language") or "en").strip().lower()
+        }
+
+        encoded = json.dumps(canonical, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(encoded.encode()).hexdigest()
+
+    def _normalize_results(self, results: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        if not results:
+            return {}
+
+        normalized = {}
+        for subject, grade in results.items():
+            if isinstance(grade, str):
+                grade = grade.strip().upper()
+            else:
+                grade = self._normalize_number(grade)
+            normalized[str(subject).strip()] = grade
+        return normalized
+
+    def _normalize_number(self, value: Any) -> Any:
+        if isinstance(value, bool) or value is None:
+            return value
+        if isinstance(value, (int, float)):
+            return round(float(value), 4)
+        return value
+
+    def _normalize_list(self, values: Optional[List[str]]) -> List[str]:
+        if not values:
+            return []
+        return sorted({str(value).strip() for value in values if str(value).strip()})
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Look up a cached run, promoting Redis hits into the local tier"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            payload, expires_at = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                self.stats["local_hits"] += 1
+                return json.loads(payload)
+            del self._entries[key]
+
+        if self.redis_client is not None:
+            try:
+                payload = await self.redis_client.get(key)
+            except Exception as e:
+                self.logger.debug(f"Redis cache lookup failed: {e}")
+                self.stats["errors"] += 1
+                payload = None
+
+            if payload:
+                self._store_local(key, payload)
+                self.stats["hits"] += 1
+                self.stats["redis_hits"] += 1
+                return json.loads(payload)
+
+        self.stats["misses"] += 1
+        return None
+
+    async def set(self, key: str, value: Dict[str, Any]):
+        """Store a run in both tiers"""
+        try:
+            payload = json.dumps(value, default=str)
+        except (TypeError, ValueError) as e:
+            self.logger.warning(f"Recommendation result is not cacheable: {e}")
+            self.stats["errors"] += 1
+            return
+
+        self._store_local(key, payload)
+        self.stats["stores"] += 1
+
+        if self.redis_client is not None:
+            try:
+                await self.redis_client.setex(key, self.ttl_seconds, payload)
+            except Exception as e:
+                self.logger.debug(f"Redis cache store failed: {e}")
+                self.stats["errors"] += 1
+
+    def _store_local(self, key: str, payload: str):
+        self._entries[key] = (payload, time.monotonic() + self.ttl_seconds)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def clear(self):
+        """Drop every entry from the local tier"""
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and occupancy"""
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "hit_rate_percent": round(self.stats["hits"] / lookups * 100, 2) if lookups else 0,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "data_version": self._data_version
+        }
@@ -0,0 +1,141 @@
+import asyncio
+import logging
+import time
+import uuid
+from typing import Dict, Any, Awaitable, Callable, Optional, TypeVar
+
+
+T = TypeVar("T")
+
+# Delete the lock only if it still holds our token
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key into one execution.
+
+    The first caller for a key starts the work as its own task; every caller
+    that arrives while it is running awaits the same task. The task is
+    shielded, so a caller that gives up (for example at a request deadline)
+    does not cancel the work the others are waiting for.
+
+    With a Redis client attached and a lookup function given, the leader
+    also takes a short Redis lock so that only one worker process generates
+    a key. Workers that lose the lock poll the lookup (normally the shared
+    cache) until the value appears, the lock is released, or wait_timeout
+    passes, and only then generate it themselves.
+    """
+
+    def __init__(self, lock_ttl: float = 30.0, wait_timeout: float = 20.0, poll_interval: float = 0.1):
+        self.lock_ttl = lock_ttl
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+        self.redis_client = None
+        self.logger = logging.getLogger("agents.single_flight")
+
+        self._calls: Dict[str, asyncio.Task] = {}
+        self.stats = {
+            "leaders": 0,
+            "coalesced": 0,
+            "lock_acquired": 0,
+            "lock_waits": 0,
+            "lock_wait_hits": 0,
+            "errors": 0
+        }
+
+    def attach_redis(self, redis_client):
+        """Enable cross-worker coalescing through Redis locks"""
+        self.redis_client = redis_client
+
+    async def do(
+        self,
+        key: str,
+        func: Callable[[], Awaitable[T]],
+        lookup: Optional[Callable[[], Awaitable[Optional[T]]]] = None
+    ) -> T:
+        """Run func for key, or join the run already in flight for it"""
+        task = self._calls.get(key)
+        if task is None:
+            self.stats["leaders"] += 1
+            task = asyncio.ensure_future(self._lead(key, func, lookup))
+            self._calls[key] = task
+            task.add_done_callback(lambda finished: self._forget(key, finished))
+        else:
+            self.stats["coalesced"] += 1
+
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task: asyncio.Task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Mark the outcome as retrieved even if every waiter has gone away
+        if not task.cancelled():
+            task.exception()
+
+    async def _lead(
+        self,
+        key: str,
+        func: Callable[[], Awaitable[T]],
+        lookup: Optional[Callable[[], Awaitable[Optional[T]]]]
+    ) -> T:
+        if self.redis_client is None or lookup is None:
+            return await func()
+
+        lock_key = f"singleflight:{key}"
+        token = uuid.uuid4().hex
+        try:
+            acquired = await self.redis_client.set(lock_key, token, nx=True, px=int(self.lock_ttl * 1000))
+        except Exception as e:
+            self.logger.debug(f"Single-flight lock unavailable: {e}")
+            self.stats["errors"] += 1
+            return await func()
+
+        if acquired:
+            self.stats["lock_acquired"] += 1
+            try:
+                return await func()
+            finally:
+                await self._release(lock_key, token)
+
+        # Another worker is generating this key; wait for its result to land
+        self.stats["lock_waits"] += 1
+        deadline = time.monotonic() + self.wait_timeout
+        while time.monotonic() < deadline:
+            await asyncio.sleep(self.poll_interval)
+            value = await lookup()
+            if value is not None:
+                self.stats["lock_wait_hits"] += 1
+                return value
+            try:
+                if not await self.redis_client.exists(lock_key):
+                    break
+            except Exception:
+                self.stats["errors"] += 1
+                break
+
+        value = await lookup()
+        if value is not None:
+            self.stats["lock_wait_hits"] += 1
+            return value
+        return await func()
+
+    async def _release(self, lock_key: str, token: str):
+        try:
+            await self.redis_client.eval(RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+        except Exception as e:
+            self.logger.debug(f"Failed to release single-flight lock: {e}")
+            self.stats["errors"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Leader/coalesced counters and the number of keys in flight"""
+        return {
+            **self.stats,
+            "in_flight": len(self._calls),
+            "distributed": self.redis_client is not None
+        }
@@ -1,14 +1,15 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import uuid
-from sqlalchemy.orm import Session
+from sqlalchemy import select
 
-from .base_agent import BaseAgent
-from database.connection import get_db, SessionLocal
+from .base_agent import DatabaseAgent
+from database.persistence import get_persistence_queue
+from database.student_store import profile_payload, student_from_payload
 from models.student import Student
 from core.config import settings
 
 
-class StudentProfileAgent(BaseAgent):
+class StudentProfileAgent(DatabaseAgent):
     """
     Agent responsible for processing, validating, and storing student academic data
     and personal preferences for both GCE and French educational systems.
@@ -16,18 +17,14 @@ class StudentProfileAgent(BaseAgent):
     
     def __init__(self, agent_id: str, name: str, description: str):
         super().__init__(agent_id, name, description)
-        self.db_session = None
     
     async def _initialize_resources(self):
-        """Initialize database connection"""
-        self.db_session = SessionLocal()
-        self.logger.info("Database session initialized for StudentProfileAgent")
+        """Nothing to set up; sessions are scoped to each request"""
+        self.logger.info("StudentProfileAgent initialized")
     
     async def _cleanup_resources(self):
-        """Cleanup database connection"""
-        if self.db_session:
-            self.db_session.close()
-            self.db_session = None
+        """Nothing to release; sessions are scoped to each request"""
+        pass
     
     def get_required_fields(self) -> List[str]:
         return ["action"]
@@ -38,6 +35,8 @@ class StudentProfileAgent(BaseAgent):
         
         if action == "process_profile":
             return await self._process_student_profile(request)
+        elif action == "build_profile":
+            return await self._build_student_profile(request)
         elif action == "validate_grades":
             return await self._validate_grades(request)
         elif action == "calculate_points":
@@ -52,18 +51,10 @@ class StudentProfileAgent(BaseAgent):
         student_data = request.get("student_data", {})
         session_id = request.get("session_id", str(uuid.uuid4()))
         
-        # Validate required fields
-        if "exam_system" not in student_data:
-            raise ValueError("Exam system is required (gce or french)")
-        
-        exam_system = student_data["exam_system"].lower()
-        if exam_system not in ["gce", "french"]:
-            raise ValueError("Exam system must be 'gce' or 'french'")
+        exam_system = self._validate_exam_system(student_data)
         
-        # Check if student already exists by session_id
-        existing_student = self.db_session.query(Student).filter(
-            Student.session_id == session_id
-        ).first()
+        # Check if student already exists by session_id (including a queued, uncommitted write)
+        existing_student = await self._load_student(session_id)
         
         if existing_student:
             student = existing_student
@@ -76,20 +67,11 @@ class StudentProfileAgent(BaseAgent):
             student = Student(
                 session_id=session_id,
                 exam_system=exam_system,
-                language_preference=student_data.get("language_preference", "en")
+                language_preference=student_data.get("language_preference", "en"),
+                is_active=True
             )
             
-            # Set basic information
-            if "name" in student_data:
-                student.name = student_data["name"]
-            if "email" in student_data:
-                student.email = student_data["email"]
-            if "interests" in student_data:
-                student.interests = student_data["interests"]
-            if "career_preferences" in student_data:
-                student.career_preferences = student_data["career_preferences"]
-            if "location_preferences" in student_data:
-                student.location_preferences = student_data["location_preferences"]
+            self._apply_basic_information(student, student_data)
         
         # Process academic results based on exam system
         if exam_system == "gce":
@@ -97,21 +79,26 @@ class StudentProfileAgent(BaseAgent):
         else:  # french
             await self._process_french_results(student, student_data)
         
-        # Save to database
-        if not existing_student:
-            self.db_session.add(student)
+        # Mark profile as completed if sufficient data
+        if self._is_profile_complete(student):
+            student.profile_completed = True
+        elif student.profile_completed is None:
+            student.profile_completed = False
         
+        # Save to database. Updates may commit off the request path (unless the
+        # caller asks for write_behind=False); a new profile is committed inline
+        # so the response and later session rows carry its id and timestamps
+        write_behind = request.get("write_behind") if existing_student else False
         try:
-            self.db_session.commit()
-            self.db_session.refresh(student)
+            queued = await get_persistence_queue().submit(
+                "student_profile", profile_payload(student), key=session_id, write_behind=write_behind
+            )
         except Exception as e:
-            self.db_session.rollback()
             raise RuntimeError(f"Failed to save student profile: {e}")
         
-        # Mark profile as completed if sufficient data
-        if self._is_profile_complete(student):
-            student.profile_completed = True
-            self.db_session.commit()
+        if not queued:
+            # Written inline; pick up the id and server-side timestamps
+            student = await self._load_student(session_id)
         
         return {
             "success": True,
@@ -120,6 +107,66 @@ class StudentProfileAgent(BaseAgent):
             "profile_completed": student.profile_completed
         }
     
+    async def _load_student(self, session_id: str) -> Optional[Student]:
+        """Latest profile of a session, from the write queue or the database"""
+        pending = get_persistence_queue().pending("student_profile", session_id)
+        if pending is not None:
+            return student_from_payload(pending)
+        
+        # populate_existing: an inline write just changed the row behind the session's cached instance
+        return (await self.async_db_session.execute(
+            select(Student).where(Student.session_id == session_id).execution_options(populate_existing=True)
+        )).scalars().first()
+    
+    async def _build_student_profile(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate a student profile and calculate points without storing it"""
+        student_data = request.get("student_data", {})
+        exam_system = self._validate_exam_system(student_data)
+        
+        student = Student(
+            session_id=request.get("session_id"),
+            exam_system=exam_system,
+            language_preference=student_data.get("language_preference", "en")
+        )
+        self._apply_basic_information(student, student_data)
+        
+        if exam_system == "gce":
+            await self._process_gce_results(student, student_data)
+        else:  # french
+            await self._process_french_results(student, student_data)
+        
+        student.profile_completed = self._is_profile_complete(student)
+        
+        return {
+            "success": True,
+            "student_profile": student.to_dict(),
+            "profile_completed": student.profile_completed
+        }
+    
+    def _validate_exam_system(self, student_data: Dict[str, Any]) -> str:
+        """Validate and normalize the exam system of submitted student data"""
+        if "exam_system" not in student_data:
+            raise ValueError("Exam system is required (gce or french)")
+        
+        exam_system = student_data["exam_system"].lower()
+        if exam_system not in ["gce", "french"]:
+            raise ValueError("Exam system must be 'gce' or 'french'")
+        
+        return exam_system
+    
+    def _apply_basic_information(self, student: Student, student_data: Dict[str, Any]):
+        """Copy personal information and preferences onto a new student"""
+        if "name" in student_data:
+            student.name = student_data["name"]
+        if "email" in student_data:
+            student.email = student_data["email"]
+        if "interests" in student_data:
+            student.interests = student_data["interests"]
+        if "career_preferences" in student_data:
+            student.career_preferences = student_data["career_preferences"]
+        if "location_preferences" in student_data:
+            student.location_preferences = student_data["location_preferences"]
+    
     async def _process_gce_results(self, student: Student, student_data: Dict[str, Any]):
         """Process GCE O-Level and A-Level results"""
         # Process O-Level results
@@ -270,9 +317,7 @@ class StudentProfileAgent(BaseAgent):
         if not session_id:
             raise ValueError("Session ID is required")
         
-        student = self.db_session.query(Student).filter(
-            Student.session_id == session_id
-        ).first()
+        student = await self._load_student(session_id)
         
         if not student:
             return {
@@ -1,14 +1,18 @@
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterable, List, Optional, Union
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_
 
-from .base_agent import BaseAgent
-from database.connection import SessionLocal
+from .base_agent import DatabaseAgent
+from .domain import Eligibility, ProgramView
+from .eligibility_engine import EligibilityEngine, EligibilityScores
+from core.serialization import JSONFragment, fragment_array
+from database.catalog import get_catalog_store, CatalogRecord, ProgramRecord
+from database.data_version import bump_data_version, CATALOG
 from models.university import University, Program
 from models.student import Student
 
 
-class UniversityAgent(BaseAgent):
+class UniversityAgent(DatabaseAgent):
     """
     Agent responsible for managing university data, admission requirements,
     and matching students with appropriate programs.
@@ -16,19 +20,16 @@ class UniversityAgent(BaseAgent):
     
     def __init__(self, agent_id: str, name: str, description: str):
         super().__init__(agent_id, name, description)
-        self.db_session = None
+        self.eligibility_engine = EligibilityEngine()
     
     async def _initialize_resources(self):
-        """Initialize database connection and ensure sample data exists"""
-        self.db_session = SessionLocal()
+        """Ensure sample data exists"""
         await self._ensure_sample_data()
-        self.logger.info("Database session initialized for UniversityAgent")
+        self.logger.info("UniversityAgent initialized")
     
     async def _cleanup_resources(self):
-        """Cleanup database connection"""
-        if self.db_session:
-            self.db_session.close()
-            self.db_session = None
+        """Nothing to release; sessions are scoped to each request"""
+        pass
     
     def get_required_fields(self) -> List[str]:
         return ["action"]
@@ -39,10 +40,14 @@ class UniversityAgent(BaseAgent):
         
         if action == "get_matching_programs":
             return await self._get_matching_programs(request)
+        elif action == "match_programs_batch":
+            return await self._match_programs_batch(request)
         elif action == "get_universities":
             return await self._get_universities(request)
         elif action == "get_programs":
             return await self._get_programs(request)
+        elif action == "search_programs":
+            return await self._search_programs(request)
         elif action == "check_eligibility":
             return await self._check_program_eligibility(request)
         else:
@@ -54,61 +59,80 @@ class UniversityAgent(BaseAgent):
         filters = request.get("filters", {})
         session_id = request.get("session_id")
         
-        # Get all active programs
-        query = self.db_session.query(Program).filter(Program.is_active == True)
+        # Candidate programs come from the in-memory catalog snapshot
+        snapshot = get_catalog_store().snapshot
+        programs = snapshot.find_programs(
+            university_id=self._filter_id(filters.get("university_id")),
+            degree_type=filters.get("program_type"),
+            faculty=filters.get("faculty")
+        )
         
-        # Apply filters
-        if filters.get("program_type"):
-            query = query.filter(Program.degree_type == filters["program_type"])
+        # Score every candidate in one vectorized pass, then build the full
+        # eligibility report only for the programs that make the top 20
+        scores = self.eligibility_engine.score(snapshot, student_profile, programs)
         
-        if filters.get("university_id"):
-            query = query.filter(Program.university_id == filters["university_id"])
-        
-        if filters.get("faculty"):
-            query = query.filter(Program.faculty.ilike(f"%{filters['faculty']}%"))
-        
-        programs = query.all()
+        return {
+            "success": True,
+            **self._build_matches(scores, student_profile),
+            "filters_applied": filters
+        }
+    
+    async def _match_programs_batch(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Match many student profiles against the catalog in one students x programs pass"""
+        student_profiles = request.get("student_profiles", [])
+        filters = request.get("filters", {})
         
-        # Evaluate each program for the student
-        matched_programs = []
-        for program in programs:
-            eligibility = self._evaluate_program_eligibility(program, student_profile)
+        snapshot = get_catalog_store().snapshot
+        programs = snapshot.find_programs(
+            university_id=self._filter_id(filters.get("university_id")),
+            degree_type=filters.get("program_type"),
+            faculty=filters.get("faculty")
+        )
+        
+        try:
+            batch_scores = self.eligibility_engine.score_many(snapshot, student_profiles, programs)
+        except Exception as e:
+            # A malformed profile breaks the whole matrix; score one by one so it only fails itself
+            self.logger.warning(f"Batch scoring failed, falling back to per-student scoring: {e}")
+            batch_scores = []
+            for profile in student_profiles:
+                try:
+                    batch_scores.append(self.eligibility_engine.score(snapshot, profile, programs))
+                except Exception as student_error:
+                    batch_scores.append(student_error)
+        
+        matches = []
+        for profile, scores in zip(student_profiles, batch_scores):
+            if isinstance(scores, Exception):
+                matches.append({"success": False, "error": str(scores)})
+                continue
             
-            program_data = program.to_dict()
-            program_data["eligibility"] = eligibility
-            
-            # Get university information
-            university = self.db_session.query(University).filter(
-                University.id == program.university_id
-            ).first()
-            
-            if university:
-                program_data["university"] = university.to_dict()
-            
-            matched_programs.append(program_data)
-        
-        # Sort by eligibility score and match
-        matched_programs.sort(key=lambda x: (
-            x["eligibility"]["eligible"],
-            x["eligibility"]["score"]
-        ), reverse=True)
+            try:
+                matches.append({"success": True, **self._build_matches(scores, profile)})
+            except Exception as e:
+                matches.append({"success": False, "error": str(e)})
         
         return {
             "success": True,
-            "programs": matched_programs[:20],  # Top 20 matches
-            "total_found": len(matched_programs),
+            "matches": matches,
             "filters_applied": filters
         }
     
-    def _evaluate_program_eligibility(self, program: Program, student_profile: Dict[str, Any]) -> Dict[str, Any]:
-        """Evaluate how well a student matches a program"""
-        eligibility = {
-            "eligible": False,
-            "score": 0,
-            "match_reasons": [],
-            "missing_requirements": [],
-            "recommendations": []
+    def _build_matches(self, scores: EligibilityScores, student_profile: Dict[str, Any], limit: int = 20) -> Dict[str, Any]:
+        """Build program views with full eligibility reports for the top ranked programs"""
+        matched_programs = []
+        for program in scores.top(limit):
+            eligibility = self._evaluate_program_eligibility(program, student_profile)
+            matched_programs.append(ProgramView.from_record(program, eligibility))
+        
+        return {
+            "programs": matched_programs,  # Top 20 matches
+            "total_found": len(scores)
         }
+    
+    def _evaluate_program_eligibility(self, program: ProgramRecord, student_profile: Dict[str, Any]) -> Eligibility:
+        """Evaluate how well a student matches a program"""
+        eligibility = Eligibility()
         
         exam_system = student_profile.get("exam_system", "")
         
@@ -117,10 +141,10 @@ class UniversityAgent(BaseAgent):
         elif exam_system == "french":
             return self._evaluate_french_eligibility(program, student_profile, eligibility)
         else:
-            eligibility["missing_requirements"].append("Valid exam system required")
+            eligibility.missing_requirements.append("Valid exam system required")
             return eligibility
     
-    def _evaluate_gce_eligibility(self, program: Program, student_profile: Dict[str, Any], eligibility: Dict[str, Any]) -> Dict[str, Any]:
+    def _evaluate_gce_eligibility(self, program: ProgramRecord, student_profile: Dict[str, Any], eligibility: Eligibility) -> Eligibility:
         """Evaluate GCE student eligibility for program"""
         ol_results = student_profile.get("ol_results", {})
         al_results = student_profile.get("al_results", {})
@@ -130,20 +154,20 @@ class UniversityAgent(BaseAgent):
         # Check minimum O-Level requirements
         if program.minimum_ol_points:
             if ol_points >= program.minimum_ol_points:
-                eligibility["match_reasons"].append(f"Meets O-Level requirement ({ol_points}/{program.minimum_ol_points} points)")
-                eligibility["score"] += 20
+                eligibility.match_reasons.append(f"Meets O-Level requirement ({ol_points}/{program.minimum_ol_points} points)")
+                eligibility.score += 20
             else:
-                eligibility["missing_requirements"].append(f"Need {program.minimum_ol_points - ol_points} more O-Level points")
-                eligibility["score"] = max(0, eligibility["score"] - 10)
+                eligibility.missing_requirements.append(f"Need {program.minimum_ol_points - ol_points} more O-Level points")
+                eligibility.score = max(0, eligibility.score - 10)
         
         # Check minimum A-Level requirements
         if program.minimum_al_points:
             if al_points >= program.minimum_al_points:
-                eligibility["match_reasons"].append(f"Meets A-Level requirement ({al_points}/{program.minimum_al_points} points)")
-                eligibility["score"] += 30
+                eligibility.match_reasons.append(f"Meets A-Level requirement ({al_points}/{program.minimum_al_points} points)")
+                eligibility.score += 30
             else:
-                eligibility["missing_requirements"].append(f"Need {program.minimum_al_points - al_points} more A-Level points")
-                eligibility["score"] = max(0, eligibility["score"] - 20)
+                eligibility.missing_requirements.append(f"Need {program.minimum_al_points - al_points} more A-Level points")
+                eligibility.score = max(0, eligibility.score - 20)
         
         # Check required subjects
         if program.required_subjects:
@@ -154,38 +178,38 @@ class UniversityAgent(BaseAgent):
                 if required_subject not in student_subjects:
                     missing_subjects.append(required_subject)
                 else:
-                    eligibility["score"] += 10
+                    eligibility.score += 10
             
             if missing_subjects:
-                eligibility["missing_requirements"].extend([f"Required subject: {subj}" for subj in missing_subjects])
+                eligibility.missing_requirements.extend([f"Required subject: {subj}" for subj in missing_subjects])
             else:
-                eligibility["match_reasons"].append("All required subjects completed")
+                eligibility.match_reasons.append("All required subjects completed")
         
         # Check for competitive programs
         if program.is_competitive:
             if al_points > 0:
-                eligibility["score"] += 15
-                eligibility["match_reasons"].append("Has A-Level results for competitive program")
+                eligibility.score += 15
+                eligibility.match_reasons.append("Has A-Level results for competitive program")
             else:
-                eligibility["recommendations"].append("Consider completing A-Levels for better chances")
+                eligibility.recommendations.append("Consider completing A-Levels for better chances")
         
         # Determine final eligibility
-        if not eligibility["missing_requirements"]:
-            eligibility["eligible"] = True
-            eligibility["score"] = min(100, eligibility["score"] + 25)  # Bonus for full eligibility
-        elif len(eligibility["missing_requirements"]) <= 2:
-            eligibility["eligible"] = True  # Conditionally eligible
-            eligibility["score"] = min(75, eligibility["score"])
+        if not eligibility.missing_requirements:
+            eligibility.eligible = True
+            eligibility.score = min(100, eligibility.score + 25)  # Bonus for full eligibility
+        elif len(eligibility.missing_requirements) <= 2:
+            eligibility.eligible = True  # Conditionally eligible
+            eligibility.score = min(75, eligibility.score)
         
         # Subject match bonus
         if program.required_subjects:
             match_count = len(set(program.required_subjects) & student_subjects)
             subject_bonus = (match_count / len(program.required_subjects)) * 20
-            eligibility["score"] += subject_bonus
+            eligibility.score += subject_bonus
         
         return eligibility
     
-    def _evaluate_french_eligibility(self, program: Program, student_profile: Dict[str, Any], eligibility: Dict[str, Any]) -> Dict[str, Any]:
+    def _evaluate_french_eligibility(self, program: ProgramRecord, student_profile: Dict[str, Any], eligibility: Eligibility) -> Eligibility:
         """Evaluate French system student eligibility for program"""
         bepc_results = student_profile.get("bepc_results", {})
         bac_results = student_profile.get("bac_results", {})
@@ -194,12 +218,12 @@ class UniversityAgent(BaseAgent):
         # Check minimum average requirements
         if program.minimum_french_average:
             if french_average >= program.minimum_french_average:
-                eligibility["match_reasons"].append(f"Meets average requirement ({french_average:.1f}/{program.minimum_french_average})")
-                eligibility["score"] += 40
+                eligibility.match_reasons.append(f"Meets average requirement ({french_average:.1f}/{program.minimum_french_average})")
+                eligibility.score += 40
             else:
                 deficit = program.minimum_french_average - french_average
-                eligibility["missing_requirements"].append(f"Need {deficit:.1f} points higher average")
-                eligibility["score"] = max(0, eligibility["score"] - 20)
+                eligibility.missing_requirements.append(f"Need {deficit:.1f} points higher average")
+                eligibility.score = max(0, eligibility.score - 20)
         
         # Check required subjects
         if program.required_subjects:
@@ -210,28 +234,28 @@ class UniversityAgent(BaseAgent):
                 if required_subject not in student_subjects:
                     missing_subjects.append(required_subject)
                 else:
-                    eligibility["score"] += 10
+                    eligibility.score += 10
             
             if missing_subjects:
-                eligibility["missing_requirements"].extend([f"Required subject: {subj}" for subj in missing_subjects])
+                eligibility.missing_requirements.extend([f"Required subject: {subj}" for subj in missing_subjects])
             else:
-                eligibility["match_reasons"].append("All required subjects completed")
+                eligibility.match_reasons.append("All required subjects completed")
         
         # Baccalauréat bonus
         if bac_results:
-            eligibility["score"] += 20
-            eligibility["match_reasons"].append("Has Baccalauréat qualification")
+            eligibility.score += 20
+            eligibility.match_reasons.append("Has Baccalauréat qualification")
         elif bepc_results:
-            eligibility["score"] += 10
-            eligibility["match_reasons"].append("Has BEPC qualification")
+            eligibility.score += 10
+            eligibility.match_reasons.append("Has BEPC qualification")
         
         # Determine final eligibility
-        if not eligibility["missing_requirements"]:
-            eligibility["eligible"] = True
-            eligibility["score"] = min(100, eligibility["score"] + 25)
-        elif len(eligibility["missing_requirements"]) <= 2:
-            eligibility["eligible"] = True
-            eligibility["score"] = min(75, eligibility["score"])
+        if not eligibility.missing_requirements:
+            eligibility.eligible = True
+            eligibility.score = min(100, eligibility.score + 25)
+        elif len(eligibility.missing_requirements) <= 2:
+            eligibility.eligible = True
+            eligibility.score = min(75, eligibility.score)
         
         return eligibility
     
@@ -239,22 +263,16 @@ class UniversityAgent(BaseAgent):
         """Get list of universities with optional filtering"""
         filters = request.get("filters", {})
         
-        query = self.db_session.query(University).filter(University.is_active == True)
-        
-        if filters.get("region"):
-            query = query.filter(University.region.ilike(f"%{filters['region']}%"))
-        
-        if filters.get("type"):
-            query = query.filter(University.type == filters["type"])
-        
-        if filters.get("language"):
-            query = query.filter(University.language_instruction.ilike(f"%{filters['language']}%"))
-        
-        universities = query.all()
+        universities = get_catalog_store().snapshot.find_universities(
+            university_id=self._filter_id(filters.get("university_id")),
+            region=filters.get("region"),
+            type=filters.get("type"),
+            language=filters.get("language")
+        )
         
         return {
             "success": True,
-            "universities": [uni.to_dict() for uni in universities],
+            "universities": self._serialize_records(universities, request.get("encoded")),
             "total_found": len(universities)
         }
     
@@ -262,25 +280,54 @@ class UniversityAgent(BaseAgent):
         """Get list of programs with optional filtering"""
         filters = request.get("filters", {})
         
-        query = self.db_session.query(Program).filter(Program.is_active == True)
-        
-        if filters.get("university_id"):
-            query = query.filter(Program.university_id == filters["university_id"])
-        
-        if filters.get("degree_type"):
-            query = query.filter(Program.degree_type == filters["degree_type"])
-        
-        if filters.get("faculty"):
-            query = query.filter(Program.faculty.ilike(f"%{filters['faculty']}%"))
-        
-        programs = query.all()
+        programs = get_catalog_store().snapshot.find_programs(
+            program_id=filters.get("program_id"),
+            university_id=self._filter_id(filters.get("university_id")),
+            degree_type=filters.get("degree_type"),
+            faculty=filters.get("faculty")
+        )
         
         return {
             "success": True,
-            "programs": [prog.to_dict() for prog in programs],
+            "programs": self._serialize_records(programs, request.get("encoded")),
             "total_found": len(programs)
         }
     
+    async def _search_programs(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Search active programs by name, description or faculty (case-insensitive substring)"""
+        search_query = request.get("query", "").lower()
+        limit = request.get("limit", 20)
+        
+        matches = []
+        for program in get_catalog_store().snapshot.programs:
+            data = program.data
+            program_text = f"{data.get('name', '')} {data.get('description', '')} {data.get('faculty', '')}".lower()
+            if search_query in program_text:
+                matches.append(program)
+            
+            if len(matches) >= limit:
+                break
+        
+        return {
+            "success": True,
+            "programs": self._serialize_records(matches, request.get("encoded")),
+            "total_found": len(matches)
+        }
+    
+    def _filter_id(self, value: Any) -> Optional[int]:
+        """An id filter as the int the catalog indexes use ("1" and 1 match alike); falsy means no filter"""
+        return int(value) if value else None
+    
+    def _serialize_records(
+        self,
+        records: Iterable[CatalogRecord],
+        encoded: bool = False
+    ) -> Union[List[Dict[str, Any]], JSONFragment]:
+        """Catalog records as dictionaries, or as one pre-encoded JSON array when encoded is set"""
+        if encoded:
+            return fragment_array(record.json for record in records)
+        return [record.to_dict() for record in records]
+    
     async def _check_program_eligibility(self, request: Dict[str, Any]) -> Dict[str, Any]:
         """Check specific program eligibility for student"""
         program_id = request.get("program_id")
@@ -289,10 +336,7 @@ class UniversityAgent(BaseAgent):
         if not program_id:
             raise ValueError("Program ID is required")
         
-        program = self.db_session.query(Program).filter(
-            Program.id == program_id,
-            Program.is_active == True
-        ).first()
+        program = get_catalog_store().snapshot.programs_by_id.get(program_id)
         
         if not program:
             return {
@@ -305,7 +349,7 @@ class UniversityAgent(BaseAgent):
         return {
             "success": True,
             "program": program.to_dict(),
-            "eligibility": eligibility
+            "eligibility": eligibility.to_dict()
         }
     
     async def _ensure_sample_data(self):
@@ -458,5 +502,5 @@ class UniversityAgent(BaseAgent):
             program = Program(**prog_data)
             self.db_session.add(program)
         
-        self.db_session.commit()
+        bump_data_version(self.db_session, CATALOG)
         self.logger.info("Sample university and program data created successfully")
@@ -1,7 +1,21 @@
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.responses import PlainTextResponse
 from typing import Dict, Any, Optional
+import secrets
 
-router = APIRouter()
+from core.config import settings
+from core.profiling import ProfilerBusy, get_profiler
+from core.responses import FastJSONRoute
+
+router = APIRouter(route_class=FastJSONRoute)
+
+
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """Allow the request only with the configured X-Admin-Token"""
+    if not settings.admin_token:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled (ADMIN_TOKEN is not set)")
+    if not x_admin_token or not secrets.compare_digest(x_admin_token, settings.admin_token):
+        raise HTTPException(status_code=401, detail="Invalid or missing X-Admin-Token")
 
 
 @router.get("/status")
@@ -121,18 +135,15 @@ async def get_system_metrics(app_request: Request):
         total_requests = 0
         total_successes = 0
         total_failures = 0
-        avg_response_times = []
         
         for agent_id, agent_data in status.get("agents", {}).items():
             metrics = agent_data.get("performance_metrics", {})
             total_requests += metrics.get("total_requests", 0)
             total_successes += metrics.get("successful_requests", 0)
             total_failures += metrics.get("failed_requests", 0)
-            
-            if metrics.get("average_response_time"):
-                avg_response_times.append(metrics["average_response_time"])
         
-        overall_avg_response_time = sum(avg_response_times) / len(avg_response_times) if avg_response_times else 0
+        # Percentiles come from the merged per-agent histograms, weighted by request count
+        latency = orchestrator.get_latency_stats()
         success_rate = (total_successes / total_requests * 100) if total_requests > 0 else 0
         
         return {
@@ -142,10 +153,17 @@ async def get_system_metrics(app_request: Request):
                 "successful_requests": total_successes,
                 "failed_requests": total_failures,
                 "success_rate_percent": round(success_rate, 2),
-                "average_response_time_seconds": round(overall_avg_response_time, 3),
+                "average_response_time_seconds": round(latency["avg_ms"] / 1000, 3),
+                "latency_ms": latency,
                 "active_sessions": status.get("active_sessions", 0),
                 "total_agents": status.get("total_agents", 0)
             },
+            "recommendation_cache": orchestrator.get_cache_stats(),
+            "catalog": orchestrator.get_catalog_stats(),
+            "llm_executor": orchestrator.get_llm_executor_stats(),
+            "database_pool": orchestrator.get_database_pool_stats(),
+            "persistence": orchestrator.get_persistence_stats(),
+            "tracing": orchestrator.get_tracing_stats(),
             "agent_details": status.get("agents", {})
         }
     
@@ -263,6 +281,49 @@ async def restart_agents(app_request: Request):
         raise HTTPException(status_code=500, detail=f"Failed to restart agents: {str(e)}")
 
 
+@router.post("/profile", dependencies=[Depends(require_admin)])
+async def profile_process(
+    duration: float = Query(10.0, gt=0, description="Seconds to profile, up to PROFILING_MAX_DURATION"),
+    interval_ms: float = Query(10.0, ge=1, le=1000, description="Time between stack samples"),
+    allocations: bool = Query(False, description="Also trace allocations (slows allocation-heavy code while it runs)"),
+    top: int = Query(20, ge=1, le=200, description="Allocation sites to report"),
+    include_idle: bool = Query(False, description="Keep samples of threads waiting for work"),
+    format: str = Query("json", pattern="^(json|collapsed)$", description="'collapsed' returns only the stacks, as text")
+):
+    """
+    Profile this worker process for a fixed time (admin only).
+    
+    Samples the stacks of every thread while other requests keep being
+    served, and optionally diffs tracemalloc snapshots taken around the run.
+    Stacks come in the collapsed format (`frame;frame;frame count`) that
+    flamegraph.pl and speedscope read. Only one profile runs per process at a
+    time, and sampling backs off to stay under PROFILING_MAX_OVERHEAD of wall
+    time.
+    """
+    try:
+        profile = await get_profiler().profile(
+            duration=duration,
+            interval=interval_ms / 1000,
+            allocations=allocations,
+            top=top,
+            include_idle=include_idle
+        )
+    except ProfilerBusy as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if format == "collapsed":
+        return PlainTextResponse("\n".join(profile["collapsed"]) + "\n")
+    return profile
+
+
+@router.get("/profile", dependencies=[Depends(require_admin)])
+async def get_profiler_status():
+    """Whether a profile is running, and the profiler limits (admin only)"""
+    return get_profiler().get_stats()
+
+
 @router.get("/config")
 async def get_system_config():
     """Get system configuration and settings"""
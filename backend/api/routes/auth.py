@@ -3,7 +3,9 @@ from pydantic import BaseModel
 import uuid
 from typing import Dict, Any
 
-router = APIRouter()
+from core.responses import FastJSONRoute
+
+router = APIRouter(route_class=FastJSONRoute)
 
 
 class SessionRequest(BaseModel):
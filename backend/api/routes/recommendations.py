@@ -1,9 +1,15 @@
-from datetime import datetime
-from fastapi import APIRouter, HTTPException, Depends, Request
-from pydantic import BaseModel, Field
-from typing import Dict, Any, List, Optional
+import json
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, ValidationError
+from typing import Dict, Any, AsyncIterator, List, Optional
 
-router = APIRouter()
+from core.config import settings
+from core.responses import FastJSONRoute
+from core.serialization import dumps
+from database.persistence import get_persistence_queue
+
+router = APIRouter(route_class=FastJSONRoute)
 
 
 class RecommendationRequest(BaseModel):
@@ -21,44 +27,50 @@ class RecommendationResponse(BaseModel):
     enhanced_content: Optional[Dict[str, Any]] = None
 
 
+async def _build_recommendation_request(request: RecommendationRequest, app_request: Request):
+    """Load the session's completed profile and build the orchestrator request for it"""
+    # Get the orchestrator from the app state
+    orchestrator = getattr(app_request.app.state, 'orchestrator', None)
+    if not orchestrator:
+        raise HTTPException(status_code=503, detail="Recommendation service not available")
+    
+    # First, get the student profile
+    student_agent = orchestrator.agents.get("student_profile")
+    if not student_agent:
+        raise HTTPException(status_code=503, detail="Student profile service not available")
+    
+    profile_response = await student_agent.handle_request({
+        "action": "get_profile",
+        "session_id": request.session_id
+    })
+    
+    if not profile_response.get("success", True):
+        raise HTTPException(status_code=404, detail="Student profile not found. Please create a profile first.")
+    
+    student_profile = profile_response["student_profile"]
+    
+    if not student_profile.get("profile_completed", False):
+        raise HTTPException(
+            status_code=400, 
+            detail="Student profile is incomplete. Please provide academic results to get recommendations."
+        )
+    
+    recommendation_request = {
+        "student_data": student_profile,
+        "filters": request.filters or {},
+        "language": request.language,
+        "max_recommendations": request.max_recommendations
+    }
+    return orchestrator, recommendation_request
+
+
 @router.post("/generate", response_model=RecommendationResponse)
 async def generate_recommendations(request: RecommendationRequest, app_request: Request):
     """Generate personalized recommendations for a student"""
     try:
-        # Get the orchestrator from the app state
-        orchestrator = getattr(app_request.app.state, 'orchestrator', None)
-        if not orchestrator:
-            raise HTTPException(status_code=503, detail="Recommendation service not available")
-        
-        # First, get the student profile
-        student_agent = orchestrator.agents.get("student_profile")
-        if not student_agent:
-            raise HTTPException(status_code=503, detail="Student profile service not available")
-        
-        profile_response = await student_agent.handle_request({
-            "action": "get_profile",
-            "session_id": request.session_id
-        })
-        
-        if not profile_response.get("success", True):
-            raise HTTPException(status_code=404, detail="Student profile not found. Please create a profile first.")
-        
-        student_profile = profile_response["student_profile"]
-        
-        if not student_profile.get("profile_completed", False):
-            raise HTTPException(
-                status_code=400, 
-                detail="Student profile is incomplete. Please provide academic results to get recommendations."
-            )
+        orchestrator, recommendation_request = await _build_recommendation_request(request, app_request)
         
         # Generate comprehensive recommendations using the orchestrator
-        recommendation_request = {
-            "student_data": student_profile,
-            "filters": request.filters or {},
-            "language": request.language,
-            "max_recommendations": request.max_recommendations
-        }
-        
         response = await orchestrator.process_student_recommendation_request(recommendation_request)
         
         if not response.get("success", False):
@@ -84,6 +96,164 @@ async def generate_recommendations(request: RecommendationRequest, app_request:
         raise HTTPException(status_code=500, detail=f"Failed to generate recommendations: {str(e)}")
 
 
+def _format_sse(event: Dict[str, Any]) -> bytes:
+    return b"event: " + event["event"].encode() + b"\ndata: " + dumps(event["data"]) + b"\n\n"
+
+
+def _format_ndjson(event: Dict[str, Any]) -> bytes:
+    return dumps(event) + b"\n"
+
+
+@router.post("/generate/stream")
+async def stream_recommendations(request: RecommendationRequest, app_request: Request):
+    """
+    Generate recommendations and stream them as they are produced.
+    
+    Scored recommendations and job insights are sent as soon as matching is
+    done; AI-generated sections follow one by one, then a `complete` event
+    with the metadata (or an `error` event). Sent as Server-Sent Events when
+    the client accepts `text/event-stream`, otherwise as NDJSON lines of
+    `{"event": ..., "data": ...}`.
+    """
+    try:
+        orchestrator, recommendation_request = await _build_recommendation_request(request, app_request)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to generate recommendations: {str(e)}")
+    
+    use_sse = "text/event-stream" in app_request.headers.get("accept", "")
+    formatter = _format_sse if use_sse else _format_ndjson
+    
+    async def body() -> AsyncIterator[bytes]:
+        async for event in orchestrator.stream_student_recommendation_request(recommendation_request):
+            yield formatter(event)
+    
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream" if use_sse else "application/x-ndjson",
+        # Proxies must not buffer, or the first events arrive with the last
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+class BatchRecommendationRequest(BaseModel):
+    students: List[Any]
+    filters: Optional[Dict[str, Any]] = None
+
+
+async def _iterate_students(students: List[Any]) -> AsyncIterator[Any]:
+    for student in students:
+        yield student
+
+
+def _batch_too_large() -> HTTPException:
+    return HTTPException(status_code=413, detail=f"Batch is limited to {settings.batch_max_students} students")
+
+
+async def _iterate_ndjson(app_request: Request) -> AsyncIterator[Any]:
+    """Parse an NDJSON request body line by line as it arrives, stopping at the batch limit"""
+    buffer = b""
+    count = 0
+    async for chunk in app_request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                count += 1
+                if count > settings.batch_max_students:
+                    raise _batch_too_large()
+                yield _parse_ndjson_line(line)
+    
+    if buffer.strip():
+        if count >= settings.batch_max_students:
+            raise _batch_too_large()
+        yield _parse_ndjson_line(buffer)
+
+
+def _parse_ndjson_line(line: bytes) -> Any:
+    # Bad lines are passed on as errors so only that student fails
+    try:
+        return json.loads(line)
+    except ValueError as e:
+        return ValueError(f"Invalid JSON line: {e}")
+
+
+@router.post("/batch")
+async def generate_batch_recommendations(
+    app_request: Request,
+    language: str = Query("en", description="Language of generated content"),
+    max_recommendations: int = Query(10, ge=1, le=20),
+    concurrency: Optional[int] = Query(None, ge=1, description="Students processed in parallel (capped by server limit)"),
+    enhance: bool = Query(False, description="Add AI-generated guidance to each student"),
+    store_results: bool = Query(False, description="Store each student's recommendations"),
+    program_type: Optional[str] = Query(None, description="Filter by degree type"),
+    university_id: Optional[int] = Query(None, description="Filter by university"),
+    faculty: Optional[str] = Query(None, description="Filter by faculty")
+):
+    """
+    Generate recommendations for many students at once.
+    
+    Accepts a JSON list of student profiles, a JSON object with `students`
+    and `filters`, or an NDJSON body (`Content-Type: application/x-ndjson`)
+    with one profile per line. An NDJSON body is read in full before the
+    first student is scored; only the results are streamed, as NDJSON in
+    completion order, each tagged with the student's input `index`, followed
+    by a final `summary` line. Batches of more than `batch_max_students`
+    students are rejected with 413 as soon as the limit is passed.
+    """
+    orchestrator = getattr(app_request.app.state, 'orchestrator', None)
+    if not orchestrator:
+        raise HTTPException(status_code=503, detail="Recommendation service not available")
+    
+    filters: Dict[str, Any] = {}
+    content_type = app_request.headers.get("content-type", "")
+    
+    if "ndjson" in content_type or "jsonl" in content_type:
+        # The body has to be read before the response starts: once streaming,
+        # the response listens for disconnects on the same receive channel
+        student_items = [item async for item in _iterate_ndjson(app_request)]
+        students = _iterate_students(student_items)
+    else:
+        try:
+            body = await app_request.json()
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Request body must be JSON or NDJSON")
+        
+        try:
+            batch_request = BatchRecommendationRequest(students=body) if isinstance(body, list) \
+                else BatchRecommendationRequest(**body)
+        except (TypeError, ValidationError) as e:
+            raise HTTPException(status_code=422, detail=f"Invalid batch request: {e}")
+        
+        if len(batch_request.students) > settings.batch_max_students:
+            raise _batch_too_large()
+        
+        filters.update(batch_request.filters or {})
+        students = _iterate_students(batch_request.students)
+    
+    if program_type:
+        filters["program_type"] = program_type
+    if university_id:
+        filters["university_id"] = university_id
+    if faculty:
+        filters["faculty"] = faculty
+    
+    async def stream_results():
+        async for entry in orchestrator.process_batch_recommendations(
+            students,
+            filters=filters,
+            language=language,
+            max_recommendations=max_recommendations,
+            concurrency=concurrency,
+            enhance=enhance,
+            store_results=store_results
+        ):
+            yield dumps(entry) + b"\n"
+    
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
+
 @router.get("/session/{session_id}")
 async def get_recommendations_by_session(session_id: str, app_request: Request):
     """Get previously generated recommendations for a session"""
@@ -178,13 +348,11 @@ async def submit_recommendation_feedback(
             "session_id": feedback_request.session_id,
             "recommendation_id": feedback_request.recommendation_id,
             "rating": feedback_request.rating,
-            "feedback": feedback_request.feedback,
-            "timestamp": datetime.utcnow().isoformat()
+            "feedback": feedback_request.feedback
         }
         
-        # In a real application, you would store this in a database
-        # For now, we'll just log it
-        print(f"Feedback received: {feedback_data}")
+        # Committed in the background with other queued writes
+        await get_persistence_queue().submit("recommendation_feedback", feedback_data)
         
         return {
             "success": True,
@@ -3,7 +3,9 @@ from pydantic import BaseModel, Field
 from typing import Dict, Any, List, Optional
 import uuid
 
-router = APIRouter()
+from core.responses import FastJSONRoute
+
+router = APIRouter(route_class=FastJSONRoute)
 
 
 class StudentProfileRequest(BaseModel):
@@ -41,7 +43,12 @@ class StudentProfileResponse(BaseModel):
 
 @router.post("/profile", response_model=StudentProfileResponse)
 async def create_or_update_profile(request: StudentProfileRequest, app_request: Request):
-    """Create or update student profile"""
+    """
+    Create or update student profile.
+    
+    The write is committed before responding, so the returned profile has
+    its database id and created_at/updated_at timestamps.
+    """
     try:
         # Get the orchestrator from the app state
         orchestrator = getattr(app_request.app.state, 'orchestrator', None)
@@ -57,7 +64,8 @@ async def create_or_update_profile(request: StudentProfileRequest, app_request:
         response = await student_agent.handle_request({
             "action": "process_profile",
             "student_data": request.dict(exclude_unset=True),
-            "session_id": request.session_id
+            "session_id": request.session_id,
+            "write_behind": False
         })
         
         if not response.get("success", True):
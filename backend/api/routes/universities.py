@@ -1,7 +1,9 @@
 from fastapi import APIRouter, HTTPException, Request, Query
 from typing import Dict, Any, List, Optional
 
-router = APIRouter()
+from core.responses import FastJSONResponse, FastJSONRoute
+
+router = APIRouter(route_class=FastJSONRoute)
 
 
 @router.get("/")
@@ -31,13 +33,14 @@ async def get_universities(
         
         response = await university_agent.handle_request({
             "action": "get_universities",
-            "filters": filters
+            "filters": filters,
+            "encoded": True
         })
         
         if not response.get("success", True):
             raise HTTPException(status_code=500, detail=response.get("error", "Failed to get universities"))
         
-        return response
+        return FastJSONResponse(response)
     
     except HTTPException:
         raise
@@ -45,41 +48,6 @@ async def get_universities(
         raise HTTPException(status_code=500, detail=f"Failed to get universities: {str(e)}")
 
 
-@router.get("/{university_id}")
-async def get_university(university_id: int, app_request: Request):
-    """Get specific university details"""
-    try:
-        orchestrator = getattr(app_request.app.state, 'orchestrator', None)
-        if not orchestrator:
-            raise HTTPException(status_code=503, detail="Service not available")
-        
-        university_agent = orchestrator.agents.get("university")
-        if not university_agent:
-            raise HTTPException(status_code=503, detail="University service not available")
-        
-        response = await university_agent.handle_request({
-            "action": "get_universities",
-            "filters": {"university_id": university_id}
-        })
-        
-        if not response.get("success", True):
-            raise HTTPException(status_code=500, detail=response.get("error", "Failed to get university"))
-        
-        universities = response.get("universities", [])
-        if not universities:
-            raise HTTPException(status_code=404, detail="University not found")
-        
-        return {
-            "success": True,
-            "university": universities[0]
-        }
-    
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to get university: {str(e)}")
-
-
 @router.get("/programs")
 async def get_programs(
     university_id: Optional[int] = Query(None, description="Filter by university"),
@@ -107,13 +75,14 @@ async def get_programs(
         
         response = await university_agent.handle_request({
             "action": "get_programs",
-            "filters": filters
+            "filters": filters,
+            "encoded": True
         })
         
         if not response.get("success", True):
             raise HTTPException(status_code=500, detail=response.get("error", "Failed to get programs"))
         
-        return response
+        return FastJSONResponse(response)
     
     except HTTPException:
         raise
@@ -156,45 +125,6 @@ async def get_program(program_id: int, app_request: Request):
         raise HTTPException(status_code=500, detail=f"Failed to get program: {str(e)}")
 
 
-@router.get("/{university_id}/programs")
-async def get_university_programs(
-    university_id: int,
-    degree_type: Optional[str] = Query(None, description="Filter by degree type"),
-    faculty: Optional[str] = Query(None, description="Filter by faculty"),
-    app_request: Request = None
-):
-    """Get programs offered by a specific university"""
-    try:
-        orchestrator = getattr(app_request.app.state, 'orchestrator', None)
-        if not orchestrator:
-            raise HTTPException(status_code=503, detail="Service not available")
-        
-        university_agent = orchestrator.agents.get("university")
-        if not university_agent:
-            raise HTTPException(status_code=503, detail="University service not available")
-        
-        filters = {"university_id": university_id}
-        if degree_type:
-            filters["degree_type"] = degree_type
-        if faculty:
-            filters["faculty"] = faculty
-        
-        response = await university_agent.handle_request({
-            "action": "get_programs",
-            "filters": filters
-        })
-        
-        if not response.get("success", True):
-            raise HTTPException(status_code=500, detail=response.get("error", "Failed to get programs"))
-        
-        return response
-    
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to get university programs: {str(e)}")
-
-
 @router.get("/search/programs")
 async def search_programs(
     q: str = Query(..., description="Search query"),
@@ -211,35 +141,23 @@ async def search_programs(
         if not university_agent:
             raise HTTPException(status_code=503, detail="University service not available")
         
-        # Get all programs first (in a real implementation, this would be a proper search)
+        # Simple text search over the catalog snapshot (in production, use proper search engine)
         response = await university_agent.handle_request({
-            "action": "get_programs",
-            "filters": {}
+            "action": "search_programs",
+            "query": q,
+            "limit": limit,
+            "encoded": True
         })
         
         if not response.get("success", True):
             raise HTTPException(status_code=500, detail=response.get("error", "Search failed"))
         
-        programs = response.get("programs", [])
-        
-        # Simple text search (in production, use proper search engine)
-        search_query = q.lower()
-        filtered_programs = []
-        
-        for program in programs:
-            program_text = f"{program.get('name', '')} {program.get('description', '')} {program.get('faculty', '')}".lower()
-            if search_query in program_text:
-                filtered_programs.append(program)
-            
-            if len(filtered_programs) >= limit:
-                break
-        
-        return {
+        return FastJSONResponse({
             "success": True,
             "query": q,
-            "programs": filtered_programs,
-            "total_found": len(filtered_programs)
-        }
+            "programs": response["programs"],
+            "total_found": response["total_found"]
+        })
     
     except HTTPException:
         raise
@@ -363,3 +281,79 @@ async def universities_health_check():
         "status": "healthy",
         "timestamp": "2025-01-26T16:01:03Z"
     }
+
+
+# Parameterized routes come last so they never shadow the static paths above
+@router.get("/{university_id}")
+async def get_university(university_id: int, app_request: Request):
+    """Get specific university details"""
+    try:
+        orchestrator = getattr(app_request.app.state, 'orchestrator', None)
+        if not orchestrator:
+            raise HTTPException(status_code=503, detail="Service not available")
+        
+        university_agent = orchestrator.agents.get("university")
+        if not university_agent:
+            raise HTTPException(status_code=503, detail="University service not available")
+        
+        response = await university_agent.handle_request({
+            "action": "get_universities",
+            "filters": {"university_id": university_id}
+        })
+        
+        if not response.get("success", True):
+            raise HTTPException(status_code=500, detail=response.get("error", "Failed to get university"))
+        
+        universities = response.get("universities", [])
+        if not universities:
+            raise HTTPException(status_code=404, detail="University not found")
+        
+        return {
+            "success": True,
+            "university": universities[0]
+        }
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get university: {str(e)}")
+
+
+@router.get("/{university_id}/programs")
+async def get_university_programs(
+    university_id: int,
+    degree_type: Optional[str] = Query(None, description="Filter by degree type"),
+    faculty: Optional[str] = Query(None, description="Filter by faculty"),
+    app_request: Request = None
+):
+    """Get programs offered by a specific university"""
+    try:
+        orchestrator = getattr(app_request.app.state, 'orchestrator', None)
+        if not orchestrator:
+            raise HTTPException(status_code=503, detail="Service not available")
+        
+        university_agent = orchestrator.agents.get("university")
+        if not university_agent:
+            raise HTTPException(status_code=503, detail="University service not available")
+        
+        filters = {"university_id": university_id}
+        if degree_type:
+            filters["degree_type"] = degree_type
+        if faculty:
+            filters["faculty"] = faculty
+        
+        response = await university_agent.handle_request({
+            "action": "get_programs",
+            "filters": filters,
+            "encoded": True
+        })
+        
+        if not response.get("success", True):
+            raise HTTPException(status_code=500, detail=response.get("error", "Failed to get programs"))
+        
+        return FastJSONResponse(response)
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get university programs: {str(e)}")
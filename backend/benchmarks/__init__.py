@@ -0,0 +1 @@
+# Benchmarks and performance checks for the EduPath backend
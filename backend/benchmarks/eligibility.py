@@ -0,0 +1,147 @@
+"""
+Equivalence and speed check for the vectorized eligibility engine.
+
+Builds synthetic catalog snapshots of growing size, scores random GCE and
+French profiles with both the scalar UniversityAgent evaluator and the
+EligibilityEngine (one student at a time and as a whole batch), and fails if
+any eligible flag, score or top-20 ordering differs. Reports the time per
+student for each implementation.
+
+Run from the backend directory:
+    python -m benchmarks.eligibility --sizes 100 1000 5000 --students 20
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("DEBUG", "false")
+
+from core.config import settings  # noqa: E402
+from database.catalog import CatalogSnapshot, ProgramRecord  # noqa: E402
+from agents.eligibility_engine import EligibilityEngine  # noqa: E402
+from agents.university_agent import UniversityAgent  # noqa: E402
+
+
+SUBJECTS = settings.gce_subjects + settings.french_subjects
+
+
+def synthetic_snapshot(size: int, rng: random.Random) -> CatalogSnapshot:
+    programs = []
+    for i in range(size):
+        required = rng.sample(SUBJECTS, rng.randint(0, 4))
+        if required and rng.random() < 0.1:
+            required.append(required[0])  # duplicated requirement, as free-form JSON allows
+        programs.append(ProgramRecord({
+            "id": i + 1,
+            "code": f"SYN_{i:05d}",
+            "name": f"Synthetic Program {i}",
+            "degree_type": rng.choice(["bachelor", "master", "diploma"]),
+            "university_id": 1 + i % 3,
+            "faculty": "Faculty of Science",
+            "minimum_ol_points": rng.choice([None, 0, 4, 6, 9, 12]),
+            "minimum_al_points": rng.choice([None, 0, 4, 8, 12]),
+            "minimum_french_average": rng.choice([None, 0.0, 10.0, 12.5, 15.0]),
+            "required_subjects": required or rng.choice([None, []]),
+            "is_competitive": rng.random() < 0.2
+        }))
+    return CatalogSnapshot("synthetic", [], programs, [], [], [])
+
+
+def random_profile(rng: random.Random):
+    if rng.random() < 0.5:
+        ol = {subject: "A" for subject in rng.sample(settings.gce_subjects, rng.randint(0, 8))}
+        al = {subject: "B" for subject in rng.sample(settings.gce_subjects, rng.randint(0, 4))}
+        return {
+            "exam_system": "gce",
+            "ol_results": ol,
+            "al_results": al,
+            "ol_points": rng.randint(0, 24),
+            "al_points": rng.randint(0, 20) if al else 0
+        }
+    bepc = {subject: 12 for subject in rng.sample(settings.french_subjects, rng.randint(0, 8))}
+    bac = {subject: 13 for subject in rng.sample(settings.french_subjects, rng.randint(0, 5))} if rng.random() < 0.7 else {}
+    return {
+        "exam_system": "french",
+        "bepc_results": bepc,
+        "bac_results": bac,
+        "french_average": round(rng.uniform(6, 18), 2)
+    }
+
+
+def check(sizes, students: int, seed: int):
+    rng = random.Random(seed)
+    agent = UniversityAgent("university", "University Program Agent", "Eligibility benchmark")
+    engine = EligibilityEngine()
+    results = []
+
+    for size in sizes:
+        snapshot = synthetic_snapshot(size, rng)
+        engine.compile(snapshot)
+        profiles = [random_profile(rng) for _ in range(students)]
+        scalar_time = vector_time = 0.0
+
+        for profile in profiles:
+            started = time.perf_counter()
+            scalar = [agent._evaluate_program_eligibility(program, profile) for program in snapshot.programs]
+            order = sorted(range(size), key=lambda i: (scalar[i].eligible, scalar[i].score), reverse=True)
+            scalar_time += time.perf_counter() - started
+
+            started = time.perf_counter()
+            scores = engine.score(snapshot, profile)
+            top = scores.ranking()[:20]
+            vector_time += time.perf_counter() - started
+
+            for position, expected in enumerate(scalar):
+                actual = scores.result_at(position)
+                if actual != {"eligible": expected.eligible, "score": expected.score} \
+                        or type(actual["score"]) is not type(expected.score):
+                    raise AssertionError(f"Program {position} differs for {profile}: {actual} != {expected}")
+            if list(top) != order[:20]:
+                raise AssertionError(f"Top-20 ordering differs for {profile}")
+
+        started = time.perf_counter()
+        batch = engine.score_many(snapshot, profiles)
+        batch_time = time.perf_counter() - started
+        for profile, batch_scores in zip(profiles, batch):
+            single = engine.score(snapshot, profile)
+            if not ((single.eligible == batch_scores.eligible).all() and (single.score == batch_scores.score).all()):
+                raise AssertionError(f"Batch scoring differs from single scoring for {profile}")
+
+        results.append((
+            size,
+            scalar_time / students * 1000,
+            vector_time / students * 1000,
+            batch_time / students * 1000
+        ))
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--students", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    try:
+        results = check(sorted(args.sizes), args.students, args.seed)
+    except AssertionError as e:
+        print(f"FAIL: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    print(f"{'programs':>10} {'scalar ms':>12} {'vector ms':>12} {'batch ms':>12} {'speedup':>9}")
+    for size, scalar_ms, vector_ms, batch_ms in results:
+        print(
+            f"{size:>10} {scalar_ms:>12.3f} {vector_ms:>12.3f} {batch_ms:>12.3f}"
+            f" {scalar_ms / max(vector_ms, 1e-9):>8.1f}x"
+        )
+
+    print("OK: vectorized scores and ordering match the scalar evaluator")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,321 @@
+"""
+Synthetic catalog and student fixtures for the load test.
+
+The catalog is organized around fields of study: every program belongs to a
+field, requires that field's subjects and lists its careers as prospects,
+and the career paths and job sectors are named after the same careers, so
+eligibility, the career index and scoring all find realistic matches.
+
+Student results follow the shape of real GCE and French exam sessions: one
+latent ability per student drives every subject grade (strong students are
+strong across the board), the marginal grade distributions match typical
+pass rates, and only students with enough O-Level passes (or a passing BEPC
+average) go on to A-Levels (or the Baccalauréat).
+"""
+import random
+from statistics import NormalDist
+from typing import Dict, Any, List, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.engine import Engine
+
+from models.job_market import JobSector, Skill, CareerPath
+from models.university import University, Program
+
+
+# (field, faculty, required GCE subjects pool, careers, student interest, sector)
+FIELDS: List[Tuple[str, str, List[str], List[str], str, str]] = [
+    ("Computer Science", "Faculty of Science",
+     ["Mathematics", "Computer Science", "Physics", "Further Mathematics"],
+     ["Software Developer", "Data Analyst", "Network Administrator", "IT Consultant"],
+     "Computer Science", "Information Technology"),
+    ("Medicine", "Faculty of Medicine and Biomedical Sciences",
+     ["Biology", "Chemistry", "Physics", "Mathematics"],
+     ["Medical Doctor", "Nurse", "Pharmacist", "Laboratory Technician"],
+     "Medicine & Health", "Healthcare"),
+    ("Civil Engineering", "National Advanced School of Engineering",
+     ["Mathematics", "Physics", "Chemistry", "Further Mathematics"],
+     ["Civil Engineer", "Structural Engineer", "Site Manager", "Quantity Surveyor"],
+     "Engineering", "Construction"),
+    ("Economics and Management", "Faculty of Economics and Management",
+     ["Economics", "Mathematics", "Commerce", "Geography"],
+     ["Accountant", "Financial Analyst", "Business Manager", "Marketing Specialist"],
+     "Business & Economics", "Finance and Banking"),
+    ("Law", "Faculty of Law and Political Science",
+     ["History", "Government", "Literature", "English Language"],
+     ["Lawyer", "Legal Advisor", "Magistrate", "Civil Administrator"],
+     "Law & Government", "Public Administration"),
+    ("Agronomy", "Faculty of Agronomy and Agricultural Sciences",
+     ["Biology", "Chemistry", "Geography", "Mathematics"],
+     ["Agronomist", "Agricultural Engineer", "Farm Manager", "Veterinary Technician"],
+     "Agriculture", "Agriculture"),
+    ("Education", "Higher Teacher Training College",
+     ["English Language", "French", "Literature", "History"],
+     ["Teacher", "School Administrator", "Education Counsellor"],
+     "Education", "Education"),
+    ("Communication", "Faculty of Arts, Letters and Social Sciences",
+     ["Literature", "English Language", "French", "History"],
+     ["Journalist", "Translator", "Communication Officer"],
+     "Media & Communication", "Media and Telecommunications"),
+    ("Environmental Science", "Faculty of Science",
+     ["Geography", "Biology", "Chemistry", "Physics"],
+     ["Environmental Scientist", "Geologist", "Mining Engineer"],
+     "Environmental Science", "Mining and Energy"),
+]
+
+# Prospects no career path is named after, so scoring also meets unmatched careers
+UNMATCHED_CAREERS = ["Freelance Consultant", "Entrepreneur", "Research Assistant"]
+
+# (degree type, title, duration in years, share of programs)
+DEGREES = [
+    ("bachelor", "Bachelor of Science in", 3, 0.55),
+    ("master", "Master in", 2, 0.2),
+    ("hnd", "Higher National Diploma in", 2, 0.12),
+    ("diploma", "Diploma in", 2, 0.08),
+    ("doctorate", "Doctorate in", 5, 0.05),
+]
+
+CITIES = [
+    ("Yaoundé", "Centre"), ("Douala", "Littoral"), ("Buea", "South-West"),
+    ("Bamenda", "North-West"), ("Dschang", "West"), ("Ngaoundéré", "Adamawa"),
+    ("Maroua", "Far North"), ("Bertoua", "East"), ("Ebolowa", "South"), ("Garoua", "North")
+]
+ANGLOPHONE_REGIONS = {"South-West", "North-West"}
+
+DEMAND_LEVELS = ["low", "medium", "high", "very_high"]
+TRENDS = ["declining", "stable", "growing", "emerging"]
+
+# Marginal grade shares, best grade first, as in a typical GCE session
+OL_GRADE_SHARES = [("A", 0.10), ("B", 0.15), ("C", 0.25), ("D", 0.20), ("E", 0.15), ("F", 0.15)]
+AL_GRADE_SHARES = [("A", 0.08), ("B", 0.12), ("C", 0.18), ("D", 0.20), ("E", 0.17), ("O", 0.13), ("F", 0.12)]
+OL_PASSES = {"A", "B", "C"}
+
+# Subjects taken: O-Level candidates sit 6-11 papers, A-Level candidates 2-5
+OL_SUBJECT_COUNTS = [(6, 0.1), (7, 0.15), (8, 0.25), (9, 0.25), (10, 0.15), (11, 0.1)]
+AL_SUBJECT_COUNTS = [(2, 0.1), (3, 0.45), (4, 0.4), (5, 0.05)]
+OL_CORE_SUBJECTS = ["English Language", "Mathematics"]
+
+FRENCH_CORE_SUBJECTS = ["Français", "Mathématiques", "Anglais"]
+
+# How strongly one subject's result follows the student's overall ability
+ABILITY_WEIGHT = 0.8
+
+_NORMAL = NormalDist()
+
+
+def _weighted(rng: random.Random, choices: List[Tuple[Any, float]]) -> Any:
+    return rng.choices([value for value, _ in choices], weights=[weight for _, weight in choices])[0]
+
+
+def _grade_cutoffs(shares: List[Tuple[str, float]]) -> List[Tuple[float, str]]:
+    """(lowest standard normal score, grade) pairs, best grade first"""
+    cutoffs = []
+    above = 0.0
+    for grade, share in shares[:-1]:
+        above += share
+        cutoffs.append((_NORMAL.inv_cdf(1 - above), grade))
+    cutoffs.append((float("-inf"), shares[-1][0]))
+    return cutoffs
+
+
+OL_CUTOFFS = _grade_cutoffs(OL_GRADE_SHARES)
+AL_CUTOFFS = _grade_cutoffs(AL_GRADE_SHARES)
+
+
+def _subject_score(rng: random.Random, ability: float) -> float:
+    """Standard normal score of one paper, correlated with the student's ability"""
+    return ABILITY_WEIGHT * ability + (1 - ABILITY_WEIGHT ** 2) ** 0.5 * rng.gauss(0, 1)
+
+
+def _grade(score: float, cutoffs: List[Tuple[float, str]]) -> str:
+    for lowest, grade in cutoffs:
+        if score >= lowest:
+            return grade
+    return cutoffs[-1][1]
+
+
+def _mark(rng: random.Random, ability: float) -> float:
+    """A French mark out of 20, to the quarter point"""
+    mark = 10.5 + 3.0 * _subject_score(rng, ability)
+    return round(min(20.0, max(0.0, mark)) * 4) / 4
+
+
+def gce_results(rng: random.Random, subjects: List[str]) -> Dict[str, Any]:
+    ability = rng.gauss(0, 1)
+
+    ol_count = _weighted(rng, OL_SUBJECT_COUNTS)
+    ol_subjects = OL_CORE_SUBJECTS + rng.sample(
+        [subject for subject in subjects if subject not in OL_CORE_SUBJECTS], ol_count - len(OL_CORE_SUBJECTS)
+    )
+    ol_results = {subject: _grade(_subject_score(rng, ability), OL_CUTOFFS) for subject in ol_subjects}
+
+    # Sixth form needs four O-Level passes, and some qualified students stop anyway
+    al_results = {}
+    passes = [subject for subject, grade in ol_results.items() if grade in OL_PASSES]
+    if len(passes) >= 4 and rng.random() < 0.85:
+        al_count = min(_weighted(rng, AL_SUBJECT_COUNTS), len(passes))
+        al_results = {subject: _grade(_subject_score(rng, ability), AL_CUTOFFS) for subject in rng.sample(passes, al_count)}
+
+    return {"exam_system": "gce", "ol_results": ol_results, "al_results": al_results}
+
+
+def french_results(rng: random.Random, subjects: List[str]) -> Dict[str, Any]:
+    ability = rng.gauss(0, 1)
+
+    bepc_subjects = FRENCH_CORE_SUBJECTS + rng.sample(
+        [subject for subject in subjects if subject not in FRENCH_CORE_SUBJECTS], rng.randint(3, 6)
+    )
+    bepc_results = {subject: _mark(rng, ability) for subject in bepc_subjects}
+
+    # Only students who passed the BEPC sit the Baccalauréat
+    bac_results = {}
+    if sum(bepc_results.values()) / len(bepc_results) >= 10 and rng.random() < 0.8:
+        bac_subjects = ["Philosophie"] + rng.sample(
+            [subject for subject in subjects if subject != "Philosophie"], rng.randint(3, 5)
+        )
+        bac_results = {subject: _mark(rng, ability) for subject in bac_subjects}
+
+    return {"exam_system": "french", "bepc_results": bepc_results, "bac_results": bac_results}
+
+
+def student_profile(rng: random.Random, gce_subjects: List[str], french_subjects: List[str], gce_share: float = 0.6) -> Dict[str, Any]:
+    """Raw student data as the API receives it: exam results plus preferences"""
+    if rng.random() < gce_share:
+        profile = gce_results(rng, gce_subjects)
+        profile["language_preference"] = "en"
+    else:
+        profile = french_results(rng, french_subjects)
+        profile["language_preference"] = "fr"
+
+    fields = rng.sample(FIELDS, rng.randint(1, 2))
+    profile["interests"] = [field[4] for field in fields]
+    profile["career_preferences"] = [rng.choice(field[3]) for field in fields]
+    if rng.random() < 0.4:
+        profile["location_preferences"] = [city for city, _ in rng.sample(CITIES, rng.randint(1, 2))]
+    return profile
+
+
+def _career_names(career_paths: int) -> List[Tuple[str, str]]:
+    """(career path name, sector name), the plain career names first"""
+    careers = [(career, field[5]) for field in FIELDS for career in field[3]]
+    names = careers[:career_paths]
+    specialization = 1
+    while len(names) < career_paths:
+        for career, sector in careers[:career_paths - len(names)]:
+            names.append((f"{career} Specialist {specialization}", sector))
+        specialization += 1
+    return names
+
+
+def seed_catalog(
+    engine: Engine,
+    rng: random.Random,
+    programs: int,
+    universities: int,
+    career_paths: int,
+    sectors: int,
+    skills: int = 40
+):
+    """Insert a synthetic catalog into an empty schema"""
+    sector_names = list(dict.fromkeys(field[5] for field in FIELDS))
+    sector_names += [f"Emerging Sector {i}" for i in range(max(0, sectors - len(sector_names)))]
+    sector_names = sector_names[:max(1, sectors)]
+    sector_ids = {name: index + 1 for index, name in enumerate(sector_names)}
+
+    university_rows = []
+    for i in range(universities):
+        city, region = CITIES[i % len(CITIES)]
+        public = rng.random() < 0.4
+        university_rows.append({
+            "code": f"LT_U{i:04d}",
+            "name": f"{'University' if public else 'Private Institute'} of {city} {i // len(CITIES) + 1}",
+            "type": "public" if public else "private",
+            "city": city,
+            "region": region,
+            "language_instruction": "english" if region in ANGLOPHONE_REGIONS else rng.choice(["french", "bilingual"]),
+            "established_year": rng.randint(1962, 2020),
+            "is_active": True
+        })
+
+    program_rows = []
+    degree_choices = [(degree[:3], degree[3]) for degree in DEGREES]
+    for i in range(programs):
+        field, faculty, subject_pool, careers, _, _ = rng.choice(FIELDS)
+        degree_type, title, duration = _weighted(rng, degree_choices)
+        university_index = rng.randrange(universities)
+        university = university_rows[university_index]
+        competitive = field == "Medicine" or rng.random() < 0.15
+        minimum_ol = rng.randint(4, 9) + (3 if competitive else 0)
+        minimum_al = rng.randint(2, 8) + (6 if competitive else 0)
+        minimum_french = round(rng.uniform(10, 13) + (2 if competitive else 0), 1)
+        prospects = rng.sample(careers, min(len(careers), rng.randint(2, 3)))
+        if rng.random() < 0.2:
+            prospects.append(rng.choice(UNMATCHED_CAREERS))
+
+        program_rows.append({
+            "code": f"LT_P{i:06d}",
+            "name": f"{title} {field}",
+            "degree_type": degree_type,
+            "duration_years": duration,
+            "university_id": university_index + 1,
+            "faculty": faculty,
+            "department": field,
+            "admission_requirements": {"gce_ol_min": minimum_ol, "gce_al_min": minimum_al, "french_min": minimum_french},
+            "minimum_ol_points": minimum_ol,
+            "minimum_al_points": minimum_al,
+            "minimum_french_average": minimum_french,
+            "required_subjects": rng.sample(subject_pool, rng.randint(1, 3)),
+            "description": f"{title} {field} at {university['name']}, preparing students for careers as {', '.join(prospects)}.",
+            "career_prospects": prospects,
+            "tuition_fee_fcfa": 50000 if university["type"] == "public" else rng.randrange(250000, 1500000, 50000),
+            "is_competitive": competitive,
+            "entrance_exam_required": competitive or rng.random() < 0.3,
+            "language_instruction": university["language_instruction"],
+            "employment_rate": round(rng.uniform(40, 95), 1),
+            "average_starting_salary": rng.randrange(100000, 600000, 10000),
+            "is_active": rng.random() < 0.95
+        })
+
+    sector_rows = []
+    for name in sector_names:
+        salary_min = rng.randrange(100000, 400000, 10000)
+        sector_rows.append({
+            "name": name,
+            "growth_rate": round(rng.uniform(-2, 12), 1),
+            "employment_size": rng.randrange(5000, 300000, 1000),
+            "demand_level": rng.choice(DEMAND_LEVELS),
+            "skill_shortage": rng.random() < 0.4,
+            "contribution_to_gdp": round(rng.uniform(0.5, 20), 1),
+            "average_salary_range": {"min": salary_min, "max": salary_min * rng.randint(3, 6)},
+            "entrepreneurship_score": rng.randint(20, 95),
+            "government_priority": rng.random() < 0.3,
+            "is_active": True
+        })
+
+    career_rows = []
+    for name, sector in _career_names(career_paths):
+        entry = rng.randrange(150000, 600000, 10000)
+        career_rows.append({
+            "name": name,
+            "sector_id": sector_ids.get(sector, rng.randint(1, len(sector_names))),
+            "entry_salary_range": {"min": entry, "max": int(entry * 1.6)},
+            "mid_salary_range": {"min": entry * 2, "max": int(entry * 3.2)},
+            "senior_salary_range": {"min": entry * 4, "max": int(entry * 6.5)},
+            "job_availability": rng.choice(DEMAND_LEVELS),
+            "is_active": True
+        })
+
+    skill_rows = [
+        {"name": f"Skill {i}", "category": rng.choice(["technical", "soft", "business"]),
+         "demand_level": rng.choice(DEMAND_LEVELS), "trend": rng.choice(TRENDS),
+         "salary_impact": round(rng.uniform(0, 40), 1), "is_active": True}
+        for i in range(skills)
+    ]
+
+    with engine.begin() as conn:
+        conn.execute(insert(University), university_rows)
+        conn.execute(insert(Program), program_rows)
+        conn.execute(insert(JobSector), sector_rows)
+        conn.execute(insert(CareerPath), career_rows)
+        if skill_rows:
+            conn.execute(insert(Skill), skill_rows)
@@ -0,0 +1,180 @@
+"""
+Encode time and size of a recommendation response, FastAPI's default path
+versus FastJSONResponse.
+
+Builds a realistic /recommendations/generate payload (10 recommendations
+with component scores, eligibility, pros/cons and salary data, plus the
+pipeline timing metadata, a datetime and Decimal values) and encodes it:
+
+- through a response_model route: FastAPI validation and serialization of
+  RecommendationResponse plus JSONResponse (before), against
+  FastJSONResponse rendering the model directly (after);
+- as a plain dict: jsonable_encoder plus JSONResponse (before), against
+  FastJSONResponse (after).
+
+Run from the backend directory:
+    python -m benchmarks.json_encoding --recommendations 10 --repeat 500
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import statistics
+import time
+from decimal import Decimal
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("DEBUG", "false")
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import APIRoute, serialize_response  # noqa: E402
+
+from api.routes.recommendations import RecommendationResponse  # noqa: E402
+from core import serialization  # noqa: E402
+from core.responses import FastJSONResponse  # noqa: E402
+
+STAGES = [
+    "student_profile", "university_programs", "market_overview", "career_outlook",
+    "recommendations", "ai_guidance", "ai_enhancement"
+]
+
+
+def build_recommendation(position: int) -> dict:
+    return {
+        "program_id": position,
+        "program_name": f"Bachelor of Science in Program {position}",
+        "program_code": f"UNI_PRG_{position:03d}",
+        "university_name": "University of Yaoundé I",
+        "faculty": "Faculty of Science",
+        "degree_type": "bachelor",
+        "duration_years": 3,
+        "match_score": round(92.5 - position * 3.1, 2),
+        "confidence_score": round(90.63 - position * 1.7, 2),
+        "ranking_position": position,
+        "component_scores": {
+            "academic_fit": 100 - position, "career_prospects": 50 + position,
+            "salary_potential": 50, "personal_interest": 85,
+            "accessibility": 100, "entrepreneurship": 70
+        },
+        "eligibility": {
+            "eligible": True,
+            "score": 120.0 - position,
+            "match_reasons": [
+                "Meets O-Level requirement (12/9 points)",
+                "Meets A-Level requirement (13/6 points)",
+                "All required subjects completed"
+            ],
+            "missing_requirements": [],
+            "recommendations": []
+        },
+        "reasons": [
+            "Excellent academic fit based on your grades and subjects",
+            "Great potential for starting your own business",
+            "Aligns well with your interests and career goals"
+        ],
+        "pros": [
+            "You meet or exceed all academic requirements",
+            "Skills gained are valuable for entrepreneurship",
+            "You're likely to enjoy studying and working in this field",
+            "Accessible program with reasonable requirements",
+            "Very affordable tuition fees"
+        ],
+        "cons": ["Limited job opportunities in this field", "Below-average salary expectations"],
+        "requirements_met": [
+            "Meets O-Level requirement (12/9 points)",
+            "Meets A-Level requirement (13/6 points)"
+        ],
+        "requirements_missing": [],
+        "career_prospects": ["Software Developer", "System Analyst", "IT Consultant"],
+        "employment_outlook": "Good",
+        "salary_expectations": {"entry": 300000, "mid": 800000, "senior": 1500000},
+        "preparation_tips": ["Strengthen your mathematics foundation", "Build a small portfolio"],
+        "recommended_subjects": ["Chemistry", "Mathematics", "Physics"],
+        "skill_gaps": ["Problem Solving", "Programming", "Computer Skills"],
+        "alternative_programs": [],
+        "fallback_options": [],
+        "tuition_fee_fcfa": Decimal("50000"),
+        "updated_at": datetime.datetime(2025, 1, 26, 16, 1, 3)
+    }
+
+
+def build_payload(recommendations: int) -> dict:
+    return {
+        "success": True,
+        "session_id": "2f1c0b1e-6a51-4b0f-9f5e-2d1b8c7e4a90",
+        "recommendations": [build_recommendation(position) for position in range(1, recommendations + 1)],
+        "metadata": {
+            "agents_involved": ["student_profile", "job_market", "university", "gemini", "recommendation"],
+            "algorithm_version": "1.0",
+            "cache_hit": False,
+            "processing_time_ms": 48,
+            "timestamp": datetime.datetime(2025, 1, 26, 16, 1, 3, 450614),
+            "timing": {
+                "critical_path_ms": Decimal("38.26"),
+                "stages": {
+                    stage: {"agent_id": stage, "start_ms": index * 5.1, "end_ms": index * 5.1 + 4.2, "duration_ms": 4.2}
+                    for index, stage in enumerate(STAGES)
+                }
+            }
+        },
+        "enhanced_content": {
+            "general_guidance": "Focus on programs that build on your strong mathematics results. " * 4,
+            "study_tips": ["Review past GCE papers", "Join a study group", "Plan weekly revision"]
+        }
+    }
+
+
+def median_us(encode, repeat: int) -> float:
+    encode()
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        encode()
+        timings.append((time.perf_counter() - started) * 1_000_000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--recommendations", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=500)
+    args = parser.parse_args()
+
+    payload = build_payload(args.recommendations)
+    model = RecommendationResponse(**payload)
+    field = APIRoute("/generate", lambda: None, response_model=RecommendationResponse).response_field
+    loop = asyncio.new_event_loop()
+
+    def fastapi_model():
+        content = loop.run_until_complete(serialize_response(field=field, response_content=model))
+        return JSONResponse(content).body
+
+    def fastapi_dict():
+        return JSONResponse(jsonable_encoder(payload)).body
+
+    cases = [
+        ("response_model", fastapi_model, lambda: FastJSONResponse(model).body),
+        ("plain dict", fastapi_dict, lambda: FastJSONResponse(payload).body),
+    ]
+
+    encoder = "orjson" if serialization.orjson is not None else "json (orjson not installed)"
+    print(f"\n{args.recommendations} recommendations, median of {args.repeat} runs, encoder: {encoder}\n")
+    print(f"{'payload':<16} {'before us':>10} {'after us':>10} {'speedup':>8} {'before B':>10} {'after B':>10}")
+    try:
+        for name, before, after in cases:
+            before_body, after_body = before(), after()
+            if json.loads(before_body) != json.loads(after_body):
+                raise SystemExit(f"FAIL: {name} encodings differ")
+            before_us, after_us = median_us(before, args.repeat), median_us(after, args.repeat)
+            print(
+                f"{name:<16} {before_us:>10.1f} {after_us:>10.1f} {before_us / after_us:>7.1f}x "
+                f"{len(before_body):>10} {len(after_body):>10}"
+            )
+    finally:
+        loop.close()
+
+
+if __name__ == "__main__":
+    main()
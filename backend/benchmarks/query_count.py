@@ -0,0 +1,139 @@
+"""
+Query-count check for university program matching and career outlook.
+
+Seeds synthetic catalogs of growing size into an in-memory SQLite database
+and asserts that a get_matching_programs request issues the same, constant
+number of SQL statements regardless of how many programs exist. Each growth
+step bumps the catalog data version and refreshes the catalog snapshot
+outside the measured block, as a catalog writer would. It then asserts that
+the career outlook of the matched programs (analyze_opportunities without
+the market overview) is served from the career index without any SQL.
+
+Run from the backend directory:
+    python -m benchmarks.query_count --sizes 10 100 500 --outlook-programs 20
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("DEBUG", "false")
+
+from database.connection import Base, engine, SessionLocal, dispose_async_engine  # noqa: E402
+from database.catalog import get_catalog_store  # noqa: E402
+from database.data_version import bump_data_version, CATALOG  # noqa: E402
+from database.query_counter import QueryCounter  # noqa: E402
+from models.university import University, Program  # noqa: E402
+from agents.job_market_agent import JobMarketAgent  # noqa: E402
+from agents.university_agent import UniversityAgent  # noqa: E402
+
+
+SAMPLE_PROFILE = {
+    "exam_system": "gce",
+    "ol_results": {"Mathematics": "A", "Physics": "B", "Chemistry": "A", "English Language": "B"},
+    "al_results": {"Mathematics": "A", "Physics": "B", "Chemistry": "B"},
+    "ol_points": 10,
+    "al_points": 12,
+    "interests": ["Computer Science"],
+    "career_preferences": ["Software Developer"]
+}
+
+
+def grow_catalog(target_programs: int):
+    """Insert synthetic programs until the catalog holds target_programs rows"""
+    db = SessionLocal()
+    try:
+        university_ids = [uid for (uid,) in db.query(University.id).all()]
+        existing = db.query(Program).count()
+        for i in range(existing, target_programs):
+            db.add(Program(
+                code=f"SYN_{i:05d}",
+                name=f"Synthetic Program {i}",
+                degree_type="bachelor",
+                duration_years=3,
+                university_id=university_ids[i % len(university_ids)],
+                faculty="Faculty of Science",
+                admission_requirements={},
+                minimum_ol_points=6 + i % 5,
+                minimum_al_points=4 + i % 7,
+                required_subjects=["Mathematics", "Physics"] if i % 2 else ["Biology"],
+                career_prospects=["Engineer", ["Software Developer", "Medical Doctor", "Data Analyst"][i % 3]],
+                tuition_fee_fcfa=50000 + (i % 4) * 25000
+            ))
+        bump_data_version(db, CATALOG)
+    finally:
+        db.close()
+
+
+async def measure(sizes, outlook_programs: int):
+    Base.metadata.create_all(bind=engine)
+
+    agent = UniversityAgent("university", "University Program Agent", "Query count check")
+    job_market = JobMarketAgent("job_market", "Job Market Agent", "Query count check")
+    for initialized in (agent, job_market):
+        if not await initialized.initialize():
+            raise RuntimeError(f"{initialized.name} failed to initialize")
+
+    results = []
+    try:
+        for size in sizes:
+            grow_catalog(size)
+            get_catalog_store().refresh_if_stale()
+            with QueryCounter() as counter:
+                response = await agent.handle_request({
+                    "action": "get_matching_programs",
+                    "student_profile": SAMPLE_PROFILE,
+                    "filters": {}
+                })
+            if not response.get("success", True):
+                raise RuntimeError(f"Matching failed: {response.get('error')}")
+            results.append((size, response["total_found"], counter.count))
+
+        programs = [program.to_dict() for program in get_catalog_store().snapshot.programs[:outlook_programs]]
+        with QueryCounter() as counter:
+            response = await job_market.handle_request({
+                "action": "analyze_opportunities",
+                "student_profile": SAMPLE_PROFILE,
+                "programs": programs,
+                "include_market_overview": False
+            })
+        if not response.get("success", True):
+            raise RuntimeError(f"Career outlook failed: {response.get('error')}")
+        outlook = (len(programs), counter.count)
+    finally:
+        await agent.cleanup()
+        await job_market.cleanup()
+        await dispose_async_engine()
+
+    return results, outlook
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 500])
+    parser.add_argument("--outlook-programs", type=int, default=20, help="programs in the career outlook check")
+    args = parser.parse_args()
+
+    results, (outlook_programs, outlook_statements) = asyncio.run(measure(sorted(args.sizes), args.outlook_programs))
+
+    print(f"{'programs':>10} {'matched':>10} {'statements':>12}")
+    for size, matched, statements in results:
+        print(f"{size:>10} {matched:>10} {statements:>12}")
+
+    counts = {statements for _, _, statements in results}
+    if len(counts) != 1:
+        print("FAIL: statement count grows with catalog size", file=sys.stderr)
+        sys.exit(1)
+
+    print(f"OK: {counts.pop()} statement(s) per request regardless of catalog size")
+
+    print(f"career outlook for {outlook_programs} programs: {outlook_statements} statement(s)")
+    if outlook_statements:
+        print("FAIL: career outlook queried the database", file=sys.stderr)
+        sys.exit(1)
+    print("OK: career outlook served from the career index")
+
+
+if __name__ == "__main__":
+    main()
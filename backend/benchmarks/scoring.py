@@ -0,0 +1,334 @@
+"""
+Micro-benchmarks of the RecommendationAgent scoring functions, with a
+regression gate.
+
+Every eligible program of every request goes through the six component
+scores, the confidence score, the reasoning and the preparation guidance.
+Each function is timed over a grid of profile, program and career outlook
+fixtures, taking only the inputs it reads (the career prospects score runs
+over programs x outlooks, the personal interest score over profiles x
+programs, and so on). Timings use timeit: the loop count is calibrated per
+case and both the median and the minimum of the repeats are reported, in
+nanoseconds per call. The gate compares the minimum by default, as it is
+the figure least disturbed by other load on the machine.
+
+--save stores the results as a baseline; --compare fails with exit status 1
+when any case got slower than the baseline by more than --threshold plus
+the case's noise. The noise is the spread between the median and the
+minimum of the baseline rounds ((median - min) / min), so cases that are
+unsteady on this machine get a wider margin. A case over its limit is
+timed again, up to --retries times with a growing pause in between,
+keeping the best run, and is only reported if it is still over: a burst
+of load on the machine (common on shared and single-CPU VMs) slows some
+runs, not all of them. Baselines are only
+comparable on the same machine and Python version.
+
+Run from the backend directory:
+    python -m benchmarks.scoring --save scoring_baseline.json
+    python -m benchmarks.scoring --compare scoring_baseline.json --threshold 0.2
+    python -m benchmarks.scoring --filter accessibility --repeat 15
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import timeit
+from datetime import datetime, timezone
+from typing import Callable, Dict, Any, List, Tuple
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("DEBUG", "false")
+
+from agents.domain import CareerOutlook, DEFAULT_OUTLOOK, ProgramView, StudentProfile  # noqa: E402
+from agents.recommendation_agent import RecommendationAgent  # noqa: E402
+
+
+PROFILES: Dict[str, StudentProfile] = {
+    "gce_strong": StudentProfile.from_dict({
+        "exam_system": "gce",
+        "ol_results": {
+            "English Language": "A", "Mathematics": "A", "Physics": "A", "Chemistry": "B",
+            "Biology": "B", "Computer Science": "A", "French": "C", "Geography": "B"
+        },
+        "al_results": {"Mathematics": "A", "Physics": "B", "Computer Science": "A", "Further Mathematics": "B"},
+        "interests": ["Computer Science", "Engineering", "Mathematics"],
+        "career_preferences": ["Software Developer", "Data Analyst"],
+        "location_preferences": ["Centre", "Littoral"],
+        "language_preference": "en"
+    }),
+    "french_average": StudentProfile.from_dict({
+        "exam_system": "french",
+        "bac_results": {"Mathématiques": 11.5, "Physique": 10.25, "Français": 12.0, "Philosophie": 9.75},
+        "interests": ["Business & Economics"],
+        "career_preferences": ["Accountant"],
+        "language_preference": "fr"
+    }),
+    "no_preferences": StudentProfile.from_dict({
+        "exam_system": "gce",
+        "ol_results": {"English Language": "C", "Mathematics": "C", "Biology": "B", "History": "C"},
+        "al_results": {"Biology": "D", "History": "C"}
+    }),
+}
+
+PROGRAMS: Dict[str, ProgramView] = {
+    "engineering_full_match": ProgramView.from_dict({
+        "id": 1,
+        "name": "Bachelor of Science in Computer Engineering",
+        "description": "Software, hardware and systems engineering with a strong mathematics core.",
+        "required_subjects": ["Mathematics", "Physics", "Computer Science"],
+        "career_prospects": ["Software Developer", "Systems Engineer", "IT Consultant", "Data Analyst"],
+        "tuition_fee_fcfa": 50000,
+        "employment_rate": 85.0,
+        "average_starting_salary": 350000,
+        "language_instruction": "bilingual",
+        "is_competitive": False,
+        "entrance_exam_required": False,
+        "university": {"name": "University of Yaoundé I", "region": "Centre"},
+        "eligibility": {
+            "eligible": True,
+            "score": 112.5,
+            "match_reasons": [
+                "Meets O-Level requirement (20/9 points)",
+                "Meets A-Level requirement (18/6 points)",
+                "All required subjects completed"
+            ],
+            "missing_requirements": [],
+            "recommendations": []
+        }
+    }),
+    "medicine_missing": ProgramView.from_dict({
+        "id": 2,
+        "name": "Doctor of Medicine",
+        "description": "Seven-year medical degree with clinical rotations in teaching hospitals.",
+        "required_subjects": ["Biology", "Chemistry", "Physics", "Mathematics"],
+        "career_prospects": ["Medical Doctor", "Surgeon", "Public Health Officer"],
+        "tuition_fee_fcfa": 100000,
+        "employment_rate": 92.0,
+        "average_starting_salary": 600000,
+        "language_instruction": "french",
+        "is_competitive": True,
+        "entrance_exam_required": True,
+        "university": {"name": "University of Yaoundé I", "region": "Centre"},
+        "eligibility": {
+            "eligible": True,
+            "score": 64.0,
+            "match_reasons": ["Meets O-Level requirement (12/12 points)"],
+            "missing_requirements": ["Need 2 more A-Level points", "Missing required subject: Chemistry"],
+            "recommendations": ["Consider retaking A-Level Chemistry"]
+        }
+    }),
+    "business_private": ProgramView.from_dict({
+        "id": 3,
+        "name": "Master in Business Administration",
+        "description": "Management, finance and entrepreneurship for future business leaders.",
+        "required_subjects": ["Economics"],
+        "career_prospects": ["Business Manager", "Entrepreneur", "Financial Analyst", "Management Consultant", "Accountant"],
+        "tuition_fee_fcfa": 850000,
+        "employment_rate": 55.0,
+        "language_instruction": "english",
+        "is_competitive": False,
+        "entrance_exam_required": True,
+        "university": {"name": "Private Institute of Douala", "region": "Littoral"},
+        "eligibility": {
+            "eligible": True,
+            "score": 80.0,
+            "match_reasons": ["Meets average requirement (11.5/10.0)"],
+            "missing_requirements": [],
+            "recommendations": []
+        }
+    }),
+}
+
+OUTLOOKS: Dict[str, CareerOutlook] = {
+    "default": DEFAULT_OUTLOOK,
+    "high_demand": CareerOutlook(
+        average_demand="very_high",
+        growth_potential="growing",
+        entrepreneurship_score=85,
+        salary={"entry": 350000, "mid": 900000, "senior": 1800000}
+    ),
+}
+
+
+def component_scores(agent: RecommendationAgent, profile: StudentProfile, program: ProgramView, outlook: CareerOutlook) -> Dict[str, float]:
+    eligibility = program.eligibility
+    return {
+        "academic_fit": agent._calculate_academic_fit_score(profile, program, eligibility),
+        "career_prospects": agent._calculate_career_prospects_score(program, outlook),
+        "salary_potential": agent._calculate_salary_potential_score(program, outlook),
+        "entrepreneurship": agent._calculate_entrepreneurship_score(program, outlook),
+        "personal_interest": agent._calculate_personal_interest_score(profile, program),
+        "accessibility": agent._calculate_accessibility_score(profile, program)
+    }
+
+
+def build_cases(agent: RecommendationAgent) -> List[Tuple[str, Callable[[], Any]]]:
+    """(case id, zero-argument call) for every function and fixture combination it depends on"""
+    cases = []
+    profiles, programs, outlooks = PROFILES.items(), PROGRAMS.items(), OUTLOOKS.items()
+
+    for (profile_id, profile), (program_id, program) in itertools.product(profiles, programs):
+        eligibility = program.eligibility
+        cases += [
+            (f"academic_fit[{profile_id}-{program_id}]",
+             lambda p=profile, g=program, e=eligibility: agent._calculate_academic_fit_score(p, g, e)),
+            (f"personal_interest[{profile_id}-{program_id}]",
+             lambda p=profile, g=program: agent._calculate_personal_interest_score(p, g)),
+            (f"accessibility[{profile_id}-{program_id}]",
+             lambda p=profile, g=program: agent._calculate_accessibility_score(p, g)),
+            (f"preparation_guidance[{profile_id}-{program_id}]",
+             lambda p=profile, g=program, e=eligibility: agent._generate_preparation_guidance(p, g, e)),
+        ]
+
+    for (program_id, program), (outlook_id, outlook) in itertools.product(programs, outlooks):
+        cases += [
+            (f"career_prospects[{program_id}-{outlook_id}]",
+             lambda g=program, o=outlook: agent._calculate_career_prospects_score(g, o)),
+            (f"salary_potential[{program_id}-{outlook_id}]",
+             lambda g=program, o=outlook: agent._calculate_salary_potential_score(g, o)),
+            (f"entrepreneurship[{program_id}-{outlook_id}]",
+             lambda g=program, o=outlook: agent._calculate_entrepreneurship_score(g, o)),
+        ]
+
+    for (profile_id, profile), (program_id, program), (outlook_id, outlook) in itertools.product(profiles, programs, outlooks):
+        scores = component_scores(agent, profile, program, outlook)
+        eligibility = program.eligibility
+        case_id = f"{profile_id}-{program_id}-{outlook_id}"
+        cases += [
+            (f"confidence[{case_id}]",
+             lambda s=scores, e=eligibility: agent._calculate_confidence_score(s, e)),
+            (f"reasoning[{case_id}]",
+             lambda s=scores, e=eligibility, g=program: agent._generate_recommendation_reasoning(s, e, g)),
+        ]
+
+    return sorted(cases, key=lambda case: case[0])
+
+
+def time_case(call: Callable[[], Any], repeat: int, min_time: float) -> Dict[str, float]:
+    """Nanoseconds per call: median and minimum over `repeat` calibrated rounds, and their spread"""
+    timer = timeit.Timer(call)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time / 10:
+            break
+        number *= 2
+    number = max(1, int(number * min_time / elapsed))
+    rounds = [total / number * 1e9 for total in timer.repeat(repeat=repeat, number=number)]
+    median, fastest = statistics.median(rounds), min(rounds)
+    return {
+        "median_ns": round(median, 1),
+        "min_ns": round(fastest, 1),
+        "spread": round(median / fastest - 1, 3),
+        "loops": number
+    }
+
+
+def allowed_change(reference: Dict[str, float], threshold: float) -> float:
+    """Relative slowdown allowed for a case: the threshold widened by the baseline's noise"""
+    return threshold + reference.get("spread", 0)
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], stat: str, threshold: float):
+    """(case id, baseline ns, current ns, relative change, allowed change) of cases over their limit"""
+    regressions = []
+    for case_id, result in results.items():
+        reference = baseline.get(case_id)
+        if not reference or not reference.get(stat):
+            continue
+        change = result[stat] / reference[stat] - 1
+        allowed = allowed_change(reference, threshold)
+        if change > allowed:
+            regressions.append((case_id, reference[stat], result[stat], change, allowed))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=7, help="timed rounds per case")
+    parser.add_argument("--min-time", type=float, default=0.02, help="seconds per round")
+    parser.add_argument("--filter", help="only cases whose id contains this text")
+    parser.add_argument("--save", help="write the results as a baseline JSON file")
+    parser.add_argument("--compare", help="baseline JSON file to gate against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown, 0.2 = 20%%")
+    parser.add_argument("--stat", choices=["median_ns", "min_ns"], default="min_ns",
+                        help="figure the gate compares; the minimum is the least sensitive to other load")
+    parser.add_argument("--retries", type=int, default=5,
+                        help="times a case over its limit is timed again before it is reported")
+    parser.add_argument("--retry-delay", type=float, default=1.0,
+                        help="seconds to wait before the first retry, doubled for each further one")
+    args = parser.parse_args()
+
+    agent = RecommendationAgent("recommendation", "Personalized Recommendation Agent", "Scoring benchmark")
+    cases = [case for case in build_cases(agent) if not args.filter or args.filter in case[0]]
+    if not cases:
+        raise SystemExit(f"No case matches {args.filter!r}")
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+
+    results = {}
+    print(f"{'case':<78} {'median ns':>10} {'min ns':>10} {'baseline':>10} {'change':>8}")
+    for case_id, call in cases:
+        result = results[case_id] = time_case(call, args.repeat, args.min_time)
+        reference = baseline.get(case_id, {}).get(args.stat)
+        change = f"{result[args.stat] / reference - 1:+.1%}" if reference else ""
+        print(
+            f"{case_id:<78} {result['median_ns']:>10.1f} {result['min_ns']:>10.1f} "
+            f"{reference or '':>10} {change:>8}"
+        )
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({
+                "meta": {
+                    "timestamp": datetime.now(timezone.utc).isoformat(),
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    "repeat": args.repeat,
+                    "min_time": args.min_time
+                },
+                "results": results
+            }, f, indent=2)
+            f.write("\n")
+        print(f"\nBaseline written to {args.save}")
+
+    if args.compare:
+        missing = sorted(set(results) - set(baseline))
+        if missing:
+            print(f"\n{len(missing)} case(s) not in the baseline: {', '.join(missing)}")
+
+        calls = dict(cases)
+        regressions = compare(results, baseline, args.stat, args.threshold)
+        for attempt in range(args.retries):
+            if not regressions:
+                break
+            delay = args.retry_delay * 2 ** attempt
+            print(f"\nTiming {len(regressions)} case(s) over their limit again in {delay:.0f}s")
+            time.sleep(delay)
+            for case_id, *_ in regressions:
+                rerun = time_case(calls[case_id], args.repeat, args.min_time)
+                if rerun[args.stat] < results[case_id][args.stat]:
+                    results[case_id] = rerun
+            regressions = compare({case_id: results[case_id] for case_id, *_ in regressions}, baseline, args.stat, args.threshold)
+
+        if regressions:
+            print(
+                f"\nFAIL: {len(regressions)} case(s) slower than the baseline by more than "
+                f"{args.threshold:.0%} plus their noise, after {args.retries} retries:",
+                file=sys.stderr
+            )
+            for case_id, reference, current, change, allowed in regressions:
+                print(f"  {case_id}: {reference:.1f} -> {current:.1f} ns ({change:+.1%}, allowed {allowed:+.1%})", file=sys.stderr)
+            sys.exit(1)
+        print(f"\nOK: no case slower than the baseline by more than {args.threshold:.0%} plus its noise")
+
+
+if __name__ == "__main__":
+    main()
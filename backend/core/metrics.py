@@ -0,0 +1,188 @@
+import bisect
+import math
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+# Bucket upper bounds in seconds: 10 log-spaced steps per decade from 0.1ms
+# to 100s, so a percentile read from its bucket overstates it by at most a third.
+_DECADE_STEPS = ("1", "1.25", "1.5", "2", "2.5", "3", "4", "5", "6", "8")
+BUCKET_BOUNDS: Tuple[float, ...] = tuple(
+    float(f"{step}e{exponent}") for exponent in range(-4, 2) for step in _DECADE_STEPS
+) + (100.0,)
+
+# Prometheus only gets the 1-2.5-5 bounds; they are a subset of BUCKET_BOUNDS,
+# so their cumulative counts stay exact
+EXPORTED_BOUNDS: Tuple[float, ...] = tuple(
+    float(f"{step}e{exponent}") for exponent in range(-4, 2) for step in ("1", "2.5", "5")
+) + (100.0,)
+
+QUANTILES = (0.5, 0.9, 0.99)
+
+# Actions come from request payloads; past this many per agent they share one series
+MAX_ACTIONS_PER_AGENT = 32
+OVERFLOW_ACTION = "other"
+
+
+class LatencyHistogram:
+    """Request latencies (seconds) in fixed log buckets: constant memory, mergeable"""
+
+    __slots__ = ("counts", "count", "sum", "max")
+
+    def __init__(self):
+        # One slot per bound plus the overflow bucket above the last bound
+        self.counts = [0] * (len(BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float):
+        self.counts[bisect.bisect_left(BUCKET_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def merge(self, other: "LatencyHistogram"):
+        for index, bucket_count in enumerate(other.counts):
+            self.counts[index] += bucket_count
+        self.count += other.count
+        self.sum += other.sum
+        self.max = max(self.max, other.max)
+
+    def percentile(self, fraction: float) -> float:
+        """Upper bound of the bucket holding the given rank, capped at the observed max"""
+        if not self.count:
+            return 0.0
+
+        rank = max(1, math.ceil(fraction * self.count))
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                if index < len(BUCKET_BOUNDS):
+                    return min(BUCKET_BOUNDS[index], self.max)
+                break
+        return self.max
+
+    def cumulative(self, bounds: Iterable[float] = EXPORTED_BOUNDS) -> List[Tuple[float, int]]:
+        """(upper bound, observations <= bound) pairs, as Prometheus buckets"""
+        result = []
+        seen = 0
+        index = 0
+        for bound in bounds:
+            while index < len(BUCKET_BOUNDS) and BUCKET_BOUNDS[index] <= bound:
+                seen += self.counts[index]
+                index += 1
+            result.append((bound, seen))
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "avg_ms": round(self.sum / self.count * 1000, 2) if self.count else 0,
+            "p50_ms": round(self.percentile(0.5) * 1000, 2),
+            "p90_ms": round(self.percentile(0.9) * 1000, 2),
+            "p99_ms": round(self.percentile(0.99) * 1000, 2),
+            "max_ms": round(self.max * 1000, 2)
+        }
+
+
+class RequestMetrics:
+    """Latency histograms and error counts of one agent, per action"""
+
+    def __init__(self, max_actions: int = MAX_ACTIONS_PER_AGENT):
+        self.max_actions = max_actions
+        self.latency: Dict[str, LatencyHistogram] = {}
+        self.errors: Dict[Tuple[str, str], int] = {}
+
+    def _action_key(self, action: Optional[str]) -> str:
+        action = str(action) if action is not None else "none"
+        if action in self.latency or len(self.latency) < self.max_actions:
+            return action
+        return OVERFLOW_ACTION
+
+    def observe(self, action: Optional[str], seconds: float, error: Optional[BaseException] = None):
+        action = self._action_key(action)
+        histogram = self.latency.get(action)
+        if histogram is None:
+            histogram = self.latency[action] = LatencyHistogram()
+        histogram.observe(seconds)
+
+        if error is not None:
+            key = (action, type(error).__name__)
+            self.errors[key] = self.errors.get(key, 0) + 1
+
+    def total(self) -> LatencyHistogram:
+        combined = LatencyHistogram()
+        for histogram in self.latency.values():
+            combined.merge(histogram)
+        return combined
+
+    def get_stats(self) -> Dict[str, Any]:
+        errors: Dict[str, Dict[str, int]] = {}
+        for (action, error_type), error_count in self.errors.items():
+            errors.setdefault(action, {})[error_type] = error_count
+
+        return {
+            "latency": {action: histogram.get_stats() for action, histogram in self.latency.items()},
+            "errors": errors
+        }
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(**labels: Any) -> str:
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render_prometheus(metrics_by_agent: Dict[str, RequestMetrics], namespace: str = "edupath") -> str:
+    """Render agent request metrics in the Prometheus text exposition format (0.0.4)"""
+    duration = f"{namespace}_agent_request_duration_seconds"
+    quantiles = f"{namespace}_agent_request_duration_quantile_seconds"
+    maximum = f"{namespace}_agent_request_duration_max_seconds"
+    errors = f"{namespace}_agent_request_errors_total"
+
+    lines = [
+        f"# HELP {duration} Agent request latency by agent and action.",
+        f"# TYPE {duration} histogram"
+    ]
+    for agent_id, metrics in metrics_by_agent.items():
+        for action, histogram in metrics.latency.items():
+            for bound, bucket_count in histogram.cumulative():
+                lines.append(f"{duration}_bucket{_labels(agent=agent_id, action=action, le=repr(bound))} {bucket_count}")
+            lines.append(f"{duration}_bucket{_labels(agent=agent_id, action=action, le='+Inf')} {histogram.count}")
+            lines.append(f"{duration}_sum{_labels(agent=agent_id, action=action)} {_number(histogram.sum)}")
+            lines.append(f"{duration}_count{_labels(agent=agent_id, action=action)} {histogram.count}")
+
+    lines += [
+        f"# HELP {quantiles} Agent request latency percentiles, estimated from the histogram buckets.",
+        f"# TYPE {quantiles} gauge"
+    ]
+    for agent_id, metrics in metrics_by_agent.items():
+        for action, histogram in metrics.latency.items():
+            for quantile in QUANTILES:
+                labels = _labels(agent=agent_id, action=action, quantile=quantile)
+                lines.append(f"{quantiles}{labels} {_number(histogram.percentile(quantile))}")
+
+    lines += [
+        f"# HELP {maximum} Slowest agent request observed since startup.",
+        f"# TYPE {maximum} gauge"
+    ]
+    for agent_id, metrics in metrics_by_agent.items():
+        for action, histogram in metrics.latency.items():
+            lines.append(f"{maximum}{_labels(agent=agent_id, action=action)} {_number(histogram.max)}")
+
+    lines += [
+        f"# HELP {errors} Failed agent requests by exception type.",
+        f"# TYPE {errors} counter"
+    ]
+    for agent_id, metrics in metrics_by_agent.items():
+        for (action, error_type), error_count in metrics.errors.items():
+            lines.append(f"{errors}{_labels(agent=agent_id, action=action, exception=error_type)} {error_count}")
+
+    return "\n".join(lines) + "\n"
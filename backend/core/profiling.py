@@ -0,0 +1,328 @@
+import asyncio
+import logging
+import os
+import sys
+import sysconfig
+import threading
+import time
+import tracemalloc
+from typing import Dict, Any, List, Optional, Tuple
+
+from core.config import settings
+
+logger = logging.getLogger("profiling")
+
+MAX_STACK_DEPTH = 128
+# Distinct stacks kept per profile; later new stacks are counted as truncated
+MAX_STACKS = 20000
+# tracemalloc's own bookkeeping grows with live allocations; past this the profile ends early
+MAX_TRACEMALLOC_BYTES = 64 * 1024 * 1024
+TRACEMALLOC_FRAMES = 1
+
+# (file name, function) of leaf frames where a thread waits for work rather than runs
+IDLE_FRAMES = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("selectors.py", "select"),
+    ("queue.py", "get"),
+    ("thread.py", "_worker"),
+}
+
+TRUNCATED_STACK = "[truncated]"
+
+_LIBRARY_PATHS = tuple(
+    path + os.sep for path in {sysconfig.get_paths()["purelib"], sysconfig.get_paths()["platlib"], sysconfig.get_paths()["stdlib"]}
+)
+
+
+class ProfilerBusy(RuntimeError):
+    """Raised when a profile is requested while another one is running"""
+
+
+def _frame_label(code) -> str:
+    """function (file:line) of a code object; ';' separates frames in collapsed stacks"""
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{name} ({_short_path(code.co_filename)}:{code.co_firstlineno})".replace(";", ":")
+
+
+def _short_path(filename: str) -> str:
+    """Module path relative to the library directory or working directory it comes from"""
+    for library_path in _LIBRARY_PATHS:
+        if filename.startswith(library_path):
+            return filename[len(library_path):]
+    try:
+        relative = os.path.relpath(filename)
+    except ValueError:
+        return filename
+    return filename if relative.startswith("..") else relative
+
+
+class SamplingProfiler:
+    """
+    Statistical profiler of every thread of this process.
+
+    A background thread reads the current frame of each thread every
+    `interval` seconds and counts identical stacks. Sampling holds the GIL,
+    so its cost is taken from the threads being profiled: when one sample
+    takes longer than `max_overhead` of the interval, the next one is
+    delayed until sampling stays within that share of wall time.
+    """
+
+    def __init__(
+        self,
+        interval: float,
+        max_overhead: float,
+        include_idle: bool = False,
+        max_depth: int = MAX_STACK_DEPTH,
+        max_stacks: int = MAX_STACKS
+    ):
+        self.interval = interval
+        self.max_overhead = max_overhead
+        self.include_idle = include_idle
+        self.max_depth = max_depth
+        self.max_stacks = max_stacks
+
+        self.counts: Dict[Tuple[Any, ...], int] = {}
+        self.samples = 0
+        self.idle_samples = 0
+        self.truncated_samples = 0
+        self.throttled = 0
+        self.sampling_seconds = 0.0
+        self.started_at = 0.0
+        self.stopped_at = 0.0
+
+        self._thread_names: Dict[int, str] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self.started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.stopped_at = time.perf_counter()
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.is_set():
+            started = time.perf_counter()
+            self._sample(own_id)
+            cost = time.perf_counter() - started
+            self.sampling_seconds += cost
+
+            period = self.interval
+            if cost > self.interval * self.max_overhead:
+                period = cost / self.max_overhead
+                self.throttled += 1
+            self._stop.wait(max(0.0, period - cost))
+
+    def _thread_name(self, thread_id: int) -> str:
+        name = self._thread_names.get(thread_id)
+        if name is None:
+            self._thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+            name = self._thread_names.get(thread_id, f"thread-{thread_id}")
+        return name
+
+    def _sample(self, own_id: int):
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_id:
+                continue
+
+            code = frame.f_code
+            if not self.include_idle and (os.path.basename(code.co_filename), code.co_name) in IDLE_FRAMES:
+                self.idle_samples += 1
+                continue
+
+            codes = []
+            while frame is not None and len(codes) < self.max_depth:
+                codes.append(frame.f_code)
+                frame = frame.f_back
+            stack = (self._thread_name(thread_id), *reversed(codes))
+
+            self.samples += 1
+            if stack in self.counts:
+                self.counts[stack] += 1
+            elif len(self.counts) < self.max_stacks:
+                self.counts[stack] = 1
+            else:
+                self.truncated_samples += 1
+
+    def collapsed(self) -> List[str]:
+        """Stacks in the collapsed format of flamegraph.pl and speedscope, most frequent first"""
+        labels: Dict[Any, str] = {}
+        lines = []
+        for stack, count in sorted(self.counts.items(), key=lambda item: item[1], reverse=True):
+            thread_name, codes = stack[0], stack[1:]
+            frames = [thread_name.replace(";", ":")]
+            for code in codes:
+                label = labels.get(code)
+                if label is None:
+                    label = labels[code] = _frame_label(code)
+                frames.append(label)
+            lines.append(f"{';'.join(frames)} {count}")
+        if self.truncated_samples:
+            lines.append(f"{TRUNCATED_STACK} {self.truncated_samples}")
+        return lines
+
+    def get_stats(self) -> Dict[str, Any]:
+        wall_seconds = (self.stopped_at or time.perf_counter()) - self.started_at
+        return {
+            "wall_seconds": round(wall_seconds, 3),
+            "interval_ms": round(self.interval * 1000, 3),
+            "samples": self.samples,
+            "idle_samples_skipped": self.idle_samples,
+            "truncated_samples": self.truncated_samples,
+            "distinct_stacks": len(self.counts),
+            "throttled_samples": self.throttled,
+            "sampling_seconds": round(self.sampling_seconds, 4),
+            "overhead_ratio": round(self.sampling_seconds / wall_seconds, 4) if wall_seconds else 0,
+            "max_overhead_ratio": self.max_overhead
+        }
+
+
+class AllocationTracker:
+    """tracemalloc snapshots around a profile, reported as the top-N growth by line"""
+
+    def __init__(self, frames: int = TRACEMALLOC_FRAMES):
+        self.frames = frames
+        self.started_tracing = False
+        self.before: Optional[tracemalloc.Snapshot] = None
+
+    def start(self):
+        # Tracing started elsewhere (PYTHONTRACEMALLOC) is reused and left running
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self.started_tracing = True
+        self.before = tracemalloc.take_snapshot()
+
+    def memory_bytes(self) -> int:
+        return tracemalloc.get_tracemalloc_memory()
+
+    def stop(self, top: int) -> Dict[str, Any]:
+        try:
+            after = tracemalloc.take_snapshot()
+            current_bytes, peak_bytes = tracemalloc.get_traced_memory()
+            tracemalloc_bytes = self.memory_bytes()
+        finally:
+            if self.started_tracing:
+                tracemalloc.stop()
+
+        ignored = (
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<unknown>")
+        )
+        differences = after.filter_traces(ignored).compare_to(self.before.filter_traces(ignored), "lineno")
+        return {
+            "top": [
+                {
+                    "location": f"{_short_path(stat.traceback[0].filename)}:{stat.traceback[0].lineno}",
+                    "size_diff_bytes": stat.size_diff,
+                    "size_bytes": stat.size,
+                    "count_diff": stat.count_diff,
+                    "count": stat.count
+                }
+                for stat in differences[:top]
+            ],
+            "traced_current_bytes": current_bytes,
+            "traced_peak_bytes": peak_bytes,
+            "tracemalloc_bytes": tracemalloc_bytes,
+            "started_tracing": self.started_tracing
+        }
+
+
+class ProcessProfiler:
+    """
+    Runs one time-bounded profile of this process at a time.
+
+    The profile samples while the caller awaits, so the event loop keeps
+    serving (and is profiled serving) other requests meanwhile.
+    """
+
+    # How often a running profile checks its stop conditions
+    POLL_INTERVAL = 0.25
+
+    def __init__(self, max_duration: float, max_overhead: float, max_tracemalloc_bytes: int = MAX_TRACEMALLOC_BYTES):
+        self.max_duration = max_duration
+        self.max_overhead = max_overhead
+        self.max_tracemalloc_bytes = max_tracemalloc_bytes
+        self._lock = threading.Lock()
+        self.stats = {"profiles": 0, "rejected_busy": 0}
+
+    @property
+    def running(self) -> bool:
+        return self._lock.locked()
+
+    async def profile(
+        self,
+        duration: float,
+        interval: float,
+        allocations: bool = False,
+        top: int = 20,
+        include_idle: bool = False
+    ) -> Dict[str, Any]:
+        if duration > self.max_duration:
+            raise ValueError(f"Profile duration is limited to {self.max_duration}s")
+
+        if not self._lock.acquire(blocking=False):
+            self.stats["rejected_busy"] += 1
+            raise ProfilerBusy("A profile is already running in this process")
+
+        try:
+            self.stats["profiles"] += 1
+            logger.info(f"Profiling for {duration}s every {interval * 1000:.1f}ms (allocations: {allocations})")
+
+            tracker = AllocationTracker() if allocations else None
+            sampler = SamplingProfiler(interval, self.max_overhead, include_idle=include_idle)
+            stopped_early = None
+
+            if tracker is not None:
+                tracker.start()
+            sampler.start()
+            try:
+                deadline = time.monotonic() + duration
+                remaining = duration
+                while remaining > 0:
+                    await asyncio.sleep(min(self.POLL_INTERVAL, remaining))
+                    remaining = deadline - time.monotonic()
+                    if tracker is not None and tracker.memory_bytes() > self.max_tracemalloc_bytes:
+                        stopped_early = "tracemalloc memory limit reached"
+                        break
+            finally:
+                sampler.stop()
+                allocation_report = tracker.stop(top) if tracker is not None else None
+
+            return {
+                "pid": os.getpid(),
+                "requested_duration_seconds": duration,
+                "stopped_early": stopped_early,
+                "sampling": sampler.get_stats(),
+                "collapsed": sampler.collapsed(),
+                "allocations": allocation_report
+            }
+        finally:
+            self._lock.release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "max_duration_seconds": self.max_duration,
+            "max_overhead_ratio": self.max_overhead,
+            **self.stats
+        }
+
+
+_profiler: Optional[ProcessProfiler] = None
+
+
+def get_profiler() -> ProcessProfiler:
+    """Get the process-wide profiler"""
+    global _profiler
+    if _profiler is None:
+        _profiler = ProcessProfiler(settings.profiling_max_duration, settings.profiling_max_overhead)
+    return _profiler
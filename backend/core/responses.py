@@ -0,0 +1,87 @@
+import asyncio
+import functools
+from typing import Any, Callable
+
+from fastapi.routing import APIRoute
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
+
+from core.serialization import JSONFragment, dumps, encode_document
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response encoded with core.serialization (orjson when available).
+
+    Accepts plain JSON-compatible content, pydantic models (dumped by
+    pydantic's own JSON serializer) and dictionaries whose top-level values
+    are pre-encoded JSONFragments.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            if hasattr(content, "model_dump_json"):
+                return content.model_dump_json(by_alias=True).encode("utf-8")
+            return content.json(by_alias=True).encode("utf-8")
+        if isinstance(content, dict) and any(isinstance(value, JSONFragment) for value in content.values()):
+            return encode_document(content)
+        return dumps(content)
+
+
+class FastJSONRoute(APIRoute):
+    """
+    Route that hands endpoint results straight to FastJSONResponse.
+
+    FastAPI normally runs every returned value through jsonable_encoder (or
+    validates and re-serializes it against response_model) before the
+    response class encodes it. That walk dominates the cost of large
+    payloads, so this route skips it for:
+
+    - dicts and lists returned by routes without a response_model, and
+    - instances of the route's own response_model (already validated when
+      they were built) when no include/exclude options are set.
+
+    Anything else, and every route that injects a Response parameter to
+    set headers or status, keeps FastAPI's regular path.
+    """
+
+    def get_route_handler(self) -> Callable:
+        if self.dependant.response_param_name is None and not getattr(self.dependant.call, "_fast_json", False):
+            self.dependant.call = self._wrap_endpoint(self.dependant.call)
+        return super().get_route_handler()
+
+    def _wrap_endpoint(self, call: Callable) -> Callable:
+        if asyncio.iscoroutinefunction(call):
+            @functools.wraps(call)
+            async def endpoint(*args, **kwargs):
+                return self._to_response(await call(*args, **kwargs))
+        else:
+            @functools.wraps(call)
+            def endpoint(*args, **kwargs):
+                return self._to_response(call(*args, **kwargs))
+
+        endpoint._fast_json = True
+        return endpoint
+
+    def _to_response(self, content: Any) -> Any:
+        if isinstance(content, Response):
+            return content
+
+        if self.response_field is None:
+            if not isinstance(content, (dict, list)):
+                return content
+        elif not (type(content) is self.response_model and self._default_dump_options()):
+            return content
+
+        return FastJSONResponse(content, status_code=self.status_code or 200)
+
+    def _default_dump_options(self) -> bool:
+        return not (
+            self.response_model_include
+            or self.response_model_exclude
+            or self.response_model_exclude_unset
+            or self.response_model_exclude_defaults
+            or self.response_model_exclude_none
+        )
@@ -0,0 +1,82 @@
+import datetime
+import decimal
+import enum
+import json
+import logging
+import uuid
+from typing import Any, Dict, Iterable
+
+from pydantic import BaseModel
+
+logger = logging.getLogger("serialization")
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+    logger.warning("orjson not available, falling back to the standard json encoder")
+
+
+def json_default(obj: Any) -> Any:
+    """Encode the non-JSON types our models and agents emit, the way jsonable_encoder does"""
+    if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
+        return obj.isoformat()
+    if isinstance(obj, decimal.Decimal):
+        return int(obj) if obj.as_tuple().exponent >= 0 else float(obj)
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json") if hasattr(obj, "model_dump") else json.loads(obj.json())
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    if isinstance(obj, enum.Enum):
+        return obj.value
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    if isinstance(obj, JSONFragment):
+        # Nested fragments are decoded again; encode_document splices top-level ones as-is
+        return json.loads(obj.encoded)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+    def dumps(obj: Any) -> bytes:
+        """Encode obj as compact UTF-8 JSON"""
+        return orjson.dumps(obj, default=json_default, option=_ORJSON_OPTIONS)
+else:
+    def dumps(obj: Any) -> bytes:
+        """Encode obj as compact UTF-8 JSON"""
+        return json.dumps(obj, default=json_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class JSONFragment:
+    """
+    Already encoded JSON value.
+
+    Fragments are spliced into a document by encode_document() without being
+    decoded or re-encoded, so an entity serialized once can be reused by
+    every response that lists it.
+    """
+
+    __slots__ = ("encoded",)
+
+    def __init__(self, encoded: bytes):
+        self.encoded = encoded
+
+    @classmethod
+    def of(cls, obj: Any) -> "JSONFragment":
+        return cls(dumps(obj))
+
+
+def fragment_array(fragments: Iterable[JSONFragment]) -> JSONFragment:
+    """Join fragments into a JSON array fragment"""
+    return JSONFragment(b"[" + b",".join(fragment.encoded for fragment in fragments) + b"]")
+
+
+def encode_document(document: Dict[str, Any]) -> bytes:
+    """Encode a JSON object whose top-level values may be fragments"""
+    parts = []
+    for key, value in document.items():
+        encoded = value.encoded if isinstance(value, JSONFragment) else dumps(value)
+        parts.append(dumps(str(key)) + b":" + encoded)
+    return b"{" + b",".join(parts) + b"}"
@@ -0,0 +1,470 @@
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+import urllib.request
+from contextvars import ContextVar
+from typing import Dict, Any, List, Optional, Tuple
+
+from core.config import settings
+
+logger = logging.getLogger("tracing")
+
+# OTLP span kinds and status codes
+KIND_INTERNAL = 1
+KIND_SERVER = 2
+KIND_CLIENT = 3
+STATUS_UNSET = 0
+STATUS_ERROR = 2
+
+MAX_STATEMENT_LENGTH = 1000
+
+
+class Span:
+    """One timed operation of a sampled trace"""
+
+    __slots__ = (
+        "tracer", "trace_id", "span_id", "parent_id", "name", "kind",
+        "start_ns", "end_ns", "attributes", "status", "status_message"
+    )
+
+    is_recording = True
+
+    def __init__(self, tracer: "Tracer", trace_id: str, parent_id: Optional[str], name: str, kind: int,
+                 attributes: Optional[Dict[str, Any]] = None):
+        self.tracer = tracer
+        self.trace_id = trace_id
+        self.span_id = _random_id(8)
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+        self.attributes = attributes or {}
+        self.status = STATUS_UNSET
+        self.status_message = ""
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def record_exception(self, error: BaseException):
+        self.status = STATUS_ERROR
+        self.status_message = str(error)
+        self.attributes["exception.type"] = type(error).__name__
+
+    def end(self):
+        if not self.end_ns:
+            self.end_ns = time.time_ns()
+            self.tracer.exporter.submit(self)
+
+
+class NoopSpan:
+    """Stands in for a span when the trace is not sampled; every call is a no-op"""
+
+    __slots__ = ()
+
+    is_recording = False
+    trace_id = None
+    traceparent = None
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+    def record_exception(self, error: BaseException):
+        pass
+
+    def end(self):
+        pass
+
+
+NOOP_SPAN = NoopSpan()
+
+# The active span: a Span inside a sampled trace, NOOP_SPAN inside a trace that
+# was not sampled, None outside of any trace
+_current_span: ContextVar[Optional[Any]] = ContextVar("current_span", default=None)
+
+
+def current_span() -> Any:
+    return _current_span.get() or NOOP_SPAN
+
+
+def _random_id(length: int) -> str:
+    return os.urandom(length).hex()
+
+
+def parse_traceparent(header: Optional[str]) -> Optional[Tuple[str, str, bool]]:
+    """(trace id, parent span id, sampled) from a W3C traceparent header, or None if invalid"""
+    if not header:
+        return None
+    parts = header.strip().split("-")
+    if len(parts) < 4 or len(parts[0]) != 2 or parts[0] == "ff":
+        return None
+    _, trace_id, parent_id, flags = parts[:4]
+    if len(trace_id) != 32 or len(parent_id) != 16 or len(flags) != 2:
+        return None
+    try:
+        int(trace_id, 16), int(parent_id, 16)
+        sampled = bool(int(flags, 16) & 1)
+    except ValueError:
+        return None
+    if trace_id == "0" * 32 or parent_id == "0" * 16:
+        return None
+    return trace_id.lower(), parent_id.lower(), sampled
+
+
+class _SpanScope:
+    """Makes a span current for the enclosed block and ends it on exit"""
+
+    __slots__ = ("span", "_token")
+
+    def __init__(self, span: Any):
+        self.span = span
+        self._token = None
+
+    def __enter__(self) -> Any:
+        self._token = _current_span.set(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb):
+        _current_span.reset(self._token)
+        if exc is not None:
+            self.span.record_exception(exc)
+        self.span.end()
+        return False
+
+
+class _NoopScope:
+    __slots__ = ()
+
+    def __enter__(self) -> NoopSpan:
+        return NOOP_SPAN
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP_SCOPE = _NoopScope()
+
+
+class Tracer:
+    """
+    Head-sampled request tracer.
+
+    trace() opens the root span of a request: it continues the trace of an
+    incoming traceparent header (keeping the caller's sampling decision) or
+    samples a new trace with probability sample_ratio. Inside a sampled trace
+    span() and start_span() record child spans; everywhere else they return
+    NOOP_SPAN, so unsampled requests cost a context variable lookup per span.
+    Finished spans go to the exporter's background thread.
+    """
+
+    def __init__(self, exporter: Optional["OTLPJsonExporter"] = None, sample_ratio: float = 0.01):
+        self.exporter = exporter
+        self.sample_ratio = max(0.0, min(1.0, sample_ratio))
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None
+
+    def trace(self, name: str, traceparent: Optional[str] = None, kind: int = KIND_SERVER, **attributes) -> Any:
+        """Root span of a request, or a child span if a trace is already active"""
+        if not self.enabled:
+            return _NOOP_SCOPE
+
+        parent = _current_span.get()
+        if parent is not None:
+            return self.span(name, kind=kind, **attributes)
+
+        incoming = parse_traceparent(traceparent)
+        if incoming is not None:
+            trace_id, parent_id, sampled = incoming
+        else:
+            trace_id, parent_id = None, None
+            sampled = random.random() < self.sample_ratio
+
+        if not sampled:
+            # Mark the request as decided so nested trace() calls do not sample again
+            return _SpanScope(NOOP_SPAN)
+
+        return _SpanScope(Span(self, trace_id or _random_id(16), parent_id, name, kind, attributes))
+
+    def span(self, name: str, kind: int = KIND_INTERNAL, **attributes) -> Any:
+        """Child span of the current span for the enclosed block"""
+        parent = _current_span.get()
+        if parent is None or not parent.is_recording:
+            return _NOOP_SCOPE
+        return _SpanScope(Span(self, parent.trace_id, parent.span_id, name, kind, attributes))
+
+    def start_span(self, name: str, kind: int = KIND_INTERNAL, attributes: Optional[Dict[str, Any]] = None) -> Optional[Span]:
+        """Child span that the caller ends itself and that never becomes current (for event hooks)"""
+        parent = _current_span.get()
+        if parent is None or not parent.is_recording:
+            return None
+        return Span(self, parent.trace_id, parent.span_id, name, kind, attributes)
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = {"enabled": self.enabled, "sample_ratio": self.sample_ratio}
+        if self.exporter is not None:
+            stats.update(self.exporter.get_stats())
+        return stats
+
+    def shutdown(self, timeout: float = 5.0):
+        if self.exporter is not None:
+            self.exporter.shutdown(timeout)
+
+
+def _attribute_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [{"key": key, "value": _attribute_value(value)} for key, value in attributes.items() if value is not None]
+
+
+class OTLPJsonExporter:
+    """
+    Export finished spans as OTLP/JSON ExportTraceServiceRequest documents.
+
+    Spans are queued without blocking (and dropped when the queue is full)
+    and a daemon thread batches them: each batch is appended to file_path as
+    one JSON line (the format the OpenTelemetry Collector's otlpjsonfile
+    receiver reads) or POSTed to an OTLP/HTTP endpoint such as a local
+    collector's /v1/traces.
+    """
+
+    def __init__(
+        self,
+        service_name: str,
+        file_path: Optional[str] = None,
+        endpoint: Optional[str] = None,
+        max_queue: int = 4096,
+        batch_size: int = 512,
+        flush_interval: float = 1.0
+    ):
+        self.service_name = service_name
+        self.file_path = file_path
+        self.endpoint = endpoint
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue[Optional[Span]]" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.stats = {"exported": 0, "dropped": 0, "export_errors": 0}
+
+    def submit(self, span: Span):
+        if self._thread is None:
+            self._start()
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            self.stats["dropped"] += 1
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            batch = []
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                try:
+                    span = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if span is None:
+                    stopping = True
+                    break
+                batch.append(span)
+            if batch:
+                self._export(batch)
+
+    def _export(self, spans: List[Span]):
+        try:
+            body = json.dumps(self.encode(spans), separators=(",", ":")).encode("utf-8")
+            if self.endpoint:
+                request = urllib.request.Request(
+                    self.endpoint, data=body, method="POST", headers={"Content-Type": "application/json"}
+                )
+                with urllib.request.urlopen(request, timeout=5):
+                    pass
+            else:
+                directory = os.path.dirname(self.file_path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                with open(self.file_path, "ab") as spool:
+                    spool.write(body + b"\n")
+            self.stats["exported"] += len(spans)
+        except Exception as e:
+            self.stats["export_errors"] += 1
+            logger.warning(f"Failed to export {len(spans)} spans: {e}")
+
+    def encode(self, spans: List[Span]) -> Dict[str, Any]:
+        encoded = []
+        for span in spans:
+            item = {
+                "traceId": span.trace_id,
+                "spanId": span.span_id,
+                "name": span.name,
+                "kind": span.kind,
+                "startTimeUnixNano": str(span.start_ns),
+                "endTimeUnixNano": str(span.end_ns),
+                "attributes": _attributes(span.attributes),
+                "status": {"code": span.status, "message": span.status_message} if span.status else {}
+            }
+            if span.parent_id:
+                item["parentSpanId"] = span.parent_id
+            encoded.append(item)
+
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": _attributes({"service.name": self.service_name})},
+                "scopeSpans": [{"scope": {"name": "edupath.tracing"}, "spans": encoded}]
+            }]
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "queued": self._queue.qsize(),
+            "target": self.endpoint or self.file_path
+        }
+
+    def shutdown(self, timeout: float = 5.0):
+        """Flush queued spans and stop the export thread"""
+        if self._thread is None:
+            return
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        self._thread.join(timeout)
+        self._thread = None
+
+
+_tracer: Optional[Tracer] = None
+
+
+def get_tracer() -> Tracer:
+    """Get the process-wide tracer (disabled unless TRACING_ENABLED is set)"""
+    global _tracer
+    if _tracer is None:
+        exporter = None
+        if settings.tracing_enabled:
+            if settings.tracing_exporter == "otlp_http":
+                exporter = OTLPJsonExporter(settings.tracing_service_name, endpoint=settings.tracing_otlp_endpoint)
+            else:
+                exporter = OTLPJsonExporter(settings.tracing_service_name, file_path=settings.tracing_file_path)
+        _tracer = Tracer(exporter, settings.tracing_sample_ratio)
+    return _tracer
+
+
+def instrument_engine(engine):
+    """Record a client span per SQL statement executed on a (sync) SQLAlchemy engine"""
+    tracer = get_tracer()
+    if not tracer.enabled:
+        return
+
+    from sqlalchemy import event
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        span = tracer.start_span("db.query", KIND_CLIENT, {
+            "db.system": conn.dialect.name,
+            "db.statement": statement[:MAX_STATEMENT_LENGTH],
+            "db.executemany": executemany
+        })
+        if span is not None and context is not None:
+            context._trace_span = span
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        span = getattr(context, "_trace_span", None)
+        if span is not None:
+            span.set_attribute("db.rowcount", getattr(cursor, "rowcount", None))
+            span.end()
+
+    def handle_error(exception_context):
+        span = getattr(exception_context.execution_context, "_trace_span", None)
+        if span is not None:
+            span.record_exception(exception_context.original_exception)
+            span.end()
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", after_cursor_execute)
+    event.listen(engine, "handle_error", handle_error)
+
+
+def instrument_redis(client):
+    """Record a client span per Redis command sent through an asyncio Redis client"""
+    tracer = get_tracer()
+    if not tracer.enabled or getattr(client, "_traced", False):
+        return client
+
+    execute_command = client.execute_command
+
+    async def traced_execute_command(*args, **options):
+        span = tracer.start_span(f"redis.{args[0]}".lower() if args else "redis", KIND_CLIENT, {"db.system": "redis"})
+        if span is None:
+            return await execute_command(*args, **options)
+        try:
+            return await execute_command(*args, **options)
+        except Exception as e:
+            span.record_exception(e)
+            raise
+        finally:
+            span.end()
+
+    client.execute_command = traced_execute_command
+    client._traced = True
+    return client
+
+
+class TracingMiddleware:
+    """ASGI middleware opening the root span of every HTTP request"""
+
+    def __init__(self, app):
+        self.app = app
+        self.tracer = get_tracer()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.tracer.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        traceparent = None
+        for name, value in scope.get("headers", ()):
+            if name == b"traceparent":
+                traceparent = value.decode("latin-1")
+                break
+
+        with self.tracer.trace(
+            f"{scope['method']} {scope['path']}",
+            traceparent=traceparent,
+            kind=KIND_SERVER,
+            **{"http.method": scope["method"], "http.target": scope["path"]}
+        ) as span:
+            async def traced_send(message):
+                if message["type"] == "http.response.start" and span.is_recording:
+                    span.set_attribute("http.status_code", message["status"])
+                    if message["status"] >= 500:
+                        span.status = STATUS_ERROR
+                    # Echo the trace context so callers can find the request's spans
+                    message = {**message, "headers": [*message.get("headers", []), (b"traceparent", span.traceparent.encode("latin-1"))]}
+                await send(message)
+
+            await self.app(scope, receive, traced_send)
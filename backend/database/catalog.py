@@ -0,0 +1,438 @@
+import asyncio
+import logging
+import time
+from typing import Dict, Any, List, Optional, Tuple, Iterable
+
+from core.serialization import JSONFragment
+from database.connection import SessionLocal
+from database.data_version import read_data_versions, format_data_version
+
+
+class CatalogRecord:
+    """
+    Immutable, slotted view of one catalog row.
+
+    `data` holds the precomputed to_dict() output so responses never have to
+    rebuild it; the attributes listed in _fields are lifted out of it for
+    fast access in matching and scoring code. The JSON encoding of `data` is
+    computed on first use and kept for the life of the snapshot, so each
+    entity is serialized once per catalog version.
+    """
+
+    __slots__ = ("data", "_json")
+    _fields: Tuple[str, ...] = ()
+
+    def __init__(self, data: Dict[str, Any]):
+        object.__setattr__(self, "data", data)
+        object.__setattr__(self, "_json", None)
+        for field in self._fields:
+            object.__setattr__(self, field, data.get(field))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return a shallow copy of the precomputed dictionary"""
+        return dict(self.data)
+
+    @property
+    def json(self) -> JSONFragment:
+        """Pre-encoded JSON of to_dict(), cached on the record"""
+        fragment = self._json
+        if fragment is None:
+            fragment = JSONFragment.of(self.data)
+            object.__setattr__(self, "_json", fragment)
+        return fragment
+
+
+class UniversityRecord(CatalogRecord):
+    _fields = ("id", "code", "name", "type", "city", "region", "language_instruction")
+    __slots__ = _fields
+
+
+class ProgramRecord(CatalogRecord):
+    _fields = (
+        "id", "code", "name", "degree_type", "university_id", "faculty",
+        "minimum_ol_points", "minimum_al_points", "minimum_french_average",
+        "required_subjects", "career_prospects", "is_competitive", "entrance_exam_required"
+    )
+    __slots__ = _fields + ("university",)
+
+    def __init__(self, data: Dict[str, Any], university: Optional[UniversityRecord] = None):
+        super().__init__(data)
+        object.__setattr__(self, "university", university)
+
+
+class JobSectorRecord(CatalogRecord):
+    _fields = (
+        "id", "name", "demand_level", "growth_rate", "entrepreneurship_score",
+        "government_priority", "contribution_to_gdp", "average_salary_range",
+        "startup_capital_required", "is_active"
+    )
+    __slots__ = _fields
+
+
+class SkillRecord(CatalogRecord):
+    _fields = ("id", "name", "category", "demand_level", "trend", "salary_impact")
+    __slots__ = _fields
+
+
+class CareerPathRecord(CatalogRecord):
+    _fields = ("id", "name", "sector_id")
+    __slots__ = _fields
+
+
+def _group_by(records: Iterable[CatalogRecord], attribute: str) -> Dict[Any, Tuple[CatalogRecord, ...]]:
+    """Index records by an attribute, keeping their original order"""
+    groups: Dict[Any, List[CatalogRecord]] = {}
+    for record in records:
+        groups.setdefault(getattr(record, attribute), []).append(record)
+    return {key: tuple(values) for key, values in groups.items()}
+
+
+def descending(value) -> Tuple[bool, float]:
+    """Sort key that orders numbers descending and NULLs last"""
+    return (value is None, -(value or 0))
+
+
+class ReadOnlyDict(dict):
+    """
+    dict that refuses in-place changes, for data shared by many responses.
+
+    It is still a dict, so json, orjson and pydantic encode it like any
+    other; dict(...), copy() and {**...} give a mutable shallow copy.
+    """
+
+    __slots__ = ()
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError(f"{type(self).__name__} is read-only")
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return (type(self), (dict(self),))
+
+
+def freeze(value: Any) -> Any:
+    """Read-only deep copy of JSON-like data: dicts become ReadOnlyDict and lists tuples"""
+    if isinstance(value, dict):
+        return ReadOnlyDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+class CatalogSnapshot:
+    """
+    Read-only, fully indexed copy of programs, universities and job-market data.
+
+    A snapshot is never modified after it is built; a newer snapshot replaces
+    it wholesale, so readers can hold on to one for the duration of a request
+    without any locking.
+    """
+
+    __slots__ = (
+        "version", "built_at",
+        "universities", "universities_by_id", "universities_by_code", "universities_by_region",
+        "programs", "programs_by_id", "programs_by_code", "programs_by_faculty",
+        "programs_by_degree_type", "programs_by_university",
+        "sectors", "sectors_by_id", "active_sectors",
+        "skills", "skills_by_salary_impact",
+        "career_paths", "career_paths_by_sector"
+    )
+
+    def __init__(
+        self,
+        version: str,
+        universities: List[UniversityRecord],
+        programs: List[ProgramRecord],
+        sectors: List[JobSectorRecord],
+        skills: List[SkillRecord],
+        career_paths: List[CareerPathRecord]
+    ):
+        self.version = version
+        self.built_at = time.time()
+
+        self.universities = tuple(universities)
+        self.universities_by_id = {uni.id: uni for uni in self.universities}
+        self.universities_by_code = {uni.code: uni for uni in self.universities}
+        self.universities_by_region = _group_by(self.universities, "region")
+
+        self.programs = tuple(programs)
+        self.programs_by_id = {prog.id: prog for prog in self.programs}
+        self.programs_by_code = {prog.code: prog for prog in self.programs}
+        self.programs_by_faculty = _group_by(self.programs, "faculty")
+        self.programs_by_degree_type = _group_by(self.programs, "degree_type")
+        self.programs_by_university = _group_by(self.programs, "university_id")
+
+        # Inactive sectors stay addressable by id because career paths may still reference them
+        self.sectors = tuple(sectors)
+        self.sectors_by_id = {sector.id: sector for sector in self.sectors}
+        self.active_sectors = tuple(sector for sector in self.sectors if sector.is_active)
+
+        self.skills = tuple(skills)
+        self.skills_by_salary_impact = tuple(sorted(self.skills, key=lambda skill: descending(skill.salary_impact)))
+
+        self.career_paths = tuple(career_paths)
+        self.career_paths_by_sector = _group_by(self.career_paths, "sector_id")
+
+    def find_programs(
+        self,
+        program_id: Optional[int] = None,
+        university_id: Optional[int] = None,
+        degree_type: Optional[str] = None,
+        faculty: Optional[str] = None
+    ) -> Tuple[ProgramRecord, ...]:
+        """Filter active programs using the indexes (faculty is a case-insensitive substring match)"""
+        candidates = self.programs
+
+        if program_id is not None:
+            program = self.programs_by_id.get(program_id)
+            candidates = (program,) if program else ()
+
+        if university_id:
+            candidates = self._narrow(candidates, self.programs_by_university.get(university_id, ()))
+
+        if degree_type:
+            candidates = self._narrow(candidates, self.programs_by_degree_type.get(degree_type, ()))
+
+        if faculty:
+            needle = faculty.lower()
+            matching = [
+                program
+                for name, programs in self.programs_by_faculty.items()
+                if name and needle in name.lower()
+                for program in programs
+            ]
+            candidates = self._narrow(candidates, matching)
+
+        return candidates
+
+    def find_universities(
+        self,
+        university_id: Optional[int] = None,
+        region: Optional[str] = None,
+        type: Optional[str] = None,
+        language: Optional[str] = None
+    ) -> Tuple[UniversityRecord, ...]:
+        """Filter active universities (region and language are case-insensitive substring matches)"""
+        candidates = self.universities
+
+        if university_id:
+            university = self.universities_by_id.get(university_id)
+            candidates = (university,) if university else ()
+
+        if region:
+            needle = region.lower()
+            matching = [
+                uni
+                for name, universities in self.universities_by_region.items()
+                if name and needle in name.lower()
+                for uni in universities
+            ]
+            candidates = self._narrow(candidates, matching)
+
+        if type:
+            candidates = tuple(uni for uni in candidates if uni.type == type)
+
+        if language:
+            needle = language.lower()
+            candidates = tuple(
+                uni for uni in candidates
+                if uni.language_instruction and needle in uni.language_instruction.lower()
+            )
+
+        return candidates
+
+    def _narrow(self, candidates: Tuple[CatalogRecord, ...], allowed: Iterable[CatalogRecord]) -> Tuple[CatalogRecord, ...]:
+        """Intersect candidates with allowed while keeping candidate order"""
+        allowed_ids = {id(record) for record in allowed}
+        return tuple(record for record in candidates if id(record) in allowed_ids)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "built_at": self.built_at,
+            "universities": len(self.universities),
+            "programs": len(self.programs),
+            "sectors": len(self.sectors),
+            "skills": len(self.skills),
+            "career_paths": len(self.career_paths)
+        }
+
+
+def build_catalog_snapshot(db) -> CatalogSnapshot:
+    """Load every catalog table once and compile it into a snapshot"""
+    from models.university import University, Program
+    from models.job_market import JobSector, Skill, CareerPath
+
+    version = format_data_version(read_data_versions(db))
+
+    universities = [
+        UniversityRecord(uni.to_dict())
+        for uni in db.query(University).filter(University.is_active == True).order_by(University.id).all()
+    ]
+    universities_by_id = {uni.id: uni for uni in universities}
+
+    # Programs keep their university even when it is inactive, matching the previous join
+    all_universities = {
+        uni.id: UniversityRecord(uni.to_dict())
+        for uni in db.query(University).filter(University.is_active != True).all()
+    }
+    all_universities.update(universities_by_id)
+
+    programs = [
+        ProgramRecord(prog.to_dict(), all_universities.get(prog.university_id))
+        for prog in db.query(Program).filter(Program.is_active == True).order_by(Program.id).all()
+    ]
+
+    sectors = [JobSectorRecord(sector.to_dict()) for sector in db.query(JobSector).order_by(JobSector.id).all()]
+    skills = [
+        SkillRecord(skill.to_dict())
+        for skill in db.query(Skill).filter(Skill.is_active == True).order_by(Skill.id).all()
+    ]
+    career_paths = [
+        CareerPathRecord(path.to_dict())
+        for path in db.query(CareerPath).filter(CareerPath.is_active == True).order_by(CareerPath.id).all()
+    ]
+
+    return CatalogSnapshot(version, universities, programs, sectors, skills, career_paths)
+
+
+class CatalogStore:
+    """
+    Holds the current catalog snapshot and hot-reloads it on data version changes.
+
+    Readers take `store.snapshot` and never block: a refresh builds the new
+    snapshot on the side and publishes it with a single reference assignment.
+    """
+
+    def __init__(self, refresh_interval: float = 30.0):
+        self.refresh_interval = refresh_interval
+        self.logger = logging.getLogger("catalog")
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        self.stats = {
+            "reloads": 0,
+            "version_checks": 0,
+            "last_reload_ms": 0.0
+        }
+
+    @property
+    def snapshot(self) -> CatalogSnapshot:
+        """The current snapshot, loaded on first access"""
+        snapshot = self._snapshot
+        if snapshot is None:
+            snapshot = self.reload()
+        return snapshot
+
+    @property
+    def version(self) -> Optional[str]:
+        snapshot = self._snapshot
+        return snapshot.version if snapshot else None
+
+    def reload(self) -> CatalogSnapshot:
+        """Rebuild the snapshot from the database and publish it"""
+        started = time.perf_counter()
+        return self._publish(self._build(), started)
+
+    def refresh_if_stale(self) -> bool:
+        """Reload when the data version rows no longer match the snapshot"""
+        if not self._is_stale(self._read_version()):
+            return False
+
+        self.reload()
+        return True
+
+    async def refresh(self) -> bool:
+        """
+        refresh_if_stale() for the event loop.
+
+        The version check and the snapshot build run in a worker thread; only
+        the reference swap happens on the loop.
+        """
+        if not self._is_stale(await asyncio.to_thread(self._read_version)):
+            return False
+
+        started = time.perf_counter()
+        snapshot = await asyncio.to_thread(self._build)
+        self._publish(snapshot, started)
+        return True
+
+    def _read_version(self) -> str:
+        self.stats["version_checks"] += 1
+        db = SessionLocal()
+        try:
+            return format_data_version(read_data_versions(db))
+        finally:
+            db.close()
+
+    def _is_stale(self, current_version: str) -> bool:
+        return self._snapshot is None or self._snapshot.version != current_version
+
+    def _build(self) -> CatalogSnapshot:
+        db = SessionLocal()
+        try:
+            return build_catalog_snapshot(db)
+        finally:
+            db.close()
+
+    def _publish(self, snapshot: CatalogSnapshot, started: float) -> CatalogSnapshot:
+        self._snapshot = snapshot
+        self.stats["reloads"] += 1
+        self.stats["last_reload_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        self.logger.info(f"Catalog snapshot {snapshot.version} loaded in {self.stats['last_reload_ms']}ms")
+        return snapshot
+
+    async def start(self):
+        """Load the initial snapshot and start polling for data version changes"""
+        await self.refresh()
+        if self._refresh_task is None and self.refresh_interval > 0:
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self):
+        """Stop the background refresh loop"""
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
+
+    async def _refresh_loop(self):
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await self.refresh()
+            except Exception as e:
+                self.logger.error(f"Catalog refresh failed, keeping snapshot {self.version}: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        snapshot = self._snapshot
+        return {
+            **self.stats,
+            "snapshot": snapshot.get_stats() if snapshot else None
+        }
+
+
+catalog_store: Optional[CatalogStore] = None
+
+
+def get_catalog_store() -> CatalogStore:
+    global catalog_store
+    if catalog_store is None:
+        from core.config import settings
+        catalog_store = CatalogStore(refresh_interval=settings.data_version_check_interval)
+    return catalog_store
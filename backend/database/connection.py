@@ -1,23 +1,33 @@
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Iterator
+
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.orm import sessionmaker, Session
 import redis.asyncio as redis
 from neo4j import GraphDatabase
 import asyncio
 
 from core.config import settings
+from core.tracing import instrument_engine, instrument_redis
+from database.pool import build_engine_options, build_async_engine_options, resolve_database_url, resolve_async_database_url
 
 # PostgreSQL setup
 engine = create_engine(
-    settings.database_url,
-    poolclass=StaticPool,
-    echo=settings.debug
+    resolve_database_url(settings.database_url),
+    echo=settings.debug,
+    **build_engine_options(settings)
 )
+instrument_engine(engine)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+# Async engine, created on first use so the asyncio driver is only imported when needed
+async_engine = None
+AsyncSessionLocal = None
+
 # Redis connection
 redis_client = None
 
@@ -28,10 +38,38 @@ neo4j_driver = None
 async def get_redis():
     global redis_client
     if redis_client is None:
-        redis_client = redis.from_url(settings.redis_url, decode_responses=True)
+        redis_client = instrument_redis(redis.from_url(settings.redis_url, decode_responses=True))
     return redis_client
 
 
+def get_async_engine() -> AsyncEngine:
+    global async_engine, AsyncSessionLocal
+    if async_engine is None:
+        async_engine = create_async_engine(
+            resolve_async_database_url(settings),
+            echo=settings.debug,
+            **build_async_engine_options(settings)
+        )
+        instrument_engine(async_engine.sync_engine)
+        # Objects stay readable after commit; lazy refreshes are not possible on an async session
+        AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    return async_engine
+
+
+def get_async_sessionmaker() -> async_sessionmaker:
+    get_async_engine()
+    return AsyncSessionLocal
+
+
+async def dispose_async_engine():
+    """Close the async engine's pooled connections (aiosqlite keeps a thread per connection)"""
+    global async_engine, AsyncSessionLocal
+    if async_engine is not None:
+        await async_engine.dispose()
+        async_engine = None
+        AsyncSessionLocal = None
+
+
 def get_neo4j():
     global neo4j_driver
     if neo4j_driver is None:
@@ -50,12 +88,38 @@ def get_db():
         db.close()
 
 
+@contextmanager
+def session_scope() -> Iterator[Session]:
+    """Short-lived session that is rolled back on error and always returned to the pool"""
+    db = SessionLocal()
+    try:
+        yield db
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+@asynccontextmanager
+async def async_session_scope() -> AsyncIterator[AsyncSession]:
+    """Async counterpart of session_scope"""
+    db = get_async_sessionmaker()()
+    try:
+        yield db
+    except Exception:
+        await db.rollback()
+        raise
+    finally:
+        await db.close()
+
+
 async def init_db():
     """Initialize all database connections and create tables"""
     print("🔗 Initializing database connections...")
     
     # Create all tables
-    from models import student, university, job_market, recommendation
+    from models import student, university, job_market, recommendation, data_version
     Base.metadata.create_all(bind=engine)
     
     # Test Redis connection
@@ -107,6 +171,8 @@ async def close_connections():
     """Close all database connections"""
     global redis_client, neo4j_driver
     
+    await dispose_async_engine()
+    
     if redis_client:
         await redis_client.close()
     
@@ -0,0 +1,38 @@
+from typing import Dict
+
+
+CATALOG = "catalog"
+JOB_MARKET = "job_market"
+VERSIONED_DOMAINS = (CATALOG, JOB_MARKET)
+
+
+def read_data_versions(db) -> Dict[str, int]:
+    """Read the version counter of every data domain (missing rows count as 0)"""
+    from models.data_version import DataVersion
+
+    versions = {name: 0 for name in VERSIONED_DOMAINS}
+    for row in db.query(DataVersion).filter(DataVersion.name.in_(VERSIONED_DOMAINS)).all():
+        versions[row.name] = row.version
+    return versions
+
+
+def format_data_version(versions: Dict[str, int]) -> str:
+    """Render domain versions as a compact stamp, e.g. 'catalog:3|job_market:2'"""
+    return "|".join(f"{name}:{versions.get(name, 0)}" for name in VERSIONED_DOMAINS)
+
+
+def bump_data_version(db, name: str, commit: bool = True) -> int:
+    """Increment the version counter of a data domain, in the same transaction as the data change"""
+    from models.data_version import DataVersion
+
+    row = db.query(DataVersion).filter(DataVersion.name == name).first()
+    if row is None:
+        row = DataVersion(name=name, version=1)
+        db.add(row)
+    else:
+        row.version += 1
+
+    if commit:
+        db.commit()
+    return row.version
+
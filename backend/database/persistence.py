@@ -0,0 +1,340 @@
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+from itertools import groupby
+from typing import Dict, Any, Awaitable, Callable, List, Optional
+
+from sqlalchemy.exc import DBAPIError, InterfaceError, TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from database.connection import async_session_scope
+
+
+# Writes the payloads of one kind inside the caller's transaction
+PersistenceHandler = Callable[[AsyncSession, List[Dict[str, Any]]], Awaitable[None]]
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """
+    True for errors that mean the database is unreachable rather than the data is bad.
+
+    Only connection-level failures qualify: OperationalError as a whole also
+    covers a missing table or column, which no amount of retrying fixes.
+    """
+    if isinstance(error, DBAPIError):
+        return error.connection_invalidated or isinstance(error, InterfaceError)
+    return isinstance(error, (PoolTimeoutError, OSError, asyncio.TimeoutError))
+
+
+class PersistenceQueue:
+    """
+    Write-behind queue for database writes made while serving requests.
+
+    A request submits a job (a kind plus a JSON payload) and returns without
+    waiting for the commit. A background task writes everything that
+    accumulated, up to flush_size jobs or flush_interval seconds after the
+    first one, in one transaction, calling the handler registered for each
+    kind in submission order.
+
+    Every job is appended to a local spool file before it is queued and
+    acknowledged there once committed, so jobs survive a crash or a
+    database outage: transient errors are retried with backoff, and
+    unacknowledged jobs are replayed from the spool on the next start. Jobs
+    that fail for any other reason are retried one by one and then written
+    to a dead-letter file next to the spool.
+
+    Jobs submitted with a key stay readable through pending() until they
+    are committed, so a request can read its own writes. This is per
+    process; other workers see the write once it is committed.
+    """
+
+    def __init__(
+        self,
+        spool_path: Optional[str] = None,
+        flush_size: int = 50,
+        flush_interval: float = 0.5,
+        max_queue: int = 1000,
+        retry_backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        fsync: bool = False
+    ):
+        self.spool_path = spool_path or None
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self.retry_backoff = retry_backoff
+        self.max_backoff = max_backoff
+        self.fsync = fsync
+        self.logger = logging.getLogger("database.persistence")
+
+        self.handlers: Dict[str, PersistenceHandler] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._spool = None
+        self._unacked: Dict[str, float] = {}  # job id -> submit time
+        self._pending: Dict[tuple, Dict[str, Any]] = {}  # (kind, key) -> latest job
+        self.last_error: Optional[str] = None
+        self.stats = {
+            "submitted": 0,
+            "inline_writes": 0,
+            "written": 0,
+            "flushes": 0,
+            "retries": 0,
+            "dead_lettered": 0,
+            "replayed": 0,
+            "last_flush_ms": 0
+        }
+
+    def register(self, kind: str, handler: PersistenceHandler):
+        self.handlers[kind] = handler
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self):
+        """Replay jobs left in the spool by a previous run, then start writing"""
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        replayed = self._load_spool()
+        self._task = asyncio.create_task(self._run())
+        for job in replayed:
+            self._track(job)
+            await self._queue.put(job)
+        if replayed:
+            self.stats["replayed"] += len(replayed)
+            self.logger.info(f"Replaying {len(replayed)} spooled write(s)")
+
+    async def submit(
+        self,
+        kind: str,
+        payload: Dict[str, Any],
+        key: Optional[str] = None,
+        write_behind: Optional[bool] = None
+    ) -> bool:
+        """
+        Persist a payload with the handler registered for kind.
+
+        Returns True if the job was queued, False if it was written inline
+        (write-behind disabled or the queue not started), in which case
+        errors are raised to the caller. A full queue makes the caller wait
+        for room rather than reordering writes.
+        """
+        if kind not in self.handlers:
+            raise ValueError(f"No persistence handler registered for '{kind}'")
+        if write_behind is None:
+            write_behind = settings.persistence_write_behind
+
+        job = {"id": uuid.uuid4().hex, "kind": kind, "key": key, "payload": payload}
+        if not (write_behind and self.running):
+            self.stats["inline_writes"] += 1
+            async with async_session_scope() as db:
+                await self.handlers[kind](db, [payload])
+                await db.commit()
+            return False
+
+        self._append_spool(job)
+        self._track(job)
+        self.stats["submitted"] += 1
+        await self._queue.put(job)
+        return True
+
+    def pending(self, kind: str, key: str) -> Optional[Dict[str, Any]]:
+        """Latest uncommitted payload submitted for a key"""
+        job = self._pending.get((kind, key))
+        return job["payload"] if job else None
+
+    async def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until everything queued so far is committed; False on timeout"""
+        if not self.running:
+            return not self._unacked
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def stop(self, timeout: Optional[float] = None):
+        """Write what is queued (up to timeout), then stop; the rest stays spooled"""
+        if self.running and not await self.flush(timeout):
+            self.logger.warning(f"Stopping with {len(self._unacked)} write(s) left in the spool")
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._spool is not None:
+            self._spool.close()
+            self._spool = None
+        self._queue = None
+        self._unacked.clear()
+        self._pending.clear()
+
+    def _track(self, job: Dict[str, Any]):
+        self._unacked[job["id"]] = time.time()
+        if job.get("key") is not None:
+            self._pending[(job["kind"], job["key"])] = job
+
+    async def _run(self):
+        while True:
+            batch = [await self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.flush_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                await self._write_with_retry(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _write_with_retry(self, batch: List[Dict[str, Any]]):
+        attempt = 0
+        while True:
+            started = time.perf_counter()
+            try:
+                await self._write(batch)
+            except Exception as e:
+                self.last_error = str(e)
+                if is_transient_error(e):
+                    # The database is unavailable; the jobs stay spooled until it is back
+                    delay = min(self.max_backoff, self.retry_backoff * (2 ** attempt))
+                    attempt += 1
+                    self.stats["retries"] += 1
+                    self.logger.warning(f"Write of {len(batch)} job(s) failed, retrying in {delay:.1f}s: {e}")
+                    await asyncio.sleep(delay)
+                    continue
+                if len(batch) > 1:
+                    self.logger.warning(f"Grouped write of {len(batch)} jobs failed, retrying individually: {e}")
+                    for job in batch:
+                        await self._write_with_retry([job])
+                    return
+                self._dead_letter(batch[0], e)
+                return
+
+            self.stats["written"] += len(batch)
+            self.stats["flushes"] += 1
+            self.stats["last_flush_ms"] = round((time.perf_counter() - started) * 1000, 3)
+            self._acknowledge(batch)
+            return
+
+    async def _write(self, batch: List[Dict[str, Any]]):
+        async with async_session_scope() as db:
+            for kind, jobs in groupby(batch, key=lambda job: job["kind"]):
+                await self.handlers[kind](db, [job["payload"] for job in jobs])
+            await db.commit()
+
+    def _acknowledge(self, batch: List[Dict[str, Any]]):
+        for job in batch:
+            self._unacked.pop(job["id"], None)
+            pending_key = (job["kind"], job.get("key"))
+            if self._pending.get(pending_key) is job:
+                del self._pending[pending_key]
+
+        if self._spool is not None:
+            if self._unacked:
+                self._write_spool_line({"ack": [job["id"] for job in batch]})
+            else:
+                # Everything is committed; start the spool afresh
+                self._spool.seek(0)
+                self._spool.truncate()
+
+    def _dead_letter(self, job: Dict[str, Any], error: Exception):
+        self.stats["dead_lettered"] += 1
+        self.logger.error(f"Dropping {job['kind']} write after a permanent error: {error}")
+        if self.spool_path:
+            try:
+                with open(f"{self.spool_path}.dead", "a", encoding="utf-8") as dead:
+                    dead.write(json.dumps({**job, "error": str(error)}, default=str) + "\n")
+            except OSError as e:
+                self.logger.error(f"Failed to write dead letter: {e}")
+        self._acknowledge([job])
+
+    def _append_spool(self, job: Dict[str, Any]):
+        if not self.spool_path:
+            return
+        if self._spool is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.spool_path)), exist_ok=True)
+            self._spool = open(self.spool_path, "a+", encoding="utf-8")
+        self._write_spool_line(job)
+
+    def _write_spool_line(self, record: Dict[str, Any]):
+        self._spool.write(json.dumps(record, default=str) + "\n")
+        self._spool.flush()
+        if self.fsync:
+            os.fsync(self._spool.fileno())
+
+    def _load_spool(self) -> List[Dict[str, Any]]:
+        """Jobs in the spool that were never acknowledged, in submission order"""
+        if not self.spool_path or not os.path.exists(self.spool_path):
+            return []
+
+        jobs: Dict[str, Dict[str, Any]] = {}
+        with open(self.spool_path, encoding="utf-8") as spool:
+            for line in spool:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # A line cut short by a crash
+                    continue
+                if "ack" in record:
+                    for job_id in record["ack"]:
+                        jobs.pop(job_id, None)
+                elif record.get("kind") in self.handlers:
+                    jobs[record["id"]] = record
+                else:
+                    self.logger.warning(f"Skipping spooled job of unknown kind '{record.get('kind')}'")
+
+        # Rewrite the spool with only the jobs still to be written
+        os.makedirs(os.path.dirname(os.path.abspath(self.spool_path)), exist_ok=True)
+        self._spool = open(self.spool_path, "w+", encoding="utf-8")
+        for job in jobs.values():
+            self._write_spool_line(job)
+        return list(jobs.values())
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Backlog and throughput of the queue"""
+        oldest = min(self._unacked.values()) if self._unacked else None
+        return {
+            **self.stats,
+            "running": self.running,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "backlog": len(self._unacked),
+            "oldest_pending_s": round(time.time() - oldest, 3) if oldest else 0,
+            "spool_bytes": os.path.getsize(self.spool_path) if self.spool_path and os.path.exists(self.spool_path) else 0,
+            "last_error": self.last_error
+        }
+
+
+_persistence_queue: Optional[PersistenceQueue] = None
+
+
+def get_persistence_queue() -> PersistenceQueue:
+    global _persistence_queue
+    if _persistence_queue is None:
+        from database.recommendation_store import write_recommendation_sessions, write_recommendation_feedback
+        from database.student_store import write_student_profiles
+
+        _persistence_queue = PersistenceQueue(
+            spool_path=settings.persistence_spool_path,
+            flush_size=settings.persistence_flush_size,
+            flush_interval=settings.persistence_flush_interval,
+            max_queue=settings.persistence_queue_size,
+            retry_backoff=settings.persistence_retry_backoff,
+            max_backoff=settings.persistence_max_backoff,
+            fsync=settings.persistence_spool_fsync
+        )
+        _persistence_queue.register("student_profile", write_student_profiles)
+        _persistence_queue.register("recommendation_session", write_recommendation_sessions)
+        _persistence_queue.register("recommendation_feedback", write_recommendation_feedback)
+    return _persistence_queue
@@ -0,0 +1,160 @@
+import threading
+import time
+from typing import Dict, Any
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool, StaticPool
+
+
+# Named in-memory database that every connection of the process shares, so
+# the sync and async engines see the same tables
+SHARED_MEMORY_SQLITE_URL = "sqlite:///file:edupath_memory?mode=memory&cache=shared&uri=true"
+
+ASYNC_DRIVERS = {
+    "postgresql": "asyncpg",
+    "sqlite": "aiosqlite"
+}
+
+
+class PoolMetrics:
+    """Checkout wait times and timeouts of the connection pool"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record_wait(self, seconds: float, timed_out: bool = False):
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait += seconds
+            self.max_wait = max(self.max_wait, seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "checkouts": self.checkouts,
+            "checkout_timeouts": self.timeouts,
+            "avg_checkout_wait_ms": round(self.total_wait / self.checkouts * 1000, 3) if self.checkouts else 0,
+            "max_checkout_wait_ms": round(self.max_wait * 1000, 3)
+        }
+
+
+pool_metrics = PoolMetrics()
+async_pool_metrics = PoolMetrics()
+
+
+class CheckoutTimingMixin:
+    """Records how long each checkout waited for a connection"""
+
+    metrics: PoolMetrics
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.record_wait(time.perf_counter() - started, timed_out=True)
+            raise
+        self.metrics.record_wait(time.perf_counter() - started)
+        return connection
+
+
+class InstrumentedQueuePool(CheckoutTimingMixin, QueuePool):
+    metrics = pool_metrics
+
+
+class InstrumentedAsyncQueuePool(CheckoutTimingMixin, AsyncAdaptedQueuePool):
+    metrics = async_pool_metrics
+
+
+def is_memory_sqlite(database_url: str) -> bool:
+    url = make_url(database_url)
+    return url.get_backend_name() == "sqlite" and (
+        url.database in (None, "", ":memory:") or url.query.get("mode") == "memory"
+    )
+
+
+def resolve_database_url(database_url: str) -> str:
+    """Database URL for the sync engine"""
+    return SHARED_MEMORY_SQLITE_URL if is_memory_sqlite(database_url) else database_url
+
+
+def resolve_async_database_url(settings) -> str:
+    """
+    Database URL for the async engine.
+
+    ASYNC_DATABASE_URL wins when set; otherwise DATABASE_URL is switched to
+    the asyncio driver of its backend (asyncpg or aiosqlite).
+    """
+    if settings.async_database_url:
+        return settings.async_database_url
+
+    url = make_url(resolve_database_url(settings.database_url))
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No asyncio driver configured for database backend '{backend}'")
+    return url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}").render_as_string(hide_password=False)
+
+
+def _pool_options(settings, database_url: str, queue_pool) -> Dict[str, Any]:
+    options: Dict[str, Any] = {}
+    is_sqlite = make_url(database_url).get_backend_name() == "sqlite"
+    if is_sqlite:
+        options["connect_args"] = {"check_same_thread": False}
+
+    # An in-memory database lives only as long as its connections, so pin one
+    if is_memory_sqlite(database_url):
+        options["poolclass"] = StaticPool
+        return options
+
+    options.update(
+        poolclass=queue_pool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        pool_recycle=settings.db_pool_recycle
+    )
+    return options
+
+
+def build_engine_options(settings) -> Dict[str, Any]:
+    """
+    Pool arguments for create_engine.
+
+    An in-memory SQLite database keeps a StaticPool; every other database
+    gets a sized QueuePool.
+    """
+    return _pool_options(settings, resolve_database_url(settings.database_url), InstrumentedQueuePool)
+
+
+def build_async_engine_options(settings) -> Dict[str, Any]:
+    """Pool arguments for create_async_engine, sized like the sync pool"""
+    options = _pool_options(settings, resolve_async_database_url(settings), InstrumentedAsyncQueuePool)
+    # aiosqlite runs its connection on a worker thread of its own
+    options.pop("connect_args", None)
+    return options
+
+
+def get_pool_stats(engine) -> Dict[str, Any]:
+    """Occupancy of the engine's pool plus checkout wait metrics"""
+    pool = engine.pool
+    stats: Dict[str, Any] = {"pool_class": type(pool).__name__}
+
+    if isinstance(pool, QueuePool):
+        stats.update({
+            "size": pool.size(),
+            "in_use": pool.checkedout(),
+            "idle": pool.checkedin(),
+            # Negative while the pool is still filling up to its size
+            "overflow": max(0, pool.overflow()),
+        })
+    if isinstance(pool, CheckoutTimingMixin):
+        stats.update(pool.metrics.get_stats())
+
+    return stats
@@ -0,0 +1,55 @@
+from contextlib import contextmanager
+from typing import List, Optional
+
+from sqlalchemy import event
+
+from database.connection import engine, get_async_engine
+
+
+class QueryCounter:
+    """
+    Count the SQL statements executed on an engine while the counter is active.
+
+    Without an explicit bind, statements on both the blocking engine and the
+    asyncio engine are counted.
+
+    Usage:
+        with QueryCounter() as counter:
+            ...
+        counter.count, counter.statements
+    """
+
+    def __init__(self, bind=None):
+        self.binds = [bind] if bind is not None else [engine, get_async_engine().sync_engine]
+        self.statements: List[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __enter__(self) -> "QueryCounter":
+        self.statements = []
+        for bind in self.binds:
+            event.listen(bind, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        for bind in self.binds:
+            event.remove(bind, "before_cursor_execute", self._on_execute)
+        return False
+
+
+@contextmanager
+def assert_max_queries(max_count: int, bind=None, label: Optional[str] = None):
+    """Fail with AssertionError if the block executes more than max_count statements"""
+    with QueryCounter(bind) as counter:
+        yield counter
+
+    if counter.count > max_count:
+        statements = "\n".join(f"  {i + 1}. {stmt.strip()}" for i, stmt in enumerate(counter.statements))
+        raise AssertionError(
+            f"{label or 'Block'} executed {counter.count} SQL statements, expected at most {max_count}:\n{statements}"
+        )
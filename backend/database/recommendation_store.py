@@ -0,0 +1,89 @@
+from typing import Dict, Any, List
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.recommendation import Recommendation, RecommendationFeedback, RecommendationSession
+from models.student import Student
+
+
+# Result fields copied verbatim onto each stored recommendation
+RECOMMENDATION_FIELDS = (
+    "program_id", "match_score", "confidence_score", "ranking_position",
+    "reasons", "pros", "cons", "requirements_met", "requirements_missing",
+    "career_prospects", "employment_outlook", "salary_expectations",
+    "preparation_tips", "recommended_subjects", "skill_gaps"
+)
+
+
+def build_session_rows(
+    session_id: str,
+    student_profile: Dict[str, Any],
+    recommendations: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """Column values for a recommendation session and its recommendations"""
+    # New profiles are committed inline and updates keep the stored id, so
+    # only batch profiles (never stored) come without one. Sessions are also
+    # resolved by student session when written, should an id be missing
+    student_id = student_profile.get("id") or 0
+    return {
+        "student_session_id": student_profile.get("session_id"),
+        "session": {
+            "session_id": session_id,
+            "student_id": student_id,
+            "request_data": {"student_profile": student_profile},
+            "total_recommendations": len(recommendations),
+            "status": "completed"
+        },
+        "recommendations": [
+            {
+                "student_id": student_id,
+                "session_id": session_id,
+                "recommendation_type": "program",
+                "algorithm_version": "1.0",
+                "is_active": True,
+                **{field: rec.get(field) for field in RECOMMENDATION_FIELDS}
+            }
+            for rec in recommendations
+        ]
+    }
+
+
+async def insert_session_rows(db: AsyncSession, entries: List[Dict[str, Any]]):
+    """
+    Insert recommendation sessions and all their recommendations.
+
+    Each table is written with a single multi-row INSERT (executemany with
+    insertmanyvalues on PostgreSQL and SQLite) instead of one ORM object per
+    row. The caller owns the transaction.
+    """
+    sessions = [entry["session"] for entry in entries]
+    recommendations = [row for entry in entries for row in entry["recommendations"]]
+    await db.execute(insert(RecommendationSession), sessions)
+    if recommendations:
+        await db.execute(insert(Recommendation), recommendations)
+
+
+async def write_recommendation_sessions(db: AsyncSession, entries: List[Dict[str, Any]]):
+    """Persistence handler for build_session_rows entries"""
+    unresolved = {
+        entry["student_session_id"] for entry in entries
+        if not entry["session"]["student_id"] and entry.get("student_session_id")
+    }
+    if unresolved:
+        student_ids = dict((await db.execute(
+            select(Student.session_id, Student.id).where(Student.session_id.in_(unresolved))
+        )).all())
+        for entry in entries:
+            student_id = student_ids.get(entry.get("student_session_id"))
+            if student_id and not entry["session"]["student_id"]:
+                entry["session"]["student_id"] = student_id
+                for row in entry["recommendations"]:
+                    row["student_id"] = student_id
+
+    await insert_session_rows(db, entries)
+
+
+async def write_recommendation_feedback(db: AsyncSession, payloads: List[Dict[str, Any]]):
+    """Persistence handler for feedback on recommendations"""
+    await db.execute(insert(RecommendationFeedback), payloads)
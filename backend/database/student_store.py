@@ -0,0 +1,50 @@
+from typing import Dict, Any, List
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.student import Student
+
+
+# Columns a profile write sets; ids and timestamps belong to the database
+PROFILE_COLUMNS = (
+    "session_id", "name", "email", "language_preference", "exam_system",
+    "ol_results", "al_results", "bepc_results", "bac_results",
+    "ol_points", "al_points", "french_average",
+    "interests", "career_preferences", "location_preferences",
+    "is_active", "profile_completed"
+)
+
+
+def profile_payload(student: Student) -> Dict[str, Any]:
+    """Persistable column values of a student (plus its id, if it has one)"""
+    payload = {column: getattr(student, column) for column in PROFILE_COLUMNS}
+    payload["id"] = student.id
+    return payload
+
+
+def student_from_payload(payload: Dict[str, Any]) -> Student:
+    """Detached Student built from a profile payload"""
+    return Student(**{column: payload.get(column) for column in PROFILE_COLUMNS}, id=payload.get("id"))
+
+
+async def write_student_profiles(db: AsyncSession, payloads: List[Dict[str, Any]]):
+    """Insert or update student profiles by session id; the latest payload per session wins"""
+    latest = {payload["session_id"]: payload for payload in payloads}
+    existing = {
+        student.session_id: student
+        for student in (await db.execute(
+            select(Student).where(Student.session_id.in_(latest))
+        )).scalars()
+    }
+
+    for session_id, payload in latest.items():
+        student = existing.get(session_id)
+        if student is None:
+            db.add(Student(**{column: payload.get(column) for column in PROFILE_COLUMNS}))
+            continue
+        for column in PROFILE_COLUMNS:
+            setattr(student, column, payload.get(column))
+
+    # Later handlers in the same transaction look students up by session
+    await db.flush()
@@ -1,13 +1,16 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 import uvicorn
 import asyncio
 from contextlib import asynccontextmanager
 
 from core.config import settings
+from core.metrics import render_prometheus
+from core.tracing import TracingMiddleware, get_tracer
+from core.responses import FastJSONResponse, FastJSONRoute
 from api.routes import auth, students, recommendations, universities, agents
-from database.connection import init_db
+from database.connection import init_db, close_connections
 from agents.orchestrator import AgentOrchestrator
 
 
@@ -28,6 +31,8 @@ async def lifespan(app: FastAPI):
     print("🛑 Shutting down EduPath Application...")
     if hasattr(app.state, 'orchestrator'):
         await app.state.orchestrator.cleanup()
+    await close_connections()
+    get_tracer().shutdown()
     print("✅ Cleanup completed!")
 
 
@@ -35,8 +40,10 @@ app = FastAPI(
     title="EduPath API",
     description="AI-Powered Educational Guidance System for Cameroonian Students",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse
 )
+app.router.route_class = FastJSONRoute
 
 # Configure CORS
 app.add_middleware(
@@ -47,6 +54,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Outermost, so the request span covers CORS handling too; a no-op unless TRACING_ENABLED
+app.add_middleware(TracingMiddleware)
+
 # Include API routes
 app.include_router(auth.router, prefix="/api/v1/auth", tags=["Authentication"])
 app.include_router(students.router, prefix="/api/v1/students", tags=["Students"])
@@ -88,6 +98,14 @@ async def health_check():
         raise HTTPException(status_code=503, detail=f"Service unhealthy: {str(e)}")
 
 
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def prometheus_metrics():
+    """Agent latency histograms and error counts in the Prometheus text format"""
+    orchestrator = getattr(app.state, 'orchestrator', None)
+    metrics = orchestrator.get_request_metrics() if orchestrator else {}
+    return PlainTextResponse(render_prometheus(metrics), media_type="text/plain; version=0.0.4")
+
+
 if __name__ == "__main__":
     uvicorn.run(
         "main:app",
@@ -0,0 +1,60 @@
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import create_engine, pool
+
+from core.config import settings
+from database.connection import Base
+from database.pool import resolve_database_url
+import models  # noqa: F401  (registers every table on Base.metadata)
+
+
+config = context.config
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+# Indexes that exist only in migrations (PostgreSQL trigram indexes)
+MIGRATION_ONLY_INDEX_SUFFIXES = ("_trgm",)
+
+
+def include_object(obj, name, type_, reflected, compare_to):
+    if type_ == "index" and reflected and name and name.endswith(MIGRATION_ONLY_INDEX_SUFFIXES):
+        return False
+    return True
+
+
+def database_url() -> str:
+    return config.get_main_option("sqlalchemy.url") or resolve_database_url(settings.database_url)
+
+
+def run_migrations_offline():
+    """Emit the migration SQL without connecting"""
+    context.configure(
+        url=database_url(),
+        target_metadata=target_metadata,
+        include_object=include_object,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"}
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    connectable = create_engine(database_url(), poolclass=pool.NullPool)
+    with connectable.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,60 @@
+"""Data version counters and recommendation feedback
+
+Adds data_versions, the per-domain counters that version the catalog
+snapshot and the recommendation cache, and recommendation_feedback, where
+POST /recommendations/feedback stores ratings. Neither table existed in
+the baseline schema. init_db's create_all may already have created them,
+so existing tables are left alone.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, Sequence[str], None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if "data_versions" not in existing:
+        op.create_table('data_versions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('name')
+        )
+        op.create_index(op.f('ix_data_versions_id'), 'data_versions', ['id'], unique=False)
+
+    if "recommendation_feedback" not in existing:
+        op.create_table('recommendation_feedback',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('session_id', sa.String(length=255), nullable=False),
+        sa.Column('recommendation_id', sa.Integer(), nullable=False),
+        sa.Column('rating', sa.Integer(), nullable=False),
+        sa.Column('feedback', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_recommendation_feedback_id'), 'recommendation_feedback', ['id'], unique=False)
+        op.create_index(op.f('ix_recommendation_feedback_session_id'), 'recommendation_feedback', ['session_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_recommendation_feedback_session_id'), table_name='recommendation_feedback')
+    op.drop_index(op.f('ix_recommendation_feedback_id'), table_name='recommendation_feedback')
+    op.drop_table('recommendation_feedback')
+    op.drop_index(op.f('ix_data_versions_id'), table_name='data_versions')
+    op.drop_table('data_versions')
@@ -0,0 +1,71 @@
+"""Indexes for the hot program, job sector, skill and career path filters
+
+Composite partial indexes (active rows only) for the equality filters and
+ORDER BY columns of the catalog and job-market queries, plus pg_trgm GIN
+indexes for the faculty and career name ILIKE '%...%' searches on
+PostgreSQL. Indexes are created with IF NOT EXISTS because init_db's
+create_all already builds the model-declared ones on a fresh database.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, Sequence[str], None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Spelled the way each dialect renders `is_active == True`, so the planner
+# can match the partial index against the query
+ACTIVE_ONLY = {"postgresql_where": sa.text("is_active = true"), "sqlite_where": sa.text("is_active = 1")}
+
+# (name, table, columns, partial)
+INDEXES = (
+    ("ix_programs_active_degree_type", "programs", ["degree_type", "university_id"], True),
+    ("ix_programs_active_university", "programs", ["university_id", "degree_type"], True),
+    ("ix_job_sectors_active_demand", "job_sectors", ["demand_level", "growth_rate"], True),
+    ("ix_job_sectors_active_priority", "job_sectors", ["government_priority", "contribution_to_gdp"], True),
+    ("ix_job_sectors_active_entrepreneurship", "job_sectors", ["entrepreneurship_score"], True),
+    ("ix_skills_active_trend_demand", "skills", ["trend", "demand_level", "salary_impact"], True),
+    ("ix_career_paths_sector_id", "career_paths", ["sector_id"], False),
+)
+
+# (name, table, column) searched with ILIKE '%...%'
+TRIGRAM_INDEXES = (
+    ("ix_programs_faculty_trgm", "programs", "faculty"),
+    ("ix_career_paths_name_trgm", "career_paths", "name"),
+)
+
+
+def upgrade() -> None:
+    for name, table, columns, partial in INDEXES:
+        where = ACTIVE_ONLY if partial else {}
+        op.create_index(name, table, columns, if_not_exists=True, **where)
+
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        for name, table, column in TRIGRAM_INDEXES:
+            op.create_index(
+                name, table, [column],
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+                if_not_exists=True
+            )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        for name, table, _ in TRIGRAM_INDEXES:
+            op.drop_index(name, table_name=table, if_exists=True)
+
+    for name, table, _, _ in INDEXES:
+        op.drop_index(name, table_name=table, if_exists=True)
@@ -1,7 +1,8 @@
 from .student import Student
 from .university import University, Program
 from .job_market import JobSector, Skill, CareerPath
-from .recommendation import Recommendation, RecommendationSession, ScholarshipOpportunity
+from .recommendation import Recommendation, RecommendationSession, RecommendationFeedback, ScholarshipOpportunity
+from .data_version import DataVersion
 
 __all__ = [
     "Student",
@@ -12,5 +13,7 @@ __all__ = [
     "CareerPath",
     "Recommendation",
     "RecommendationSession",
-    "ScholarshipOpportunity"
+    "RecommendationFeedback",
+    "ScholarshipOpportunity",
+    "DataVersion"
 ]
@@ -0,0 +1,6 @@
+from sqlalchemy import text
+
+
+# Partial-index condition for queries that only look at active rows, spelled
+# the way each dialect renders `is_active == True` so the planner matches it
+ACTIVE_ONLY = {"postgresql_where": text("is_active = true"), "sqlite_where": text("is_active = 1")}
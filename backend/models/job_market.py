@@ -1,10 +1,16 @@
-from sqlalchemy import Column, Integer, String, JSON, DateTime, Boolean, Text, Float
+from sqlalchemy import Column, Integer, String, JSON, DateTime, Boolean, Text, Float, Index
 from sqlalchemy.sql import func
 from database.connection import Base
+from .indexes import ACTIVE_ONLY
 
 
 class JobSector(Base):
     __tablename__ = "job_sectors"
+    __table_args__ = (
+        Index("ix_job_sectors_active_demand", "demand_level", "growth_rate", **ACTIVE_ONLY),
+        Index("ix_job_sectors_active_priority", "government_priority", "contribution_to_gdp", **ACTIVE_ONLY),
+        Index("ix_job_sectors_active_entrepreneurship", "entrepreneurship_score", **ACTIVE_ONLY),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), unique=True, nullable=False)
@@ -66,6 +72,9 @@ class JobSector(Base):
 
 class Skill(Base):
     __tablename__ = "skills"
+    __table_args__ = (
+        Index("ix_skills_active_trend_demand", "trend", "demand_level", "salary_impact", **ACTIVE_ONLY),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), unique=True, nullable=False)
@@ -125,6 +134,10 @@ class Skill(Base):
 
 class CareerPath(Base):
     __tablename__ = "career_paths"
+    __table_args__ = (
+        Index("ix_career_paths_sector_id", "sector_id"),
+        # name ILIKE searches use a pg_trgm index created by migration 0002
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False)
@@ -137,6 +137,28 @@ class RecommendationSession(Base):
         }
 
 
+class RecommendationFeedback(Base):
+    __tablename__ = "recommendation_feedback"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    session_id = Column(String(255), nullable=False, index=True)
+    recommendation_id = Column(Integer, nullable=False)
+    rating = Column(Integer, nullable=False)  # 1-5
+    feedback = Column(Text, nullable=True)
+    
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "session_id": self.session_id,
+            "recommendation_id": self.recommendation_id,
+            "rating": self.rating,
+            "feedback": self.feedback,
+            "created_at": self.created_at.isoformat() if self.created_at else None
+        }
+
+
 class ScholarshipOpportunity(Base):
     __tablename__ = "scholarships"
     
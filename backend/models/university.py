@@ -1,6 +1,7 @@
-from sqlalchemy import Column, Integer, String, JSON, DateTime, Boolean, Text, Float
+from sqlalchemy import Column, Integer, String, JSON, DateTime, Boolean, Text, Float, Index
 from sqlalchemy.sql import func
 from database.connection import Base
+from .indexes import ACTIVE_ONLY
 
 
 class University(Base):
@@ -54,6 +55,11 @@ class University(Base):
 
 class Program(Base):
     __tablename__ = "programs"
+    __table_args__ = (
+        Index("ix_programs_active_degree_type", "degree_type", "university_id", **ACTIVE_ONLY),
+        Index("ix_programs_active_university", "university_id", "degree_type", **ACTIVE_ONLY),
+        # faculty ILIKE searches use a pg_trgm index created by migration 0002
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     code = Column(String(20), unique=True, index=True, nullable=False)